@@ -1,5 +1,6 @@
 from app.config.container import Container
 from app.config.settings import settings
+from app.data.db_config import bind_consistency_key
 from app.exception.auth_exception import AccessDenied, Unauthorized
 from app.model.role_model import Role
 from app.model.user_model import CurrentUser, UserWithRole
@@ -23,6 +24,8 @@ async def get_current_user(
     if not user:
         raise Unauthorized("Invalid or expired session token")
 
+    # Replica reads for this request must see the user's recent writes
+    bind_consistency_key(user.id)
     return user
 
 
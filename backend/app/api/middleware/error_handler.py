@@ -25,6 +25,7 @@ def register_error_handlers(app):
                 error_id=exc.error_id,
                 details=exc.details,
             ).model_dump(),
+            headers=exc.headers,
         )
 
     @app.exception_handler(RequestValidationError)
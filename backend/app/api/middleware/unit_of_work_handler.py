@@ -0,0 +1,26 @@
+from typing import AsyncIterator
+
+import asyncpg
+from app.config.container import Container
+from app.data.db_config import DatabaseConfig
+from app.data.unit_of_work import unit_of_work
+from dependency_injector.wiring import Provide, inject
+from fastapi import Depends
+
+
+@inject
+async def request_connection(
+    db_config: DatabaseConfig = Depends(Provide[Container.db_config]),
+) -> AsyncIterator[asyncpg.Connection]:
+    """Share one pooled connection across every repo call the request makes."""
+    async with unit_of_work(db_config) as connection:
+        yield connection
+
+
+@inject
+async def request_transaction(
+    db_config: DatabaseConfig = Depends(Provide[Container.db_config]),
+) -> AsyncIterator[asyncpg.Connection]:
+    """Like `request_connection`, but the request's queries also share a transaction."""
+    async with unit_of_work(db_config, transaction=True) as connection:
+        yield connection
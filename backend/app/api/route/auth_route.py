@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from urllib.parse import urlencode
 
@@ -22,8 +21,10 @@ from app.model.user_model import (
     User,  # already present
 )
 from app.service.auth_service import AuthService
+from app.service.login_throttle_service import LoginThrottleService
 from app.service.onboarding_service import OnboardingService
 from app.util.cookie_util import clear_session_cookie, set_session_cookie
+from app.util.rate_limit_util import get_client_ip
 from app.util.oauth_util import (
     OAuthStateError,
     generate_oauth_state,
@@ -31,7 +32,7 @@ from app.util.oauth_util import (
     validate_oauth_state,
 )
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.responses import RedirectResponse
 
 logger = logging.getLogger(__name__)
@@ -73,14 +74,18 @@ async def signup_org(
 async def login(
     request: LoginRequest,
     response: Response,
+    http_request: Request,
     auth_service: AuthService = Depends(Provide[Container.auth_service]),
     onboarding_service: OnboardingService = Depends(
         Provide[Container.onboarding_service]
     ),
+    login_throttle_service: LoginThrottleService = Depends(
+        Provide[Container.login_throttle_service]
+    ),
 ):
-    user: User = await auth_service.verify_credentials(
-        request.email.strip().lower(), request.password
-    )
+    email = request.email.strip().lower()
+    async with login_throttle_service.admit(get_client_ip(http_request), email):
+        user: User = await auth_service.verify_credentials(email, request.password)
 
     if not user:
         raise InvalidCredentials()
@@ -94,12 +99,10 @@ async def login(
     # For B2B mode, we do onboarding where we create the organization.
     if settings.mode == "b2c":
         try:
-            asyncio.create_task(
-                onboarding_service.run_first_seen(
-                    org_id=user.organization_id,
-                    email=user.email,
-                    full_name=f"{user.first_name} {user.last_name}",
-                )
+            await onboarding_service.schedule_first_seen(
+                org_id=user.organization_id,
+                email=user.email,
+                full_name=f"{user.first_name} {user.last_name}",
             )
         except Exception as e:
             # Optional: log and continue
@@ -132,9 +135,7 @@ async def get_google_auth_url():
         "state": state,
     }
 
-    authorization_url = (
-        f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(params)}"
-    )
+    authorization_url = f"{settings.google_auth_url}?{urlencode(params)}"
 
     return OAuthAuthorizationResponse(authorization_url=authorization_url)
 
@@ -192,12 +193,10 @@ async def google_oauth_callback(
 
         if settings.mode == "b2c":
             try:
-                asyncio.create_task(
-                    onboarding_service.run_first_seen(
-                        org_id=user.organization_id,
-                        email=user.email,
-                        full_name=f"{user.first_name} {user.last_name}",
-                    )
+                await onboarding_service.schedule_first_seen(
+                    org_id=user.organization_id,
+                    email=user.email,
+                    full_name=f"{user.first_name} {user.last_name}",
                 )
             except Exception as e:
                 logger.warning(
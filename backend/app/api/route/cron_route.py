@@ -19,3 +19,17 @@ async def delete_old_sessions(
         )
 
     await cron_service.delete_old_sessions()
+
+
+@router.post("/delete-old-jobs", status_code=204, include_in_schema=False)
+@inject
+async def delete_old_jobs(
+    x_cron_secret: str = Header(..., alias="X-Cron-Secret"),
+    cron_service: CronService = Depends(Provide[Container.cron_service]),
+):
+    if x_cron_secret != settings.cron_secret:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized"
+        )
+
+    await cron_service.delete_old_jobs()
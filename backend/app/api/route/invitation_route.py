@@ -10,8 +10,10 @@ from app.model.role_model import Role
 from app.model.user_model import CurrentUser
 from app.service.email_service_base import EmailService
 from app.service.invitation_service import InvitationService
+from app.util.serialization_util import json_response
+from app.util.streaming_util import stream_rows
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Request
 
 router = APIRouter()
 
@@ -47,7 +49,7 @@ async def create_invitation(
         invite_link,
     )
 
-    return InvitationResponse.model_validate(invitation.model_dump())
+    return json_response(InvitationResponse, invitation)
 
 
 @router.get(
@@ -57,18 +59,23 @@ async def create_invitation(
 )
 @inject
 async def get_pending_invitations(
+    request: Request,
     user: CurrentUser = Depends(min_role_required(Role.ORG_ADMIN)),
     invitation_service: InvitationService = Depends(
         Provide[Container.invitation_service]
     ),
 ):
     if user.role == Role.SYSTEM_ADMIN:
-        invitations = await invitation_service.get_all_pending_invitations()
-    else:
-        invitations = await invitation_service.get_pending_invitations(
-            user.organization_id
+        return stream_rows(
+            request,
+            invitation_service.stream_all_pending_invitations(),
+            InvitationResponse,
         )
-    return [InvitationResponse.model_validate(inv.model_dump()) for inv in invitations]
+
+    invitations = await invitation_service.get_pending_invitations(
+        user.organization_id
+    )
+    return json_response(InvitationResponse, invitations)
 
 
 @router.get(
@@ -87,7 +94,7 @@ async def get_invitation_status(
     invitation = await invitation_service.get_invitation(
         invitation_id, user.organization_id
     )
-    return InvitationResponse.model_validate(invitation.model_dump())
+    return json_response(InvitationResponse, invitation)
 
 
 @router.delete("/{invitation_id}", operation_id="revokeInvitation")
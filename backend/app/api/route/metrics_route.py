@@ -0,0 +1,52 @@
+from app.api.middleware.auth_handler import min_role_required
+from app.config.container import Container
+from app.data.db_config import DatabaseConfig
+from app.data.query_registry import queries
+from app.data.repo.plan_repo import PlanRepo
+from app.model.role_model import Role
+from app.model.user_model import CurrentUser
+from app.service.email_dispatch_service import EmailDispatchService
+from app.service.job_queue_service import JobQueueService
+from app.service.login_throttle_service import LoginThrottleService
+from app.service.quota_lease_service import QuotaLeaseService
+from app.service.session_refresh_service import SessionRefreshService
+from app.util.cache_util import TTLCache
+from app.util.hash_util import hash_pool
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+
+router = APIRouter()
+
+
+@router.get("/", include_in_schema=False)
+@inject
+async def get_metrics(
+    user: CurrentUser = Depends(min_role_required(Role.SYSTEM_ADMIN)),
+    db_config: DatabaseConfig = Depends(Provide[Container.db_config]),
+    session_cache: TTLCache = Depends(Provide[Container.session_cache]),
+    session_refresh_service: SessionRefreshService = Depends(
+        Provide[Container.session_refresh_service]
+    ),
+    plan_repo: PlanRepo = Depends(Provide[Container.plan_repo]),
+    email_service: EmailDispatchService = Depends(Provide[Container.email_service]),
+    job_queue_service: JobQueueService = Depends(Provide[Container.job_queue_service]),
+    login_throttle_service: LoginThrottleService = Depends(
+        Provide[Container.login_throttle_service]
+    ),
+    quota_lease_service: QuotaLeaseService = Depends(
+        Provide[Container.quota_lease_service]
+    ),
+) -> dict:
+    """In-process runtime metrics for this worker."""
+    return {
+        "db_pool": db_config.stats(),
+        "session_cache": session_cache.stats(),
+        "session_refresh": session_refresh_service.stats(),
+        "plan_catalog": plan_repo.catalog_stats(),
+        "quota_leases": quota_lease_service.stats(),
+        "password_hashing": hash_pool.stats(),
+        "login_throttle": login_throttle_service.stats(),
+        "job_queue": job_queue_service.stats(),
+        "email": email_service.stats(),
+        "queries": queries.stats(),
+    }
@@ -1,19 +1,36 @@
 from app.api.middleware.auth_handler import min_role_required
+from app.api.middleware.unit_of_work_handler import (
+    request_connection,
+    request_transaction,
+)
 from app.config.container import Container
 from app.exception.common_exception import QuotaExceeded, ResourceNotFound
-from app.model.note_model import CreateNoteRequest, NoteResponse, UpdateNoteRequest
+from app.model.note_model import (
+    CreateNoteRequest,
+    NoteResponse,
+    NoteSummaryPage,
+    UpdateNoteRequest,
+)
 from app.model.plan_model import FeatureKey
 from app.model.role_model import Role
 from app.model.user_model import CurrentUser
 from app.service.note_service import NoteService
 from app.service.organization_usage_service import OrganizationUsageService
+from app.util.serialization_util import json_response
+from app.util.streaming_util import stream_rows
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 
 router = APIRouter()
 
 
-@router.post("/", response_model=NoteResponse, operation_id="createNote")
+# Not transactional: the quota released after a failed insert must stay released
+@router.post(
+    "/",
+    response_model=NoteResponse,
+    operation_id="createNote",
+    dependencies=[Depends(request_connection)],
+)
 @inject
 async def create_note(
     data: CreateNoteRequest,
@@ -23,7 +40,7 @@ async def create_note(
         Provide[Container.organization_usage_service]
     ),
 ):
-    has_room = await usage_service.check_quota_for(
+    has_room = await usage_service.try_consume(
         organization_id=user.organization_id,
         feature_key=FeatureKey.MAX_NOTES,
         amount=1,
@@ -31,25 +48,40 @@ async def create_note(
     if not has_room:
         raise QuotaExceeded(FeatureKey.MAX_NOTES)
 
-    note = await note_service.create_note(user.id, data)
+    try:
+        note = await note_service.create_note(user.id, data)
+    except Exception:
+        await usage_service.release(
+            organization_id=user.organization_id,
+            feature_key=FeatureKey.MAX_NOTES,
+            amount=1,
+        )
+        raise
 
-    await usage_service.update_usage(
-        organization_id=user.organization_id,
-        feature_key=FeatureKey.MAX_NOTES,
-        amount=1,
-    )
-
-    return NoteResponse.model_validate(note.model_dump())
+    return json_response(NoteResponse, note)
 
 
 @router.get("/", response_model=list[NoteResponse], operation_id="listNotes")
 @inject
 async def list_notes(
+    request: Request,
+    user: CurrentUser = Depends(min_role_required(Role.MEMBER)),
+    note_service: NoteService = Depends(Provide[Container.note_service]),
+):
+    return stream_rows(request, note_service.stream_notes(user.id), NoteResponse)
+
+
+@router.get(
+    "/summaries", response_model=NoteSummaryPage, operation_id="listNoteSummaries"
+)
+@inject
+async def list_note_summaries(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
     user: CurrentUser = Depends(min_role_required(Role.MEMBER)),
     note_service: NoteService = Depends(Provide[Container.note_service]),
 ):
-    notes = await note_service.list_notes(user.id)
-    return [NoteResponse.model_validate(n.model_dump()) for n in notes]
+    return await note_service.list_note_summaries(user.id, limit, cursor)
 
 
 @router.get("/{note_id}", response_model=NoteResponse, operation_id="getNote")
@@ -62,10 +94,15 @@ async def get_note(
     note = await note_service.get_note(user.id, note_id)
     if not note:
         raise ResourceNotFound("note", note_id)
-    return NoteResponse.model_validate(note.model_dump())
+    return json_response(NoteResponse, note)
 
 
-@router.put("/{note_id}", response_model=NoteResponse, operation_id="updateNote")
+@router.put(
+    "/{note_id}",
+    response_model=NoteResponse,
+    operation_id="updateNote",
+    dependencies=[Depends(request_connection)],
+)
 @inject
 async def update_note(
     note_id: int,
@@ -76,10 +113,15 @@ async def update_note(
     note = await note_service.update_note(user.id, note_id, data)
     if not note:
         raise ResourceNotFound("note", note_id)
-    return NoteResponse.model_validate(note.model_dump())
+    return json_response(NoteResponse, note)
 
 
-@router.delete("/{note_id}", status_code=204, operation_id="deleteNote")
+@router.delete(
+    "/{note_id}",
+    status_code=204,
+    operation_id="deleteNote",
+    dependencies=[Depends(request_transaction)],
+)
 @inject
 async def delete_note(
     note_id: int,
@@ -94,10 +136,10 @@ async def delete_note(
         raise ResourceNotFound("note", note_id)
     await note_service.delete_note(user.id, note_id)
     # Decrement usage count
-    await usage_service.update_usage(
+    await usage_service.release(
         organization_id=user.organization_id,
         feature_key=FeatureKey.MAX_NOTES,
-        amount=-1,
+        amount=1,
     )
 
 
@@ -117,7 +159,7 @@ async def organize_note(
 
     estimated_tokens = int(len(note.content) / 4)
 
-    has_tokens = await usage_service.check_quota_for(
+    has_tokens = await usage_service.try_consume(
         organization_id=user.organization_id,
         feature_key=FeatureKey.TOKEN_LIMIT,
         amount=estimated_tokens,
@@ -125,12 +167,14 @@ async def organize_note(
     if not has_tokens:
         raise QuotaExceeded(FeatureKey.TOKEN_LIMIT, limit=None)
 
-    organized_note = await note_service.organize_note(user.id, note_id)
-
-    await usage_service.update_usage(
-        organization_id=user.organization_id,
-        feature_key=FeatureKey.TOKEN_LIMIT,
-        amount=estimated_tokens,
-    )
-
-    return NoteResponse.model_validate(organized_note.model_dump())
+    try:
+        organized_note = await note_service.organize_note(user.id, note_id)
+    except Exception:
+        await usage_service.release(
+            organization_id=user.organization_id,
+            feature_key=FeatureKey.TOKEN_LIMIT,
+            amount=estimated_tokens,
+        )
+        raise
+
+    return json_response(NoteResponse, organized_note)
@@ -11,8 +11,9 @@ from app.model.plan_model import (
 from app.model.role_model import Role
 from app.model.user_model import CurrentUser
 from app.service.plan_service import PlanService
+from app.util.streaming_util import stream_rows
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Request
 
 router = APIRouter()
 
@@ -54,10 +55,11 @@ async def assign_plan(
 @router.get("/admin", response_model=list[Plan], operation_id="adminListPlans")
 @inject
 async def list_all_plans(
+    request: Request,
     user: CurrentUser = Depends(min_role_required(Role.SYSTEM_ADMIN)),
     plan_service: PlanService = Depends(Provide[Container.plan_service]),
 ):
-    return await plan_service.list_all_plans()
+    return stream_rows(request, plan_service.stream_all_plans(), Plan)
 
 
 @router.post("/admin", operation_id="adminCreatePlan")
@@ -12,7 +12,7 @@ from datetime import datetime, timezone, timedelta
 class StatsResponse(BaseModel):
     total_notes: int
     recent_notes: int  # last 30 days
-    ai_summaries_generated: int  # TODO: track this properly
+    ai_summaries_generated: int
 
 
 router = APIRouter()
@@ -25,18 +25,7 @@ async def get_stats(
     note_service: NoteService = Depends(Provide[Container.note_service]),
 ):
     """Get user statistics for dashboard"""
-    notes = await note_service.list_notes(user.id)
-    
-    # Calculate recent notes (last 30 days)
     thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-    
-    recent_count = len([
-        note for note in notes 
-        if note.updated_at >= thirty_days_ago
-    ])
-    
-    return StatsResponse(
-        total_notes=len(notes),
-        recent_notes=recent_count,
-        ai_summaries_generated=0  # TODO: implement proper tracking
-    )
\ No newline at end of file
+    stats = await note_service.get_note_stats(user.id, thirty_days_ago)
+
+    return StatsResponse(**stats.model_dump())
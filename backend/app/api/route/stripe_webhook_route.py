@@ -39,4 +39,14 @@ async def stripe_webhook(
     elif event_type == "customer.subscription.deleted":
         await subscription_service.handle_subscription_cancelled(event.data.object)
 
+    elif event_type.startswith("price."):
+        product = event.data.object.get("product")
+        # `product` is an id unless the event payload was expanded
+        stripe_service.invalidate_prices(
+            product if isinstance(product, str) else product and product.get("id")
+        )
+
+    elif event_type.startswith("product."):
+        stripe_service.invalidate_prices(event.data.object.get("id"))
+
     return Response(status_code=status.HTTP_200_OK)
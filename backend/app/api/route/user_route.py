@@ -11,8 +11,10 @@ from app.model.user_model import (
 )
 from app.service.onboarding_service import OnboardingService
 from app.service.user_service import UserService
+from app.util.serialization_util import json_response
+from app.util.streaming_util import stream_rows
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
 router = APIRouter()
 
@@ -21,7 +23,7 @@ router = APIRouter()
 async def get_current_user_route(
     user: CurrentUser = Depends(min_role_required(Role.READONLY)),
 ):
-    return UserWithRole.model_validate(user.model_dump())
+    return json_response(UserWithRole, user)
 
 
 @router.get("/status", response_model=UserStatus, operation_id="getUserStatus")
@@ -61,11 +63,11 @@ async def update_user_avatar(
 @router.get("/", response_model=list[SystemAdminUserResponse], operation_id="listUsers")
 @inject
 async def list_users(
+    request: Request,
     user: CurrentUser = Depends(min_role_required(Role.SYSTEM_ADMIN)),
     user_service: UserService = Depends(Provide[Container.user_service]),
 ):
-    users = await user_service.list_users()
-    return [SystemAdminUserResponse.model_validate(u.model_dump()) for u in users]
+    return stream_rows(request, user_service.stream_users(), SystemAdminUserResponse)
 
 
 @router.post("/{user_id}/suspend", operation_id="suspendUser")
@@ -2,6 +2,7 @@ from app.api.route.auth_route import router as auth_router
 from app.api.route.cron_route import router as cron_router
 from app.api.route.email_verification_route import router as email_verification_router
 from app.api.route.invitation_route import router as invitation_router
+from app.api.route.metrics_route import router as metrics_router
 from app.api.route.note_route import router as note_router
 from app.api.route.password_route import router as password_router
 from app.api.route.ping_route import router as ping_router
@@ -34,6 +35,7 @@ def include_all_routers(app: FastAPI):
         stripe_webhook_route, prefix="/webhooks", tags=["Stripe Webhook"]
     )
     app.include_router(cron_router, prefix="/cron", tags=["Cron Job"])
+    app.include_router(metrics_router, prefix="/metrics", tags=["Metrics"])
     app.include_router(
         subscription_route, prefix="/subscription", tags=["Subscription"]
     )
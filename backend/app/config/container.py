@@ -2,6 +2,7 @@ from app.config.settings import settings
 from app.data.db_config import DatabaseConfig
 from app.data.repo.email_verification_repo import EmailVerificationRepo
 from app.data.repo.invitation_repo import InvitationRepo
+from app.data.repo.job_repo import JobRepo
 from app.data.repo.note_repo import NoteRepo
 from app.data.repo.organization_plan_repo import OrganizationPlanRepo
 from app.data.repo.organization_repo import OrganizationRepo
@@ -15,25 +16,51 @@ from app.data.repo.user_repo import UserRepo
 from app.data.repo.user_setting_repo import UserSettingRepo
 from app.service.auth_service import AuthService
 from app.service.cron_service import CronService
+from app.service.email_dispatch_service import EmailDispatchService
 from app.service.email_service_factory import create_email_service
 from app.service.email_verification_service import EmailVerificationService
 from app.service.invitation_service import InvitationService
+from app.service.job_queue_service import JobQueueService
+from app.service.login_throttle_service import LoginThrottleService
 from app.service.note_service import NoteService
 from app.service.onboarding_service import OnboardingService
 from app.service.openai_service import OpenAIService
 from app.service.organization_usage_service import OrganizationUsageService
 from app.service.password_service import PasswordService
 from app.service.plan_service import PlanService
+from app.service.quota_lease_service import QuotaLeaseService
+from app.service.session_refresh_service import SessionRefreshService
 from app.service.setting_service import SettingService
 from app.service.stripe_service import StripeService
 from app.service.subscription_service import SubscriptionService
 from app.service.note_organizer_service import NoteOrganizerService
 from app.service.user_service import UserService
+from app.util.cache_util import TTLCache
+from app.util.json_util import get_json_codec
 from dependency_injector import containers, providers
 
 
 class Container(containers.DeclarativeContainer):
-    db_config = providers.Singleton(DatabaseConfig, dsn=settings.db_url)
+    db_config = providers.Singleton(
+        DatabaseConfig,
+        dsn=settings.db_url,
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+        max_inactive_connection_lifetime=settings.db_pool_max_inactive_connection_lifetime,
+        acquire_timeout=settings.db_pool_acquire_timeout_seconds,
+        replica_dsn=settings.db_replica_url,
+        replica_stickiness_seconds=settings.db_replica_stickiness_seconds,
+        statement_cache_size=settings.db_statement_cache_size,
+        prepare_named_queries=settings.db_prepare_named_queries,
+        json_codec=providers.Callable(get_json_codec, settings.db_json_codec),
+    )
+
+    # Caches
+    session_cache = providers.Singleton(
+        TTLCache,
+        max_size=settings.session_cache_max_size,
+        ttl_seconds=settings.session_cache_ttl_seconds,
+    )
 
     # Repositories
     user_repo = providers.Singleton(UserRepo, db_config=db_config)
@@ -41,6 +68,7 @@ class Container(containers.DeclarativeContainer):
     session_repo = providers.Singleton(SessionRepo, db_config=db_config)
     password_repo = providers.Singleton(PasswordRepo, db_config=db_config)
     note_repo = providers.Singleton(NoteRepo, db_config=db_config)
+    job_repo = providers.Singleton(JobRepo, db_config=db_config)
     setting_repo = providers.Factory(
         SettingRepo,
         db_config=db_config,
@@ -57,7 +85,11 @@ class Container(containers.DeclarativeContainer):
         OrganizationSettingRepo,
         db_config=db_config,
     )
-    plan_repo = providers.Factory(PlanRepo, db_config=db_config)
+    plan_repo = providers.Singleton(
+        PlanRepo,
+        db_config=db_config,
+        catalog_ttl_seconds=settings.plan_catalog_ttl_seconds,
+    )
 
     organization_plan_repo = providers.Factory(
         OrganizationPlanRepo,
@@ -73,11 +105,19 @@ class Container(containers.DeclarativeContainer):
         db_config=db_config,
     )
 
+    quota_lease_service = providers.Singleton(
+        QuotaLeaseService,
+        usage_repo=organization_usage_repo,
+        enabled=settings.quota_lease_enabled,
+        chunk_fraction=settings.quota_lease_chunk_fraction,
+        idle_seconds=settings.quota_lease_idle_seconds,
+    )
     organization_usage_service = providers.Factory(
         OrganizationUsageService,
         usage_repo=organization_usage_repo,
         plan_repo=plan_repo,
         organization_plan_repo=organization_plan_repo,
+        quota_lease_service=quota_lease_service,
     )
     subscription_service = providers.Factory(
         SubscriptionService,
@@ -87,10 +127,42 @@ class Container(containers.DeclarativeContainer):
     )
 
     # Stripe Service
-    stripe_service = providers.Factory(
+    stripe_service = providers.Singleton(
         StripeService,
         api_key=settings.stripe_api_key,
         webhook_secret=settings.stripe_webhook_secret,
+        api_base=settings.stripe_api_base,
+        timeout_seconds=settings.stripe_timeout_seconds,
+        max_network_retries=settings.stripe_max_network_retries,
+        price_cache_ttl_seconds=settings.stripe_price_cache_ttl_seconds,
+    )
+
+    session_refresh_service = providers.Singleton(
+        SessionRefreshService,
+        session_repo=session_repo,
+        enabled=settings.session_refresh_write_behind,
+        flush_interval_ms=settings.session_refresh_flush_interval_ms,
+        max_batch_size=settings.session_refresh_batch_size,
+    )
+
+    job_queue_service = providers.Singleton(
+        JobQueueService,
+        job_repo=job_repo,
+        enabled=settings.job_queue_enabled,
+        concurrency=settings.job_queue_concurrency,
+        poll_interval_ms=settings.job_queue_poll_interval_ms,
+        lock_timeout_seconds=settings.job_queue_lock_timeout_seconds,
+        max_attempts=settings.job_queue_max_attempts,
+    )
+
+    login_throttle_service = providers.Singleton(
+        LoginThrottleService,
+        max_concurrent=settings.login_max_concurrent,
+        max_waiting=settings.login_max_waiting,
+        ip_rate_per_minute=settings.login_ip_rate_per_minute,
+        ip_burst=settings.login_ip_burst,
+        email_rate_per_minute=settings.login_email_rate_per_minute,
+        email_burst=settings.login_email_burst,
     )
 
     # Subscription Service
@@ -108,6 +180,7 @@ class Container(containers.DeclarativeContainer):
         organization_repo=organization_repo,
         organization_plan_repo=organization_plan_repo,
         subscription_service=subscription_service,
+        job_queue_service=job_queue_service,
     )
 
     # Services
@@ -118,12 +191,23 @@ class Container(containers.DeclarativeContainer):
         setting_repo=setting_repo,
     )
 
-    email_service = providers.Singleton(create_email_service)
+    email_provider = providers.Singleton(create_email_service)
+    email_service = providers.Singleton(
+        EmailDispatchService,
+        provider=email_provider,
+        enabled=settings.email_dispatch_enabled,
+        workers=settings.email_dispatch_workers,
+        max_queue_size=settings.email_dispatch_queue_size,
+        batch_size=settings.email_dispatch_batch_size,
+        rate_per_minute=settings.email_rate_per_minute,
+        max_attempts=settings.email_dispatch_max_attempts,
+    )
     email_verification_service = providers.Factory(
         EmailVerificationService,
         email_service=email_service,
         email_verification_repo=email_verification_repo,
         user_repo=user_repo,
+        session_cache=session_cache,
     )
 
     invitation_service = providers.Factory(
@@ -145,13 +229,19 @@ class Container(containers.DeclarativeContainer):
         openai_service=openai_service,
     )
 
-    user_service = providers.Factory(UserService, user_repo=user_repo)
+    user_service = providers.Factory(
+        UserService,
+        user_repo=user_repo,
+        session_cache=session_cache,
+    )
     auth_service = providers.Factory(
         AuthService,
         user_repo=user_repo,
         session_repo=session_repo,
         org_repo=organization_repo,
         email_verification_service=email_verification_service,
+        session_cache=session_cache,
+        session_refresh_service=session_refresh_service,
     )
     password_service = providers.Factory(
         PasswordService,
@@ -169,6 +259,7 @@ class Container(containers.DeclarativeContainer):
     cron_service = providers.Factory(
         CronService,
         session_repo=session_repo,
+        job_repo=job_repo,
     )
 
     plan_service = providers.Factory(PlanService, plan_repo=plan_repo)
@@ -176,6 +267,7 @@ class Container(containers.DeclarativeContainer):
     wiring_config = containers.WiringConfiguration(
         modules=[
             "app.api.middleware.auth_handler",
+            "app.api.middleware.unit_of_work_handler",
             "app.api.route.user_route",
             "app.api.route.auth_route",
             "app.api.route.password_route",
@@ -188,5 +280,6 @@ class Container(containers.DeclarativeContainer):
             "app.api.route.invitation_route",
             "app.api.route.cron_route",
             "app.api.route.stats_route",
+            "app.api.route.metrics_route",
         ]
     )
@@ -25,25 +25,92 @@ class Settings(BaseSettings):
     mode: Literal["b2c", "b2b"] = "b2c"
     environment: Literal["dev", "beta", "prod"] = "dev"
     db_url: str
+    # Pool opened at startup; requests wait at most the acquire timeout for a
+    # connection before failing with 503 DATABASE_BUSY
+    db_pool_min_size: int = 10
+    db_pool_max_size: int = 30
+    db_pool_max_inactive_connection_lifetime: float = 300.0
+    db_pool_acquire_timeout_seconds: float = 10.0
+    # Optional hot standby for read-only queries. Reads stay on the primary for
+    # this long after the same user (or request) used it, to keep read-your-writes.
+    db_replica_url: Optional[str] = None
+    db_replica_stickiness_seconds: float = 5.0
+    # json/jsonb codec: "auto" uses orjson when installed, else the stdlib
+    db_json_codec: Literal["auto", "orjson", "json"] = "auto"
+    # asyncpg's per-connection LRU cache for ad-hoc SQL; named queries are prepared
+    # separately. Set both to 0/False behind a transaction-pooling PgBouncer.
+    db_statement_cache_size: int = 100
+    db_prepare_named_queries: bool = True
     base_web_url: str = "http://localhost:5173"
     base_api_url: str = "http://localhost:8000"
     session_cookie_name: str = "session_id"
     session_cookie_max_age: int = 60 * 60 * 24  # 1 day
     session_refresh_threshold: int = int(session_cookie_max_age * 0.5)
+    # In-process cache of validated sessions (set either to 0 to disable)
+    session_cache_ttl_seconds: int = 30
+    session_cache_max_size: int = 10_000
+    # Sliding-expiration refreshes are buffered and written in batches
+    session_refresh_write_behind: bool = True
+    session_refresh_flush_interval_ms: int = 500
+    session_refresh_batch_size: int = 500
+    # In-memory plan catalog; reloaded on writes, on LISTEN/NOTIFY and after the TTL
+    plan_catalog_ttl_seconds: int = 300
+    plan_catalog_listen: bool = True
+    # Quota leases: each worker reserves chunks of quota and spends them in memory
+    quota_lease_enabled: bool = False
+    quota_lease_chunk_fraction: float = 0.05
+    quota_lease_idle_seconds: int = 30
     openai_api_key: str = None  # Should be set in .env
     stripe_api_key: str
     stripe_webhook_secret: str
     stripe_portal_return_url: str = "/billing"  # Return URL after Stripe portal session
+    stripe_api_base: Optional[str] = None  # e.g. http://localhost:12111 for stripe-mock
+    stripe_timeout_seconds: float = 15
+    stripe_max_network_retries: int = 2
+    stripe_price_cache_ttl_seconds: int = 300
     invitation_expiry_days: int = 7
+    # Argon2id parameters; hashing runs on a dedicated pool of `password_hash_workers`
+    password_hash_time_cost: int = 2
+    password_hash_memory_cost: int = 19456  # KiB
+    password_hash_parallelism: int = 1
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+    # Login admission control (per worker)
+    login_max_concurrent: int = 8
+    login_max_waiting: int = 32
+    login_ip_rate_per_minute: int = 30
+    login_ip_burst: int = 10
+    login_email_rate_per_minute: int = 10
+    login_email_burst: int = 5
+    # Only enable behind a proxy that overwrites X-Forwarded-For
+    trust_forwarded_for: bool = False
     google_client_id: str
     google_client_secret: str
+    google_auth_url: str = "https://accounts.google.com/o/oauth2/v2/auth"
+    google_token_url: str = "https://oauth2.googleapis.com/token"
+    google_jwks_url: str = "https://www.googleapis.com/oauth2/v3/certs"
     jwt_secret_key: str
     # Cron Job related variables
     cron_secret: str
     cron_session_retention_days: int = 7
+    cron_job_retention_days: int = 7
+
+    # Background job queue (fastsvelte.job)
+    job_queue_enabled: bool = True
+    job_queue_concurrency: int = 4
+    job_queue_poll_interval_ms: int = 1000
+    job_queue_lock_timeout_seconds: int = 300
+    job_queue_max_attempts: int = 5
 
     # Email service configuration
     email_provider: Literal["stub", "azure", "sendgrid"] = "sendgrid"
+    # Outbound email is queued in memory and sent by background workers
+    email_dispatch_enabled: bool = True
+    email_dispatch_workers: int = 2
+    email_dispatch_queue_size: int = 1000
+    email_dispatch_batch_size: int = 100
+    email_dispatch_max_attempts: int = 3
+    email_rate_per_minute: Optional[float] = None  # Defaults to the provider's limit
 
     # Azure Email Service settings
     azure_email_connection_string: Optional[str] = None
@@ -53,6 +120,7 @@ class Settings(BaseSettings):
     sendgrid_api_key: Optional[str] = None
     sendgrid_sender_address: Optional[str] = None
     sendgrid_sender_name: Optional[str] = None
+    sendgrid_api_base: str = "https://api.sendgrid.com"
 
     model_config = ConfigDict(
         env_file=".env",
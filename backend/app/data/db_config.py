@@ -1,9 +1,42 @@
-import json
+import asyncio
+import bisect
 import ssl
-from typing import Optional
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import Context, ContextVar
+from typing import AsyncIterator, Callable, Hashable, Optional
 from urllib.parse import urlparse
 import logging as log
 import asyncpg
+from asyncpg.prepared_stmt import PreparedStatement
+
+from app.data.query_registry import NamedQuery, queries
+from app.exception.common_exception import DatabaseBusy
+from app.util.json_util import JsonCodec, get_json_codec
+
+# Upper bounds (ms) of the acquire wait histogram; the last bucket is unbounded
+ACQUIRE_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Whose writes the current request must be able to read back (usually the user)
+_consistency_key: ContextVar[Optional[Hashable]] = ContextVar(
+    "db_consistency_key", default=None
+)
+# When the current request last wrote to the primary
+_written_at: ContextVar[Optional[float]] = ContextVar("db_written_at", default=None)
+
+
+def bind_consistency_key(key: Hashable) -> None:
+    """Make the current request's reads see writes made earlier under `key`."""
+    _consistency_key.set(key)
+
+
+class AppConnection(asyncpg.Connection):
+    """asyncpg connection that also holds the prepared named queries."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_queries: dict[str, PreparedStatement] = {}
 
 
 class DatabaseConfig:
@@ -13,13 +46,41 @@ class DatabaseConfig:
         min_size: int = 10,
         max_size: int = 30,
         max_inactive_connection_lifetime: float = 300.0,
+        statement_cache_size: int = 100,
+        prepare_named_queries: bool = True,
+        acquire_timeout: Optional[float] = 10.0,
+        replica_dsn: Optional[str] = None,
+        replica_stickiness_seconds: float = 5.0,
+        max_sticky_keys: int = 10_000,
+        json_codec: Optional[JsonCodec] = None,
     ):
         self._dsn = dsn
         self._pool: Optional[asyncpg.Pool] = None
+        self._listener_connection: Optional[asyncpg.Connection] = None
         self._ssl_context: Optional[ssl.SSLContext] = self._create_ssl_context(dsn)
         self._min_size = min_size
         self._max_size = max_size
         self._max_inactive_connection_lifetime = max_inactive_connection_lifetime
+        # Both must be off behind a transaction-pooling proxy such as PgBouncer
+        self._statement_cache_size = statement_cache_size
+        self._prepare_named_queries = prepare_named_queries
+        self._acquire_timeout = acquire_timeout
+        self._json_codec = json_codec or get_json_codec()
+        self._replica_dsn = replica_dsn
+        self._replica_pool: Optional[asyncpg.Pool] = None
+        self._replica_retry_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._replica_stickiness_seconds = replica_stickiness_seconds
+        self._max_sticky_keys = max_sticky_keys
+        # Consistency key -> when it last used the primary
+        self._recent_writes: OrderedDict[Hashable, float] = OrderedDict()
+        self.replica_acquires = 0
+        self.sticky_reads = 0
+        self.acquires = 0
+        self.acquire_timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._wait_counts = [0] * (len(ACQUIRE_WAIT_BUCKETS_MS) + 1)
 
     def _create_ssl_context(self, dsn: str) -> Optional[ssl.SSLContext]:
         """Create an SSL context only if required."""
@@ -39,32 +100,297 @@ class DatabaseConfig:
         return ssl_context
 
     async def _init_connection(self, connection: asyncpg.Connection):
-        """Initialize the connection with custom type decoding for JSONB."""
+        """Initialize the connection with custom type decoding for JSON and JSONB."""
+        await self._set_json_codecs(connection)
+        if self._prepare_named_queries:
+            for query in queries.hot():
+                try:
+                    await self._prepare(connection, query)
+                except asyncpg.PostgresError as e:
+                    # e.g. a pending migration, or a replica that lags behind the
+                    # schema; prepared() retries lazily when the query first runs
+                    log.warning(f"Could not prepare query '{query.name}': {e!r}")
+
+    async def _set_json_codecs(self, connection: asyncpg.Connection) -> None:
+        """
+        Decode json/jsonb from the binary protocol with the configured codec.
+
+        Binary transfer hands the codec raw bytes, which orjson parses without first
+        building a str. jsonb's binary form is a version byte (1) and the JSON text.
+        """
+        dumps, loads = self._json_codec.dumps, self._json_codec.loads
         await connection.set_type_codec(
             "jsonb",
-            encoder=lambda v: json.dumps(v),
-            decoder=lambda v: json.loads(v),
+            encoder=lambda value: b"\x01" + dumps(value),
+            decoder=lambda data: loads(data[1:]),
+            schema="pg_catalog",
+            format="binary",
+        )
+        await connection.set_type_codec(
+            "json",
+            encoder=dumps,
+            decoder=loads,
             schema="pg_catalog",
+            format="binary",
         )
 
+    async def _prepare(
+        self, connection: asyncpg.Connection, query: NamedQuery
+    ) -> PreparedStatement:
+        statement = await connection.prepare(query.sql)
+        connection.prepared_queries[query.name] = statement
+        queries.prepares[query.name] += 1
+        return statement
+
+    async def prepared(
+        self, connection: asyncpg.Connection, query: NamedQuery
+    ) -> Optional[PreparedStatement]:
+        """
+        The connection's prepared statement for `query`, preparing it on first use.
+
+        Returns None when named queries are not prepared (the plain SQL is run instead).
+        """
+        if not self._prepare_named_queries:
+            return None
+        statement = connection.prepared_queries.get(query.name)
+        if statement is None:
+            statement = await self._prepare(connection, query)
+        return statement
+
+    def forget_prepared(
+        self, connection: asyncpg.Connection, query: NamedQuery
+    ) -> None:
+        """Drop a statement invalidated by a schema change; it is re-prepared on next use."""
+        connection.prepared_queries.pop(query.name, None)
+
+    @property
+    def connected(self) -> bool:
+        return self._pool is not None
+
     async def connect(self):
-        """Initialize the database connection pool."""
-        if not self._pool:
-            self._pool = await asyncpg.create_pool(
-                self._dsn,
-                ssl=self._ssl_context,
-                init=self._init_connection,
-                min_size=self._min_size,
-                max_size=self._max_size,
-                max_inactive_connection_lifetime=self._max_inactive_connection_lifetime,
+        """
+        Initialize the database connection pool.
+
+        The replica pool is opened by `warm_up` only, so requests never wait on an
+        unreachable replica.
+        """
+        if self._pool:
+            return
+        async with self._connect_lock:
+            if not self._pool:
+                self._pool = await self._create_pool(self._dsn, self._ssl_context)
+
+    async def _connect_replica(self) -> None:
+        self._replica_pool = await self._create_pool(
+            self._replica_dsn, self._create_ssl_context(self._replica_dsn)
+        )
+
+    async def _retry_replica(
+        self, initial_delay: float = 1.0, max_delay: float = 60.0
+    ) -> None:
+        delay = initial_delay
+        while self._replica_pool is None:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect_replica()
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+                delay = min(delay * 2, max_delay)
+                log.warning(
+                    f"Read replica still unreachable ({e!r}); retrying in {delay:.0f}s"
+                )
+        log.info("Connected to the read replica")
+
+    async def _create_pool(
+        self, dsn: str, ssl_context: Optional[ssl.SSLContext]
+    ) -> asyncpg.Pool:
+        return await asyncpg.create_pool(
+            dsn,
+            ssl=ssl_context,
+            init=self._init_connection,
+            connection_class=AppConnection,
+            statement_cache_size=self._statement_cache_size,
+            min_size=self._min_size,
+            max_size=self._max_size,
+            max_inactive_connection_lifetime=self._max_inactive_connection_lifetime,
+        )
+
+    async def warm_up(self) -> None:
+        """
+        Open the pool at startup so the first requests don't pay for connecting.
+
+        asyncpg opens `min_size` connections (running `_init_connection`, which
+        prepares the hot named queries) before `create_pool` returns. If the read
+        replica is unreachable, reads stay on the primary while a background task
+        retries it with backoff.
+        """
+        started = time.perf_counter()
+        retrying = self._replica_retry_task is not None
+        if self._replica_dsn and self._replica_pool is None and not retrying:
+            try:
+                await self._connect_replica()
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError):
+                # Reads use the primary until a single background task gets through
+                log.warning("Could not connect to the read replica", exc_info=True)
+                self._replica_retry_task = asyncio.create_task(
+                    self._retry_replica(), context=Context()
+                )
+        await self.connect()
+        replica = (
+            f" and {self._replica_pool.get_size()} replica connections"
+            if self._replica_pool
+            else ""
+        )
+        log.info(
+            f"Database pool ready with {self._pool.get_size()} connections{replica} "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+    @asynccontextmanager
+    async def acquire(
+        self, readonly: bool = False
+    ) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Check a connection out of the pool for the duration of the block.
+
+        Waits at most `acquire_timeout` seconds for a free connection and raises
+        DatabaseBusy (503) instead of queueing indefinitely when the pool is saturated.
+
+        With `readonly=True` the connection comes from the replica pool, if one is
+        configured, unless the request or its consistency key wrote within the
+        stickiness window (see `record_write`); replication lag then can't hide its
+        writes.
+        """
+        pool = await self.get_pool()
+        if readonly and self._replica_pool is not None:
+            if self._is_sticky():
+                self.sticky_reads += 1
+            else:
+                pool = self._replica_pool
+                self.replica_acquires += 1
+        started = time.perf_counter()
+        try:
+            connection = await pool.acquire(timeout=self._acquire_timeout)
+        except asyncio.TimeoutError:
+            self.acquire_timeouts += 1
+            in_use = pool.get_size() - pool.get_idle_size()
+            log.warning(
+                f"Timed out after {self._acquire_timeout}s waiting for a database "
+                f"connection ({in_use}/{self._max_size} in use)"
             )
+            raise DatabaseBusy(self._acquire_timeout) from None
+        self._record_wait(time.perf_counter() - started)
+        try:
+            yield connection
+        finally:
+            await pool.release(connection)
+
+    def _is_sticky(self) -> bool:
+        now = time.monotonic()
+        written_at = _written_at.get()
+        if (
+            written_at is not None
+            and now - written_at < self._replica_stickiness_seconds
+        ):
+            return True
+        key = _consistency_key.get()
+        if key is None:
+            return False
+        written_at = self._recent_writes.get(key)
+        return (
+            written_at is not None
+            and now - written_at < self._replica_stickiness_seconds
+        )
+
+    def record_write(self) -> None:
+        """
+        Note that the current request wrote to the primary.
+
+        Its read-only queries, and those of later requests bound to the same
+        consistency key, stay on the primary for the stickiness window. Repos call
+        this after each write; plain reads on the primary don't count.
+        """
+        if self._replica_dsn is None:
+            return
+        now = time.monotonic()
+        _written_at.set(now)
+        key = _consistency_key.get()
+        if key is None:
+            return
+        self._recent_writes[key] = now
+        self._recent_writes.move_to_end(key)
+        while len(self._recent_writes) > self._max_sticky_keys:
+            self._recent_writes.popitem(last=False)
+
+    def _record_wait(self, seconds: float) -> None:
+        self.acquires += 1
+        self.total_wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+        self._wait_counts[
+            bisect.bisect_left(ACQUIRE_WAIT_BUCKETS_MS, seconds * 1000)
+        ] += 1
+
+    def stats(self) -> dict:
+        """Pool occupancy and acquire waits for this worker."""
+        pool = self._pool
+        labels = [f"le_{bound}ms" for bound in ACQUIRE_WAIT_BUCKETS_MS] + ["inf"]
+        size = pool.get_size() if pool else 0
+        idle = pool.get_idle_size() if pool else 0
+        return {
+            "min_size": self._min_size,
+            "max_size": self._max_size,
+            "size": size,
+            "idle": idle,
+            # Includes the dedicated LISTEN connection, if any
+            "acquired": size - idle,
+            "acquires": self.acquires,
+            "acquire_timeouts": self.acquire_timeouts,
+            "avg_wait_ms": self.total_wait_seconds / (self.acquires or 1) * 1000,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+            "wait_histogram": dict(zip(labels, self._wait_counts)),
+            "replica": self._replica_stats(),
+        }
+
+    def _replica_stats(self) -> Optional[dict]:
+        if not self._replica_dsn:
+            return None
+        pool = self._replica_pool
+        return {
+            "connected": pool is not None,
+            "size": pool.get_size() if pool else 0,
+            "idle": pool.get_idle_size() if pool else 0,
+            "acquires": self.replica_acquires,
+            # Read-only acquires sent to the primary by the stickiness window
+            "sticky_reads": self.sticky_reads,
+            "sticky_keys": len(self._recent_writes),
+        }
+
+    async def add_listener(self, channel: str, callback: Callable) -> None:
+        """
+        Subscribe to a Postgres NOTIFY channel.
+
+        All listeners share one dedicated connection checked out of the pool for the
+        lifetime of the app. `callback` receives (connection, pid, channel, payload).
+        """
+        await self.connect()
+        if self._listener_connection is None:
+            self._listener_connection = await self._pool.acquire()
+        await self._listener_connection.add_listener(channel, callback)
 
     async def disconnect(self):
         """Close the database connection pool."""
+        if self._replica_retry_task is not None:
+            self._replica_retry_task.cancel()
+            self._replica_retry_task = None
+        if self._listener_connection is not None:
+            await self._pool.release(self._listener_connection)
+            self._listener_connection = None
         if self._pool:
-            log.info("Disconnecting from the database...", flush=True)
+            log.info("Disconnecting from the database...")
             await self._pool.close()
             self._pool = None
+        if self._replica_pool:
+            await self._replica_pool.close()
+            self._replica_pool = None
 
     async def get_pool(self) -> asyncpg.Pool:
         """Retrieve the database connection pool."""
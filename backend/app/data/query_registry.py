@@ -0,0 +1,68 @@
+from collections import Counter
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, eq=False)
+class NamedQuery:
+    """
+    A statement declared once under a stable name.
+
+    Named queries are prepared explicitly on each connection the first time they
+    run there (hot ones as soon as the connection opens) and the prepared
+    statement is reused from then on, independent of asyncpg's LRU statement
+    cache. Their SQL must be static so every call shares one statement.
+
+    Only statements on request hot paths (or whose plans are worth pinning) are
+    registered; the rest of the repos' inline SQL stays with asyncpg's statement
+    cache.
+    """
+
+    name: str
+    sql: str
+    hot: bool = False
+
+
+class QueryRegistry:
+    def __init__(self):
+        self._queries: dict[str, NamedQuery] = {}
+        self.prepares: Counter[str] = Counter()
+        self.executions: Counter[str] = Counter()
+
+    def register(self, name: str, sql: str, hot: bool = False) -> NamedQuery:
+        existing = self._queries.get(name)
+        if existing is not None:
+            if existing.sql != sql or existing.hot != hot:
+                raise ValueError(f"Query '{name}' is already registered")
+            return existing
+
+        query = NamedQuery(name=name, sql=sql, hot=hot)
+        self._queries[name] = query
+        return query
+
+    def hot(self) -> list[NamedQuery]:
+        return [query for query in self._queries.values() if query.hot]
+
+    def __iter__(self):
+        return iter(self._queries.values())
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def stats(self) -> dict:
+        """Per-query prepare and execute counts for this worker."""
+        return {
+            query.name: {
+                "hot": query.hot,
+                "prepares": self.prepares[query.name],
+                "executions": self.executions[query.name],
+            }
+            for query in self._queries.values()
+        }
+
+
+queries = QueryRegistry()
+
+
+def named_query(name: str, sql: str, hot: bool = False) -> NamedQuery:
+    """Declare a statement in the shared registry."""
+    return queries.register(name, sql, hot)
@@ -1,7 +1,22 @@
-from typing import Any, Callable, Dict, List
+import re
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Dict, List
 
 import asyncpg
 from app.data.db_config import DatabaseConfig
+from app.data.query_registry import NamedQuery, queries
+from app.data.unit_of_work import current_connection
+
+Query = str | NamedQuery
+
+_WRITE_KEYWORD = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def _writes(sql: str) -> bool:
+    """Whether `sql` may modify rows (SELECT ... FOR UPDATE counts, conservatively)."""
+    return _WRITE_KEYWORD.search(sql) is not None
 
 
 class BaseRepo:
@@ -16,36 +31,108 @@ class BaseRepo:
             await self.db_config.connect()
             self.initialized = True
 
-    async def fetch_one(self, query: str, *args: Any) -> Dict:
-        """Fetch a single record from the database."""
+    @asynccontextmanager
+    async def connection(
+        self, readonly: bool = False
+    ) -> AsyncIterator[asyncpg.Connection]:
+        """
+        The active unit of work's connection, or one acquired for this call.
+
+        `readonly` calls may be served by the read replica (see DatabaseConfig.acquire).
+        """
+        connection = current_connection()
+        if connection is not None:
+            yield connection
+            return
+
         await self.initialize()
-        pool = await self.db_config.get_pool()
-        async with pool.acquire() as connection:
-            result = await connection.fetchrow(query, *args)
-            return dict(result) if result else None
+        async with self.db_config.acquire(readonly) as connection:
+            yield connection
+
+    async def run(
+        self, connection: asyncpg.Connection, method: str, query: Query, *args: Any
+    ) -> Any:
+        """
+        Run `query` on `connection` with asyncpg's `fetch`, `fetchrow` or `fetchval`.
+
+        Named queries go through the connection's prepared statement and are counted
+        in the query registry; plain SQL relies on asyncpg's statement cache.
+        """
+        if not isinstance(query, NamedQuery):
+            return await getattr(connection, method)(query, *args)
 
-    async def fetch_all(self, query: str, *args: Any) -> List[Dict]:
+        queries.executions[query.name] += 1
+        statement = await self.db_config.prepared(connection, query)
+        if statement is None:
+            return await getattr(connection, method)(query.sql, *args)
+
+        try:
+            return await getattr(statement, method)(*args)
+        except (
+            asyncpg.exceptions.InvalidCachedStatementError,
+            asyncpg.exceptions.OutdatedSchemaCacheError,
+        ):
+            # A migration changed the statement's tables; re-prepare once
+            self.db_config.forget_prepared(connection, query)
+            if connection.is_in_transaction():
+                raise
+            statement = await self.db_config.prepared(connection, query)
+            return await getattr(statement, method)(*args)
+
+    async def fetch_one(self, query: Query, *args: Any, readonly: bool = False) -> Dict:
+        """Fetch a single record from the database."""
+        async with self.connection(readonly) as connection:
+            result = await self.run(connection, "fetchrow", query, *args)
+        self._record_if_write(query, readonly)
+        return dict(result) if result else None
+
+    async def fetch_all(
+        self, query: Query, *args: Any, readonly: bool = False
+    ) -> List[Dict]:
         """Fetch multiple records from the database."""
+        async with self.connection(readonly) as connection:
+            results = await self.run(connection, "fetch", query, *args)
+        self._record_if_write(query, readonly)
+        return [dict(row) for row in results]
+
+    def _record_if_write(self, query: Query, readonly: bool) -> None:
+        # INSERT/UPDATE ... RETURNING goes through fetch_one/fetch_all too
+        sql = query.sql if isinstance(query, NamedQuery) else query
+        if not readonly and _writes(sql):
+            self.db_config.record_write()
+
+    async def stream(
+        self, query: Query, *args: Any, prefetch: int = 500, readonly: bool = False
+    ) -> AsyncIterator[Dict]:
+        """
+        Yield records one at a time from a server-side cursor.
+
+        Rows are fetched `prefetch` at a time, so memory stays flat however many
+        rows match. The connection and its transaction are held until the iterator
+        is exhausted or closed. Streams always use a connection of their own, since
+        they usually outlive the request's unit of work.
+        """
         await self.initialize()
-        pool = await self.db_config.get_pool()
-        async with pool.acquire() as connection:
-            results = await connection.fetch(query, *args)
-            return [dict(row) for row in results]
+        if isinstance(query, NamedQuery):
+            query = query.sql
+        async with self.db_config.acquire(readonly) as connection:
+            async with connection.transaction():
+                async for record in connection.cursor(query, *args, prefetch=prefetch):
+                    yield dict(record)
 
-    async def execute(self, query: str, *args: Any) -> None:
+    async def execute(self, query: Query, *args: Any) -> None:
         """Execute a query without returning results."""
-        await self.initialize()
-        pool = await self.db_config.get_pool()
-        async with pool.acquire() as connection:
-            await connection.execute(query, *args)
+        async with self.connection() as connection:
+            if isinstance(query, NamedQuery):
+                # Prepared statements have no `execute`; `fetch` of a bare UPDATE is []
+                await self.run(connection, "fetch", query, *args)
+            else:
+                await connection.execute(query, *args)
+        self.db_config.record_write()
 
-    async def execute_and_return(self, query: str, *args: Any) -> Dict:
+    async def execute_and_return(self, query: Query, *args: Any) -> Dict:
         """Execute a query and return a single result."""
-        await self.initialize()
-        pool = await self.db_config.get_pool()
-        async with pool.acquire() as connection:
-            result = await connection.fetchrow(query, *args)
-            return dict(result) if result else None
+        return await self.fetch_one(query, *args)
 
     async def execute_transaction(
         self, operations: Callable[[asyncpg.Connection], Any]
@@ -53,11 +140,14 @@ class BaseRepo:
         """
         Execute a set of database operations within a single transaction.
 
+        Inside a unit of work this reuses its connection, as a savepoint if the unit
+        of work already has a transaction open.
+
         :param operations: A callable that takes an asyncpg.Connection and executes queries.
         :return: The result of the operation function if applicable.
         """
-        await self.initialize()
-        pool = await self.db_config.get_pool()
-        async with pool.acquire() as connection:
+        async with self.connection() as connection:
             async with connection.transaction():
-                return await operations(connection)
+                result = await operations(connection)
+        self.db_config.record_write()
+        return result
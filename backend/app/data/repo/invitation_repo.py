@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from app.data.repo.base_repo import BaseRepo
 from app.model.invitation_model import Invitation
@@ -33,7 +33,7 @@ class InvitationRepo(BaseRepo):
             WHERE organization_id = $1 AND accepted_at IS NULL
             ORDER BY created_at DESC
         """
-        rows = await self.fetch_all(query, organization_id)
+        rows = await self.fetch_all(query, organization_id, readonly=True)
         return [Invitation(**row) for row in rows]
 
     async def get_invitation_by_id(
@@ -81,11 +81,10 @@ class InvitationRepo(BaseRepo):
         )
         return len(rows) > 0
 
-    async def get_all_pending_invitations(self) -> list[Invitation]:
+    def stream_all_pending_invitations(self) -> AsyncIterator[dict]:
         query = """
             SELECT * FROM fastsvelte.invitation
             WHERE accepted_at IS NULL
             ORDER BY created_at DESC
         """
-        rows = await self.fetch_all(query)
-        return [Invitation(**row) for row in rows]
+        return self.stream(query, readonly=True)
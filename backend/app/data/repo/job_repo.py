@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.data.repo.base_repo import BaseRepo
+from app.model.job_model import Job
+
+
+class JobRepo(BaseRepo):
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict,
+        idempotency_key: Optional[str],
+        run_at: Optional[datetime],
+        max_attempts: int,
+    ) -> Optional[int]:
+        """Insert a job. Returns None if a job with the same key is already queued or running."""
+        query = """
+            INSERT INTO fastsvelte.job (kind, payload, idempotency_key, run_at, max_attempts)
+            VALUES ($1, $2, $3, COALESCE($4, now()), $5)
+            ON CONFLICT (idempotency_key) WHERE status IN ('pending', 'running')
+            DO NOTHING
+            RETURNING id
+        """
+        row = await self.fetch_one(
+            query, kind, payload, idempotency_key, run_at, max_attempts
+        )
+        return row["id"] if row else None
+
+    async def claim(self, limit: int, lock_timeout_seconds: float) -> list[Job]:
+        """
+        Lock up to `limit` due jobs for this worker.
+
+        SKIP LOCKED lets concurrent workers claim disjoint batches without waiting on
+        each other. Jobs left running by a crashed worker become claimable again once
+        their lock is older than `lock_timeout_seconds`, or are marked failed if that
+        run was their last attempt.
+        """
+        query = """
+            WITH exhausted AS (
+                UPDATE fastsvelte.job
+                SET status = 'failed',
+                    locked_at = NULL,
+                    last_error = 'Lock timed out on the last attempt',
+                    updated_at = now()
+                WHERE status = 'running'
+                  AND attempts >= max_attempts
+                  AND locked_at < now() - make_interval(secs => $2::float8)
+            ),
+            next AS (
+                SELECT id
+                FROM fastsvelte.job
+                WHERE (status = 'pending' AND run_at <= now())
+                   OR (status = 'running'
+                       AND attempts < max_attempts
+                       AND locked_at < now() - make_interval(secs => $2::float8))
+                ORDER BY run_at
+                LIMIT $1
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE fastsvelte.job j
+            SET status = 'running',
+                locked_at = now(),
+                attempts = j.attempts + 1,
+                updated_at = now()
+            FROM next
+            WHERE j.id = next.id
+            RETURNING j.id, j.kind, j.payload, j.attempts, j.max_attempts
+        """
+        rows = await self.fetch_all(query, limit, lock_timeout_seconds)
+        return [Job(**row) for row in rows]
+
+    async def mark_succeeded(self, job_id: int) -> None:
+        query = """
+            UPDATE fastsvelte.job
+            SET status = 'succeeded', locked_at = NULL, last_error = NULL, updated_at = now()
+            WHERE id = $1
+        """
+        await self.execute(query, job_id)
+
+    async def mark_failed(
+        self, job_id: int, error: str, retry_at: Optional[datetime]
+    ) -> None:
+        """Schedule another attempt at `retry_at`, or give up when it is None."""
+        query = """
+            UPDATE fastsvelte.job
+            SET status = CASE WHEN $3::timestamptz IS NULL THEN 'failed' ELSE 'pending' END,
+                run_at = COALESCE($3, run_at),
+                locked_at = NULL,
+                last_error = $2,
+                updated_at = now()
+            WHERE id = $1
+        """
+        await self.execute(query, job_id, error, retry_at)
+
+    async def delete_finished_older_than(self, days: int) -> int:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        query = """
+            DELETE FROM fastsvelte.job
+            WHERE status IN ('succeeded', 'failed') AND updated_at < $1
+            RETURNING id
+        """
+        rows = await self.fetch_all(query, cutoff)
+        return len(rows)
@@ -1,7 +1,47 @@
-from typing import Optional
+from datetime import datetime
+from typing import AsyncIterator, Optional
 
+from app.data.query_registry import named_query
 from app.data.repo.base_repo import BaseRepo
-from app.model.note_model import Note
+from app.model.note_model import Note, NoteStats, NoteSummary
+
+LIST_NOTE_SUMMARIES = named_query(
+    "note.list_summaries",
+    """
+    SELECT id, title, left(content, $3) AS preview, created_at, updated_at
+    FROM fastsvelte.note
+    WHERE user_id = $1
+    ORDER BY created_at DESC, id DESC
+    LIMIT $2
+    """,
+    hot=True,
+)
+
+LIST_NOTE_SUMMARIES_AFTER = named_query(
+    "note.list_summaries_after",
+    """
+    SELECT id, title, left(content, $3) AS preview, created_at, updated_at
+    FROM fastsvelte.note
+    WHERE user_id = $1 AND (created_at, id) < ($4, $5)
+    ORDER BY created_at DESC, id DESC
+    LIMIT $2
+    """,
+    hot=True,
+)
+
+GET_NOTE_STATS = named_query(
+    "note.get_stats",
+    """
+    SELECT COUNT(n.id) AS total_notes,
+           COUNT(n.id) FILTER (WHERE n.updated_at >= $2) AS recent_notes,
+           u.ai_summary_count AS ai_summaries_generated
+    FROM fastsvelte."user" u
+    LEFT JOIN fastsvelte.note n ON n.user_id = u.id
+    WHERE u.id = $1
+    GROUP BY u.id
+    """,
+    hot=True,
+)
 
 
 class NoteRepo(BaseRepo):
@@ -23,15 +63,44 @@ class NoteRepo(BaseRepo):
         row = await self.fetch_one(query, note_id, user_id)
         return Note(**row) if row else None
 
-    async def list_notes(self, user_id: int) -> list[Note]:
+    def stream_notes(self, user_id: int) -> AsyncIterator[dict]:
         query = """
             SELECT id, user_id, title, content, created_at, updated_at
             FROM fastsvelte.note
             WHERE user_id = $1
-            ORDER BY created_at DESC
+            ORDER BY created_at DESC, id DESC
+        """
+        return self.stream(query, user_id, readonly=True)
+
+    async def list_note_summaries(
+        self,
+        user_id: int,
+        limit: int,
+        preview_length: int,
+        after: Optional[tuple[datetime, int]] = None,
+    ) -> list[NoteSummary]:
+        """
+        Newest-first page of notes without their full content.
+
+        `after` is the (created_at, id) of the last note on the previous page. Paging
+        by key instead of OFFSET keeps every page a short range scan of
+        idx_note_user_created_id, however deep the user pages.
         """
-        rows = await self.fetch_all(query, user_id)
-        return [Note(**row) for row in rows]
+        if after is None:
+            rows = await self.fetch_all(
+                LIST_NOTE_SUMMARIES, user_id, limit, preview_length, readonly=True
+            )
+        else:
+            rows = await self.fetch_all(
+                LIST_NOTE_SUMMARIES_AFTER,
+                user_id,
+                limit,
+                preview_length,
+                after[0],
+                after[1],
+                readonly=True,
+            )
+        return [NoteSummary(**row) for row in rows]
 
     async def update_note(
         self, note_id: int, user_id: int, title: Optional[str], content: Optional[str]
@@ -47,6 +116,33 @@ class NoteRepo(BaseRepo):
         row = await self.fetch_one(query, note_id, user_id, title, content)
         return Note(**row) if row else None
 
+    async def save_organized_note(
+        self, note_id: int, user_id: int, content: str
+    ) -> Optional[Note]:
+        """Store AI-organized content and count the summary in the same statement."""
+        query = """
+            WITH updated AS (
+                UPDATE fastsvelte.note
+                SET content = $3,
+                    updated_at = now()
+                WHERE id = $1 AND user_id = $2
+                RETURNING id, user_id, title, content, created_at, updated_at
+            ), counted AS (
+                UPDATE fastsvelte."user"
+                SET ai_summary_count = ai_summary_count + 1
+                WHERE id = $2 AND EXISTS (SELECT 1 FROM updated)
+            )
+            SELECT * FROM updated
+        """
+        row = await self.fetch_one(query, note_id, user_id, content)
+        return Note(**row) if row else None
+
+    async def get_note_stats(self, user_id: int, since: datetime) -> NoteStats:
+        row = await self.fetch_one(GET_NOTE_STATS, user_id, since, readonly=True)
+        if row is None:
+            return NoteStats(total_notes=0, recent_notes=0, ai_summaries_generated=0)
+        return NoteStats(**row)
+
     async def delete_note(self, note_id: int, user_id: int) -> None:
         query = "DELETE FROM fastsvelte.note WHERE id = $1 AND user_id = $2"
         await self.execute(query, note_id, user_id)
@@ -51,5 +51,5 @@ class OrganizationSettingRepo(BaseRepo):
             JOIN fastsvelte.organization_setting_definition d ON s.definition_id = d.id
             WHERE s.organization_id = $1
         """
-        rows = await self.fetch_all(query, organization_id)
+        rows = await self.fetch_all(query, organization_id, readonly=True)
         return [OrganizationSettingWithDefinition(**row) for row in rows]
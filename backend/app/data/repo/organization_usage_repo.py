@@ -1,7 +1,24 @@
 from datetime import datetime
 
+from app.data.query_registry import named_query
 from app.data.repo.base_repo import BaseRepo
 
+TRY_INCREMENT_USAGE = named_query(
+    "org_usage.try_increment",
+    """
+    INSERT INTO fastsvelte.org_usage (
+        organization_id, feature_key, usage_count, period_start, period_end
+    )
+    SELECT $1, $2, $3::int, $4, $5
+    WHERE $3::int <= $6::int
+    ON CONFLICT (organization_id, feature_key, period_start)
+    DO UPDATE SET usage_count = org_usage.usage_count + EXCLUDED.usage_count
+    WHERE org_usage.usage_count + EXCLUDED.usage_count <= $6::int
+    RETURNING usage_count
+    """,
+    hot=True,
+)
+
 
 class OrganizationUsageRepo(BaseRepo):
     async def get_usage(
@@ -27,14 +44,20 @@ class OrganizationUsageRepo(BaseRepo):
         period_end: datetime,
         amount: int,
     ) -> None:
+        """
+        Add `amount` (negative to give quota back) to the period's usage.
+
+        The count is clamped at zero, including when a release lands in a period
+        that has no row yet.
+        """
         await self.execute(
             """
             INSERT INTO fastsvelte.org_usage (
                 organization_id, feature_key, usage_count, period_start, period_end
             )
-            VALUES ($1, $2, $3, $4, $5)
+            VALUES ($1, $2, GREATEST($3, 0), $4, $5)
             ON CONFLICT (organization_id, feature_key, period_start)
-            DO UPDATE SET usage_count = GREATEST(org_usage.usage_count + EXCLUDED.usage_count, 0)
+            DO UPDATE SET usage_count = GREATEST(org_usage.usage_count + $3, 0)
             """,
             organization_id,
             feature_key,
@@ -42,3 +65,81 @@ class OrganizationUsageRepo(BaseRepo):
             period_start,
             period_end,
         )
+
+    async def try_increment_usage(
+        self,
+        organization_id: int,
+        feature_key: str,
+        period_start: datetime,
+        period_end: datetime,
+        amount: int,
+        limit: int,
+    ) -> bool:
+        """
+        Add `amount` to the period's usage only if the result stays within `limit`.
+
+        The check and the increment are a single statement, so concurrent callers
+        can never push usage past the limit. Returns False when nothing was written.
+        """
+        row = await self.fetch_one(
+            TRY_INCREMENT_USAGE,
+            organization_id,
+            feature_key,
+            amount,
+            period_start,
+            period_end,
+            limit,
+        )
+        return row is not None
+
+    async def reserve_usage(
+        self,
+        organization_id: int,
+        feature_key: str,
+        period_start: datetime,
+        period_end: datetime,
+        amount: int,
+        limit: int,
+    ) -> int:
+        """
+        Reserve up to `amount` of the remaining quota and return how much was granted.
+
+        The grant is recorded as usage immediately; unused grants are handed back
+        with a negative `increment_usage`.
+        """
+
+        async def tx(conn):
+            await conn.execute(
+                """
+                INSERT INTO fastsvelte.org_usage (
+                    organization_id, feature_key, usage_count, period_start, period_end
+                )
+                VALUES ($1, $2, 0, $3, $4)
+                ON CONFLICT (organization_id, feature_key, period_start) DO NOTHING
+                """,
+                organization_id,
+                feature_key,
+                period_start,
+                period_end,
+            )
+            return await conn.fetchval(
+                """
+                UPDATE fastsvelte.org_usage u
+                SET usage_count = u.usage_count + g.granted
+                FROM (
+                    SELECT id, LEAST($4::int, $5::int - usage_count) AS granted
+                    FROM fastsvelte.org_usage
+                    WHERE organization_id = $1 AND feature_key = $2 AND period_start = $3
+                    FOR UPDATE
+                ) g
+                WHERE u.id = g.id AND g.granted > 0
+                RETURNING g.granted
+                """,
+                organization_id,
+                feature_key,
+                period_start,
+                amount,
+                limit,
+            )
+
+        return await self.execute_transaction(tx) or 0
@@ -1,5 +1,10 @@
-from typing import Optional
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Optional
 
+from app.data.db_config import DatabaseConfig
+from app.data.query_registry import named_query
 from app.data.repo.base_repo import BaseRepo
 from app.model.plan_model import (
     CurrentOrgPlanDetail,
@@ -8,8 +13,95 @@ from app.model.plan_model import (
     UpdatePlanRequest,
 )
 
+logger = logging.getLogger(__name__)
+
+PLAN_CHANGED_CHANNEL = "fastsvelte_plan_changed"
+
+
+# One static statement for any combination of fields; NULL keeps the current value
+UPDATE_PLAN = named_query(
+    "plan.update",
+    """
+    UPDATE fastsvelte.plan
+    SET description = COALESCE($2, description),
+        features = COALESCE($3::jsonb, features),
+        updated_at = now()
+    WHERE id = $1
+    """,
+)
+
 
 class PlanRepo(BaseRepo):
+    """
+    Plan lookups by id, Stripe product id and the default plan are served from an
+    in-memory catalog. The plan table is tiny and only changes through admin routes,
+    so the whole table is loaded at once and reloaded after any plan write, after a
+    `fastsvelte_plan_changed` notification from another worker, or after
+    `catalog_ttl_seconds` as a safety net.
+    """
+
+    def __init__(self, db_config: DatabaseConfig, catalog_ttl_seconds: float = 300):
+        super().__init__(db_config)
+        self.catalog_ttl_seconds = catalog_ttl_seconds
+        self._plans_by_id: dict[int, Plan] = {}
+        self._plans_by_product_id: dict[str, Plan] = {}
+        self._default_plan: Optional[Plan] = None
+        self._catalog_loaded_at: Optional[float] = None
+        self._catalog_version = 0
+        self._catalog_lock = asyncio.Lock()
+
+    async def load_catalog(self) -> None:
+        async with self._catalog_lock:
+            version = self._catalog_version
+            query = """
+                SELECT id, name, description, features, stripe_product_id,
+                       created_at, updated_at, is_default
+                FROM fastsvelte.plan
+                ORDER BY id
+            """
+            rows = await self.fetch_all(query)
+
+            plans_by_id: dict[int, Plan] = {}
+            plans_by_product_id: dict[str, Plan] = {}
+            default_plan = None
+            for row in rows:
+                is_default = row.pop("is_default")
+                plan = Plan(**row)
+                plans_by_id[plan.id] = plan
+                if plan.stripe_product_id:
+                    plans_by_product_id[plan.stripe_product_id] = plan
+                if is_default and default_plan is None:
+                    default_plan = plan
+
+            self._plans_by_id = plans_by_id
+            self._plans_by_product_id = plans_by_product_id
+            self._default_plan = default_plan
+            # A write that landed while we were loading may not be in `rows`
+            if version == self._catalog_version:
+                self._catalog_loaded_at = time.monotonic()
+
+    def invalidate_catalog(self) -> None:
+        self._catalog_version += 1
+        self._catalog_loaded_at = None
+
+    async def listen_for_changes(self) -> None:
+        """Invalidate the catalog whenever any worker changes the plan table."""
+        await self.db_config.add_listener(
+            PLAN_CHANGED_CHANNEL, lambda *_: self.invalidate_catalog()
+        )
+
+    def catalog_stats(self) -> dict:
+        return {
+            "plans": len(self._plans_by_id),
+            "loaded": self._catalog_loaded_at is not None,
+            "version": self._catalog_version,
+        }
+
+    async def _ensure_catalog(self) -> None:
+        loaded_at = self._catalog_loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.catalog_ttl_seconds:
+            await self.load_catalog()
+
     async def list_active_plans(self) -> list[Plan]:
         query = """
             SELECT id, name, description, features, stripe_product_id,
@@ -17,28 +109,21 @@ class PlanRepo(BaseRepo):
             FROM fastsvelte.plan
             WHERE is_active = TRUE
         """
-        rows = await self.fetch_all(query)
+        rows = await self.fetch_all(query, readonly=True)
         return [Plan(**row) for row in rows]
 
-    async def list_all_plans(self) -> list[Plan]:
+    def stream_all_plans(self) -> AsyncIterator[dict]:
         query = """
             SELECT id, name, description, features, stripe_product_id,
                    created_at, updated_at
             FROM fastsvelte.plan
             ORDER BY created_at DESC
         """
-        rows = await self.fetch_all(query)
-        return [Plan(**row) for row in rows]
+        return self.stream(query, readonly=True)
 
     async def get_by_stripe_product_id(self, product_id: str) -> Optional[Plan]:
-        query = """
-            SELECT id, name, description, features, stripe_product_id,
-                   created_at, updated_at
-            FROM fastsvelte.plan
-            WHERE stripe_product_id = $1
-        """
-        row = await self.fetch_one(query, product_id)
-        return Plan(**row) if row else None
+        await self._ensure_catalog()
+        return self._plans_by_product_id.get(product_id)
 
     async def get_current_plan(self, org_id: int) -> Optional[CurrentOrgPlanDetail]:
         query = """
@@ -72,30 +157,15 @@ class PlanRepo(BaseRepo):
             data.features,
             data.stripe_product_id,
         )
+        self.invalidate_catalog()
         return row["id"]
 
     async def update_plan(self, plan_id: int, data: UpdatePlanRequest) -> None:
-        updates = []
-        args = []
-        idx = 1
-
-        for field in ["description", "features"]:
-            val = getattr(data, field)
-            if val is not None:
-                updates.append(f"{field} = ${idx}")
-                args.append(val)
-                idx += 1
-
-        if not updates:
+        if data.description is None and data.features is None:
             return
 
-        query = f"""
-            UPDATE fastsvelte.plan
-            SET {", ".join(updates)}, updated_at = now()
-            WHERE id = ${idx}
-        """
-        args.append(plan_id)
-        await self.execute(query, *args)
+        await self.execute(UPDATE_PLAN, plan_id, data.description, data.features)
+        self.invalidate_catalog()
 
     async def soft_delete_plan(self, plan_id: int) -> None:
         query = """
@@ -104,24 +174,12 @@ class PlanRepo(BaseRepo):
             WHERE id = $1
         """
         await self.execute(query, plan_id)
+        self.invalidate_catalog()
 
     async def get_by_id(self, plan_id: int) -> Plan | None:
-        query = """
-            SELECT id, name, description, features, stripe_product_id,
-                   created_at, updated_at
-            FROM fastsvelte.plan
-            WHERE id = $1
-        """
-        row = await self.fetch_one(query, plan_id)
-        return Plan(**row) if row else None
+        await self._ensure_catalog()
+        return self._plans_by_id.get(plan_id)
 
     async def get_default_plan(self) -> Plan | None:
-        query = """
-            SELECT id, name, description, features, stripe_product_id,
-                   created_at, updated_at
-            FROM fastsvelte.plan
-            WHERE is_default = TRUE
-            LIMIT 1
-        """
-        row = await self.fetch_one(query)
-        return Plan(**row) if row else None
+        await self._ensure_catalog()
+        return self._default_plan
@@ -1,7 +1,82 @@
+import logging
 from datetime import datetime, timedelta, timezone
 
+from app.data.query_registry import named_query
 from app.data.repo.base_repo import BaseRepo
+from app.model.role_model import Role
 from app.model.session_model import Session
+from app.model.user_model import CurrentUser
+
+logger = logging.getLogger(__name__)
+
+GET_CURRENT_USER = named_query(
+    "session.get_current_user",
+    """
+    SELECT
+        s.id AS session_id,
+        s.created_at AS session_created_at,
+        s.expires_at AS session_expires_at,
+        u.id, u.email, u.first_name, u.last_name, u.avatar_url,
+        u.email_verified, u.email_verified_at,
+        u.is_active, u.deleted_at,
+        u.organization_id, u.role_id,
+        u.created_at, u.updated_at,
+        r.name AS role_name
+    FROM fastsvelte.session s
+    JOIN fastsvelte."user" u ON u.id = s.user_id
+    JOIN fastsvelte.role r ON r.id = u.role_id
+    WHERE s.id = $1
+      AND s.expires_at > $2
+      AND u.is_active AND u.deleted_at IS NULL
+    """,
+    hot=True,
+)
+
+# GET_CURRENT_USER that also slides the expiration forward when it is due
+REFRESH_CURRENT_USER = named_query(
+    "session.refresh_current_user",
+    """
+    WITH refreshed AS (
+        UPDATE fastsvelte.session s
+        SET expires_at = $4::timestamptz
+        FROM fastsvelte."user" u
+        WHERE s.id = $1
+          AND s.expires_at > $2 AND s.expires_at <= $3::timestamptz
+          AND u.id = s.user_id
+          AND u.is_active AND u.deleted_at IS NULL
+        RETURNING s.id, s.expires_at
+    )
+    SELECT
+        s.id AS session_id,
+        s.created_at AS session_created_at,
+        COALESCE(rs.expires_at, s.expires_at) AS session_expires_at,
+        u.id, u.email, u.first_name, u.last_name, u.avatar_url,
+        u.email_verified, u.email_verified_at,
+        u.is_active, u.deleted_at,
+        u.organization_id, u.role_id,
+        u.created_at, u.updated_at,
+        r.name AS role_name
+    FROM fastsvelte.session s
+    JOIN fastsvelte."user" u ON u.id = s.user_id
+    JOIN fastsvelte.role r ON r.id = u.role_id
+    LEFT JOIN refreshed rs ON rs.id = s.id
+    WHERE s.id = $1
+      AND s.expires_at > $2
+      AND u.is_active AND u.deleted_at IS NULL
+    """,
+    hot=True,
+)
+
+UPDATE_EXPIRATIONS = named_query(
+    "session.update_expirations",
+    """
+    UPDATE fastsvelte.session s
+    SET expires_at = v.expires_at
+    FROM unnest($1::text[], $2::timestamptz[]) AS v(id, expires_at)
+    WHERE s.id = v.id AND s.expires_at < v.expires_at
+    """,
+    hot=True,
+)
 
 
 class SessionRepo(BaseRepo):
@@ -23,6 +98,47 @@ class SessionRepo(BaseRepo):
         row = await self.fetch_one(query, session_id)
         return Session(**row) if row else None
 
+    async def get_current_user_by_session_id(
+        self,
+        session_id: str,
+        now: datetime,
+        refresh_before: datetime | None = None,
+        refreshed_expires_at: datetime | None = None,
+    ) -> CurrentUser | None:
+        """
+        Resolve a live session together with its active user and role in one round trip.
+
+        If the session expires before `refresh_before`, its expiration is slid forward
+        to `refreshed_expires_at` by the same statement. Pass `refresh_before=None` for
+        a read-only lookup, which doesn't count as a write for replica stickiness.
+        """
+        if refresh_before is None:
+            row = await self.fetch_one(GET_CURRENT_USER, session_id, now)
+        else:
+            row = await self.fetch_one(
+                REFRESH_CURRENT_USER,
+                session_id,
+                now,
+                refresh_before,
+                refreshed_expires_at,
+            )
+        if not row:
+            return None
+
+        try:
+            role = Role.get(row.pop("role_name"))
+        except KeyError:
+            logger.error(f"Unknown role for user_id={row['id']}")
+            return None
+
+        session = Session(
+            id=row.pop("session_id"),
+            user_id=row["id"],
+            created_at=row.pop("session_created_at"),
+            expires_at=row.pop("session_expires_at"),
+        )
+        return CurrentUser(**row, role=role, session=session)
+
     async def update_expiration(
         self, session_id: str, new_expiration: datetime
     ) -> None:
@@ -33,6 +149,12 @@ class SessionRepo(BaseRepo):
         """
         await self.execute(query, new_expiration, session_id)
 
+    async def update_expirations(
+        self, session_ids: list[str], new_expirations: list[datetime]
+    ) -> None:
+        """Apply many sliding-expiration refreshes at once. Never shortens a session."""
+        await self.execute(UPDATE_EXPIRATIONS, session_ids, new_expirations)
+
     async def delete_session(self, session_id: str) -> None:
         query = """
         DELETE FROM fastsvelte.session
@@ -1,12 +1,40 @@
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 
+from app.data.query_registry import named_query
 from app.data.repo.base_repo import BaseRepo
 from app.model.role_model import Role
 from app.model.user_model import CreateUser, User, UserWithPassword, UserWithRole
 
 logger = logging.getLogger(__name__)
 
+GET_USER_WITH_PASSWORD_BY_EMAIL = named_query(
+    "user.get_with_password_by_email",
+    """
+    SELECT
+        id, email, password_hash, first_name, last_name, avatar_url,
+        email_verified, email_verified_at,
+        is_active, deleted_at,
+        organization_id, role_id,
+        created_at, updated_at
+    FROM fastsvelte."user"
+    WHERE email = $1 AND deleted_at IS NULL
+    """,
+    hot=True,
+)
+
+# One static statement for any combination of fields; NULL keeps the current value
+UPDATE_USER_NAME = named_query(
+    "user.update_name",
+    """
+    UPDATE fastsvelte."user"
+    SET first_name = COALESCE($2, first_name),
+        last_name = COALESCE($3, last_name),
+        updated_at = now()
+    WHERE id = $1 AND deleted_at IS NULL
+    """,
+)
+
 
 class UserRepo(BaseRepo):
     async def get_user_by_id(self, user_id: int) -> Optional[User]:
@@ -22,7 +50,7 @@ class UserRepo(BaseRepo):
         row = await self.fetch_one(query, user_id)
         return User(**row) if row else None
 
-    async def list_users(self) -> list[User]:
+    def stream_users(self) -> AsyncIterator[dict]:
         query = """
             SELECT
                 id, email, first_name, last_name, avatar_url,
@@ -33,23 +61,12 @@ class UserRepo(BaseRepo):
             FROM fastsvelte."user"
             WHERE deleted_at IS NULL
         """
-        rows = await self.fetch_all(query)
-        return [User(**row) for row in rows]
+        return self.stream(query, readonly=True)
 
     async def get_user_with_password_by_email(
         self, email: str
     ) -> Optional[UserWithPassword]:
-        query = """
-            SELECT
-                id, email, password_hash, first_name, last_name, avatar_url,
-                email_verified, email_verified_at,
-                is_active, deleted_at,
-                organization_id, role_id,
-                created_at, updated_at
-            FROM fastsvelte."user"
-            WHERE email = $1 AND deleted_at IS NULL
-        """
-        row = await self.fetch_one(query, email)
+        row = await self.fetch_one(GET_USER_WITH_PASSWORD_BY_EMAIL, email)
         return UserWithPassword(**row) if row else None
 
     async def create_user(self, data: CreateUser) -> int:
@@ -152,27 +169,10 @@ class UserRepo(BaseRepo):
     async def update_user_name(
         self, user_id: int, first_name: str | None, last_name: str | None
     ) -> None:
-        updates = []
-        params = [user_id]
-
-        if first_name is not None:
-            updates.append("first_name = $" + str(len(params) + 1))
-            params.append(first_name)
-
-        if last_name is not None:
-            updates.append("last_name = $" + str(len(params) + 1))
-            params.append(last_name)
-
-        if not updates:
+        if first_name is None and last_name is None:
             return  # nothing to update
 
-        updates.append("updated_at = now()")
-        query = f"""
-            UPDATE fastsvelte."user"
-            SET {", ".join(updates)}
-            WHERE id = $1 AND deleted_at IS NULL
-        """
-        await self.execute(query, *params)
+        await self.execute(UPDATE_USER_NAME, user_id, first_name, last_name)
 
     async def get_user_by_oauth(
         self, provider_id: str, provider_user_id: str
@@ -204,11 +204,11 @@ class UserRepo(BaseRepo):
     async def update_user_avatar_if_null(self, user_id: int, avatar_url: str) -> bool:
         """
         Update user's avatar URL only if current avatar_url is NULL.
-        
+
         Args:
             user_id: User ID to update
             avatar_url: New avatar URL from OAuth provider
-            
+
         Returns:
             bool: True if avatar was updated, False if already had avatar
         """
@@ -224,7 +224,7 @@ class UserRepo(BaseRepo):
     async def update_user_avatar(self, user_id: int, avatar_data: str) -> None:
         """
         Update user's avatar with base64 image data.
-        
+
         Args:
             user_id: User ID to update
             avatar_data: Base64 data URL (e.g., "data:image/jpeg;base64,...")
@@ -239,7 +239,7 @@ class UserRepo(BaseRepo):
     async def update_user_status(self, user_id: int, is_active: bool) -> None:
         """
         Update user's active status (for suspend/activate functionality).
-        
+
         Args:
             user_id: User ID to update
             is_active: True to activate, False to suspend
@@ -50,5 +50,5 @@ class UserSettingRepo(BaseRepo):
             JOIN fastsvelte.user_setting_definition d ON s.definition_id = d.id
             WHERE s.user_id = $1
         """
-        rows = await self.fetch_all(query, user_id)
+        rows = await self.fetch_all(query, user_id, readonly=True)
         return [UserSettingWithDefinition(**row) for row in rows]
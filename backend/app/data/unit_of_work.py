@@ -0,0 +1,63 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+import asyncpg
+from app.data.db_config import DatabaseConfig
+
+# The connection held by the active unit of work and the task that opened it
+_current: ContextVar[Optional[tuple[asyncpg.Connection, asyncio.Task]]] = ContextVar(
+    "unit_of_work", default=None
+)
+
+
+def current_connection() -> Optional[asyncpg.Connection]:
+    """
+    The active unit of work's connection, if this task opened one.
+
+    Tasks spawned from inside a unit of work inherit the context variable but not
+    the connection: an asyncpg connection runs one query at a time and is returned
+    to the pool when the unit of work ends, so other tasks acquire their own.
+    """
+    current = _current.get()
+    if current is None or current[1] is not asyncio.current_task():
+        return None
+    return current[0]
+
+
+@asynccontextmanager
+async def unit_of_work(
+    db_config: DatabaseConfig, transaction: bool = False
+) -> AsyncIterator[asyncpg.Connection]:
+    """
+    Hold one pooled connection for every repo call made inside the block.
+
+    With `transaction=True` the calls also share a transaction that commits when the
+    block exits and rolls back if it raises. Nested units of work reuse the outer
+    connection (a nested transaction becomes a savepoint).
+    """
+    connection = current_connection()
+    if connection is not None:
+        if transaction:
+            async with connection.transaction():
+                yield connection
+        else:
+            yield connection
+        return
+
+    if not db_config.connected:
+        await db_config.connect()
+    async with db_config.acquire() as connection:
+        # Restored with set() rather than a token: FastAPI may exit the dependency
+        # from a copy of the context it was entered in
+        previous = _current.get()
+        _current.set((connection, asyncio.current_task()))
+        try:
+            if transaction:
+                async with connection.transaction():
+                    yield connection
+            else:
+                yield connection
+        finally:
+            _current.set(previous)
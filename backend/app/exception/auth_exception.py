@@ -79,3 +79,13 @@ class InvalidCredentials(BaseAppException):
             status_code=401,
             details=details,
         )
+
+
+class PasswordHashingBusy(BaseAppException):
+    def __init__(self, details: dict = None):
+        super().__init__(
+            code="PASSWORD_HASHING_BUSY",
+            message="Too many password operations in progress, please retry shortly",
+            status_code=503,
+            details=details,
+        )
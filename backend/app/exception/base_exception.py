@@ -10,9 +10,11 @@ class BaseAppException(Exception):
         status_code: int,
         details: Optional[dict] = None,
         error_id: Optional[str] = None,
+        headers: Optional[dict[str, str]] = None,
     ):
         self.code = code
         self.message = message
         self.status_code = status_code
         self.details = details or {}
         self.error_id = error_id or str(uuid.uuid4())
+        self.headers = headers
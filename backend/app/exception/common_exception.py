@@ -31,3 +31,35 @@ class QuotaExceeded(BaseAppException):
             status_code=403,
             details=details or {"feature_key": feature_key, "limit": limit},
         )
+
+
+class InvalidCursor(BaseAppException):
+    def __init__(self, cursor: str):
+        super().__init__(
+            code="INVALID_CURSOR",
+            message="Invalid pagination cursor",
+            status_code=400,
+            details={"cursor": cursor},
+        )
+
+
+class TooManyRequests(BaseAppException):
+    def __init__(self, retry_after_seconds: int, reason: str):
+        super().__init__(
+            code="TOO_MANY_REQUESTS",
+            message="Too many requests, please retry later",
+            status_code=429,
+            details={"reason": reason, "retry_after": retry_after_seconds},
+            headers={"Retry-After": str(retry_after_seconds)},
+        )
+
+
+class DatabaseBusy(BaseAppException):
+    def __init__(self, acquire_timeout_seconds: float):
+        super().__init__(
+            code="DATABASE_BUSY",
+            message="No database connection available, please retry shortly",
+            status_code=503,
+            details={"acquire_timeout": acquire_timeout_seconds},
+            headers={"Retry-After": "1"},
+        )
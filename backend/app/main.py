@@ -1,9 +1,14 @@
 import logging
+from contextlib import asynccontextmanager
 
 from app.api.middleware.error_handler import register_error_handlers
 from app.api.router import include_all_routers
 from app.config.container import Container
 from app.config.settings import settings
+from app.service.onboarding_service import FIRST_SEEN_JOB
+from app.util.email_template_util import precompile_email_templates
+from app.util.hash_util import hash_pool
+from app.util.oauth_util import google_oauth
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -11,6 +16,7 @@ logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
 )
+logger = logging.getLogger(__name__)
 
 
 def configure_cors(app: FastAPI) -> None:
@@ -23,9 +29,59 @@ def configure_cors(app: FastAPI) -> None:
     )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container: Container = app.container
+
+    db_config = container.db_config()
+    try:
+        await db_config.warm_up()
+    except Exception:
+        # Repos still connect lazily on first use
+        logger.warning("Could not warm up the database pool", exc_info=True)
+
+    session_refresh_service = container.session_refresh_service()
+    session_refresh_service.start()
+
+    precompile_email_templates()
+    email_service = container.email_service()
+    email_service.start()
+
+    job_queue_service = container.job_queue_service()
+    job_queue_service.register(
+        FIRST_SEEN_JOB,
+        lambda payload: container.onboarding_service().run_first_seen(**payload),
+    )
+    job_queue_service.start()
+
+    quota_lease_service = container.quota_lease_service()
+    if quota_lease_service.enabled:
+        quota_lease_service.start()
+
+    plan_repo = container.plan_repo()
+    try:
+        await plan_repo.load_catalog()
+        if settings.plan_catalog_listen:
+            await plan_repo.listen_for_changes()
+    except Exception:
+        # The catalog loads lazily on first use; the TTL bounds staleness without NOTIFY
+        logger.warning("Could not preload the plan catalog", exc_info=True)
+
+    yield
+
+    await job_queue_service.stop()
+    await email_service.stop()
+    await quota_lease_service.stop()
+    await session_refresh_service.stop()
+    await container.stripe_service().close()
+    await db_config.disconnect()
+    await google_oauth.close()
+    hash_pool.shutdown()
+
+
 def create_app() -> FastAPI:
     container = Container()
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
     app.container = container
 
     configure_cors(app)
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class Job(BaseModel):
+    id: int
+    kind: str
+    payload: dict
+    attempts: int
+    max_attempts: int
@@ -31,5 +31,24 @@ class NoteResponse(BaseModel):
     updated_at: datetime
 
 
+class NoteSummary(BaseModel):
+    id: int
+    title: str
+    preview: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class NoteSummaryPage(BaseModel):
+    items: list[NoteSummary]
+    next_cursor: Optional[str] = None
+
+
+class NoteStats(BaseModel):
+    total_notes: int
+    recent_notes: int
+    ai_summaries_generated: int
+
+
 class NoteImprovement(BaseModel):
     improved_content: str
@@ -19,7 +19,9 @@ from app.model.user_model import (
     UserWithPassword,
 )
 from app.service.email_verification_service import EmailVerificationService
-from app.util.hash_util import hash_password, verify_password_hash
+from app.service.session_refresh_service import SessionRefreshService
+from app.util.cache_util import TTLCache, evict_cached_sessions_for_user
+from app.util.hash_util import hash_password_async, verify_password_hash_async
 
 logger = logging.getLogger(__name__)
 
@@ -31,11 +33,17 @@ class AuthService:
         session_repo: SessionRepo,
         org_repo: OrganizationRepo,
         email_verification_service: EmailVerificationService,
+        session_cache: TTLCache[str, CurrentUser],
+        session_refresh_service: SessionRefreshService,
     ):
         self.user_repo = user_repo
         self.session_repo = session_repo
         self.org_repo = org_repo
         self.email_verification_service = email_verification_service
+        # Keyed by hashed session id. Must be invalidated whenever the session or
+        # the user's identity/status changes (logout, suspend, profile updates).
+        self.session_cache = session_cache
+        self.session_refresh_service = session_refresh_service
 
     def generate_session_token(self) -> str:
         return secrets.token_urlsafe(32)  # ~43 chars, secure, URL-safe
@@ -63,26 +71,48 @@ class AuthService:
 
     async def validate_session_token(self, token: str) -> CurrentUser | None:
         session_id = self.hash_token(token)
-        session = await self.session_repo.get_session_by_id(session_id)
-
-        if not session or session.expires_at <= datetime.now(timezone.utc):
+        now = datetime.now(timezone.utc)
+        refresh_before = now + timedelta(seconds=settings.session_refresh_threshold)
+        refreshed_expires_at = now + timedelta(seconds=settings.session_cookie_max_age)
+        write_behind = self.session_refresh_service.enabled
+
+        current_user = self.session_cache.get(session_id)
+        if current_user is None:
+            # Session lookup and user/role resolution happen in a single statement.
+            # Without write-behind, the sliding-expiration refresh is folded in too.
+            current_user = await self.session_repo.get_current_user_by_session_id(
+                session_id,
+                now,
+                refresh_before=None if write_behind else refresh_before,
+                refreshed_expires_at=None if write_behind else refreshed_expires_at,
+            )
+            if current_user is None:
+                return None
+            self.session_cache.set(session_id, current_user)
+        elif current_user.session.expires_at <= now:
+            self.session_cache.delete(session_id)
             return None
 
+        session = current_user.session
+
         # Extend session if it's expiring soon
-        if session.expires_at <= datetime.now(timezone.utc) + timedelta(
-            seconds=settings.session_refresh_threshold
-        ):
-            session.expires_at = datetime.now(timezone.utc) + timedelta(
-                seconds=settings.session_cookie_max_age
+        if session.expires_at <= refresh_before:
+            if write_behind:
+                self.session_refresh_service.schedule(session_id, refreshed_expires_at)
+            else:
+                await self.session_repo.update_expiration(
+                    session_id, refreshed_expires_at
+                )
+            current_user = current_user.model_copy(
+                update={
+                    "session": session.model_copy(
+                        update={"expires_at": refreshed_expires_at}
+                    )
+                }
             )
-            await self.session_repo.update_expiration(session_id, session.expires_at)
-
-        user = await self.user_repo.get_user_with_role_by_id(session.user_id)
-
-        if not user or not user.is_active or user.deleted_at is not None:
-            return None
+            self.session_cache.set(session_id, current_user)
 
-        return CurrentUser(**user.model_dump(), session=session)
+        return current_user
 
     async def signup(self, data: SignupRequest) -> SignupResult:
         # We perform an explicit uniqueness check before creating the user.
@@ -97,7 +127,7 @@ class AuthService:
         if existing:
             raise EmailAlreadyExists()
 
-        password_hash = hash_password(data.password)
+        password_hash = await hash_password_async(data.password)
 
         async def tx(conn):
             org_id = await self.org_repo.create_organization_tx(
@@ -140,7 +170,7 @@ class AuthService:
         if existing:
             raise EmailAlreadyExists()
 
-        password_hash = hash_password(data.password)
+        password_hash = await hash_password_async(data.password)
 
         async def tx(conn):
             org_id = await self.org_repo.create_organization_tx(
@@ -180,7 +210,7 @@ class AuthService:
         if not user_with_pw:
             return None
 
-        if not verify_password_hash(user_with_pw.password_hash, password):
+        if not await verify_password_hash_async(user_with_pw.password_hash, password):
             return None
 
         return User(**user_with_pw.model_dump())
@@ -210,6 +240,7 @@ class AuthService:
             # Update user profile with OAuth data if missing
             if avatar_url:
                 await self.user_repo.update_user_avatar_if_null(existing_user.id, avatar_url)
+                evict_cached_sessions_for_user(self.session_cache, existing_user.id)
             
             logger.info(f"Linked OAuth account to existing user: {existing_user.email}")
             return existing_user
@@ -306,6 +337,7 @@ class AuthService:
 
     async def invalidate_session(self, session_id: str) -> None:
         await self.session_repo.delete_session(session_id)
+        self.session_cache.delete(session_id)
         # if session:
         #     await self.session_audit_service.log_event(
         #         session_id=session.id, user_id=session.user_id, event="logout"
@@ -313,6 +345,7 @@ class AuthService:
 
     async def invalidate_all_sessions(self, user_id: int) -> None:
         await self.session_repo.delete_sessions_by_user_id(user_id)
+        evict_cached_sessions_for_user(self.session_cache, user_id)
         # for session in sessions:
         #     await self.session_audit_service.log_event(
         #         session_id=session.id, user_id=user_id, event="logout_all"
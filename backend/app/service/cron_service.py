@@ -1,14 +1,16 @@
 import logging
 
 from app.config.settings import settings
+from app.data.repo.job_repo import JobRepo
 from app.data.repo.session_repo import SessionRepo
 
 logger = logging.getLogger(__name__)
 
 
 class CronService:
-    def __init__(self, session_repo: SessionRepo):
+    def __init__(self, session_repo: SessionRepo, job_repo: JobRepo):
         self.session_repo = session_repo
+        self.job_repo = job_repo
 
     async def delete_old_sessions(self) -> None:
         days = settings.cron_session_retention_days
@@ -18,3 +20,12 @@ class CronService:
         count = await self.session_repo.delete_expired_older_than(days)
 
         logger.info("Deleted %d expired sessions older than %d days.", count, days)
+
+    async def delete_old_jobs(self) -> None:
+        days = settings.cron_job_retention_days
+
+        logger.info("Deleting finished jobs older than %d days...", days)
+
+        count = await self.job_repo.delete_finished_older_than(days)
+
+        logger.info("Deleted %d finished jobs older than %d days.", count, days)
@@ -0,0 +1,170 @@
+import asyncio
+import contextlib
+import logging
+import random
+
+from app.service.email_service_base import EmailMessage, EmailRejected, EmailService
+from app.util.rate_limit_util import KeyedTokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class EmailDispatchService(EmailService):
+    """
+    Sends email through `provider` from an in-process queue.
+
+    Callers return as soon as the message is queued. Worker tasks drain the queue,
+    group messages that share a template into batches of up to the provider's
+    `max_batch_size`, wait for the provider's rate limit and retry failed batches
+    with exponential backoff. Batches the provider rejects outright are not
+    retried; when the rejection may come from one bad message, the batch's
+    messages are sent one at a time instead. The queue is bounded, so `send` waits for room when
+    the provider falls behind, and it lives in memory: messages still queued when
+    `stop` times out are lost (and logged).
+
+    When disabled or not started, messages are sent inline without retries.
+    """
+
+    def __init__(
+        self,
+        provider: EmailService,
+        enabled: bool = True,
+        workers: int = 2,
+        max_queue_size: int = 1000,
+        batch_size: int = 100,
+        rate_per_minute: float | None = None,
+        max_attempts: int = 3,
+        backoff_base_seconds: float = 1,
+        backoff_max_seconds: float = 30,
+    ):
+        self.provider = provider
+        self.enabled = enabled
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.batch_size = max(1, min(batch_size, provider.max_batch_size))
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        rate_per_minute = rate_per_minute or provider.rate_per_minute
+        self._rate_limit = (
+            KeyedTokenBucket(rate_per_minute, burst=max(1, int(rate_per_minute / 60)))
+            if rate_per_minute
+            else None
+        )
+        self._queue: asyncio.Queue[EmailMessage] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self.sent = 0
+        self.batches = 0
+        self.retried = 0
+        self.dropped = 0
+
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        if self._queue is None:
+            await self.provider.send_batch(messages)
+            return
+        for message in messages:
+            await self._queue.put(message)
+
+    async def _send_email(
+        self, to_email: str, subject: str, plain_text: str, html_content: str
+    ) -> None:
+        await self.send(EmailMessage(to_email, subject, plain_text, html_content))
+
+    def start(self) -> None:
+        if not self.enabled or self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10) -> None:
+        """Give queued messages `timeout` seconds to go out, then stop the workers."""
+        if self._tasks:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._queue.join(), timeout)
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+
+            if not self._queue.empty():
+                self.dropped += self._queue.qsize()
+                logger.error(
+                    f"Dropped {self._queue.qsize()} unsent email(s) on shutdown"
+                )
+            self._queue = None
+
+        await self.provider.close()
+
+    async def _run(self) -> None:
+        while True:
+            messages = [await self._queue.get()]
+            while len(messages) < self.batch_size and not self._queue.empty():
+                messages.append(self._queue.get_nowait())
+
+            try:
+                batches: dict[tuple, list[EmailMessage]] = {}
+                for message in messages:
+                    batches.setdefault(message.template_key, []).append(message)
+                for batch in batches.values():
+                    await self._deliver(batch)
+            finally:
+                for _ in messages:
+                    self._queue.task_done()
+
+    async def _deliver(self, messages: list[EmailMessage]) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            await self._wait_for_rate_limit()
+            try:
+                await self.provider.send_batch(messages)
+            except EmailRejected as e:
+                if e.retry_individually and len(messages) > 1:
+                    logger.warning(
+                        f"Batch of {len(messages)} email(s) rejected, "
+                        f"sending them one at a time: {e}"
+                    )
+                    for message in messages:
+                        await self._deliver([message])
+                    return
+
+                self.dropped += len(messages)
+                logger.error(f"Dropping {len(messages)} rejected email(s): {e}")
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self.dropped += len(messages)
+                    logger.error(
+                        f"Giving up on {len(messages)} email(s) after {attempt} attempts: {e}"
+                    )
+                    return
+
+                delay = min(
+                    self.backoff_base_seconds * 2 ** (attempt - 1),
+                    self.backoff_max_seconds,
+                )
+                self.retried += 1
+                logger.warning(
+                    f"Sending {len(messages)} email(s) failed on attempt {attempt}, "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            else:
+                self.sent += len(messages)
+                self.batches += 1
+                return
+
+    async def _wait_for_rate_limit(self) -> None:
+        if self._rate_limit is None:
+            return
+        while not self._rate_limit.try_acquire("provider"):
+            await asyncio.sleep(self._rate_limit.retry_after("provider"))
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "sent": self.sent,
+            "batches": self.batches,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "provider": self.provider.stats(),
+        }
@@ -1,12 +1,60 @@
-from anyio.to_thread import run_sync
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
 from app.service.email_service_base import EmailService
-from azure.communication.email import EmailClient
-import logging as log
+from azure.communication.email.aio import EmailClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EmailDeliveryStatus:
+    recipient: str
+    status: str  # Succeeded, Failed, Canceled or TimedOut
+    operation_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+DeliveryCallback = Callable[[EmailDeliveryStatus], Optional[Awaitable[None]]]
+
 
 class AzureEmailService(EmailService):
-    def __init__(self, connection_string: str, sender_address: str):
-        self.client = EmailClient.from_connection_string(connection_string)
+    """
+    Sends through Azure Communication Services with the async (aiohttp) client.
+
+    `_send_email` returns once Azure has accepted the message. Delivery is then
+    tracked by a background task per message that awaits the long-running
+    operation; the outcome goes to `on_status` (logged by default). Tracking is
+    capped at `max_tracked` messages, beyond which new sends are not tracked.
+    """
+
+    # Default Azure Communication Services quota for custom domains
+    rate_per_minute = 30
+
+    def __init__(
+        self,
+        connection_string: str,
+        sender_address: str,
+        on_status: Optional[DeliveryCallback] = None,
+        polling_interval_seconds: float = 2,
+        status_timeout_seconds: float = 120,
+        max_tracked: int = 1000,
+        client: Any = None,
+    ):
+        self.client = client or EmailClient.from_connection_string(connection_string)
         self.sender_address = sender_address
+        self.on_status = on_status
+        self.polling_interval_seconds = polling_interval_seconds
+        self.status_timeout_seconds = status_timeout_seconds
+        self.max_tracked = max_tracked
+        self._tracking: set[asyncio.Task] = set()
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.untracked = 0
 
     async def _send_email(
         self, recipient: str, subject: str, plain_text: str, html: str
@@ -21,30 +69,74 @@ class AzureEmailService(EmailService):
             },
         }
 
-        def send_blocking():
-            poller = self.client.begin_send(message)
-
-            POLLER_WAIT_TIME = 1  # seconds
-            MAX_WAIT_TIME = 10  # seconds
-            time_elapsed = 0
-
-            while not poller.done():
-                log.info(f"[AzureEmail] Polling status: {poller.status()}")
-                poller.wait(POLLER_WAIT_TIME)
-                time_elapsed += POLLER_WAIT_TIME
+        try:
+            poller = await self.client.begin_send(
+                message, polling_interval=self.polling_interval_seconds
+            )
+        except Exception as e:
+            logger.error(f"[AzureEmail] Failed to send to {recipient}: {e}")
+            raise
 
-                if time_elapsed > MAX_WAIT_TIME:
-                    raise RuntimeError("Email sending timed out")
+        self.submitted += 1
+        if len(self._tracking) >= self.max_tracked:
+            self.untracked += 1
+            return
 
-            result = poller.result()
-            if result["status"] == "Succeeded":
-                log.info(f"[AzureEmail] Email sent (operation ID: {result['id']})")
-                return result["id"]
-            else:
-                raise RuntimeError(f"Send failed: {result['error']}")
+        task = asyncio.create_task(self._track(recipient, poller))
+        self._tracking.add(task)
+        task.add_done_callback(self._tracking.discard)
 
+    async def _track(self, recipient: str, poller) -> None:
         try:
-            await run_sync(send_blocking)
+            result = await asyncio.wait_for(
+                poller.result(), timeout=self.status_timeout_seconds
+            )
+            status = EmailDeliveryStatus(
+                recipient=recipient,
+                status=result.get("status", "Unknown"),
+                operation_id=result.get("id"),
+                error=str(result["error"]) if result.get("error") else None,
+            )
+        except asyncio.TimeoutError:
+            status = EmailDeliveryStatus(recipient=recipient, status="TimedOut")
         except Exception as e:
-            log.error(f"[AzureEmail] Failed to send to {recipient}: {e}")
-            raise
\ No newline at end of file
+            status = EmailDeliveryStatus(
+                recipient=recipient, status="Failed", error=str(e)
+            )
+
+        if status.status == "Succeeded":
+            self.succeeded += 1
+            logger.info(
+                f"[AzureEmail] Email sent (operation ID: {status.operation_id})"
+            )
+        else:
+            self.failed += 1
+            logger.error(
+                f"[AzureEmail] Delivery to {recipient} ended with {status.status}: "
+                f"{status.error}"
+            )
+
+        if self.on_status is not None:
+            try:
+                outcome = self.on_status(status)
+                if inspect.isawaitable(outcome):
+                    await outcome
+            except Exception:
+                logger.exception("[AzureEmail] Delivery status callback failed")
+
+    async def close(self, timeout: float = 10) -> None:
+        """Wait up to `timeout` seconds for tracked deliveries, then close the client."""
+        if self._tracking:
+            _, pending = await asyncio.wait(self._tracking, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        await self.client.close()
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "tracking": len(self._tracking),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "untracked": self.untracked,
+        }
@@ -1,185 +1,108 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+from app.util.email_template_util import (
+    EMAIL_VERIFICATION,
+    INVITATION,
+    LINK_PLACEHOLDER,
+    PASSWORD_RESET,
+    EmailBrand,
+    EmailTemplate,
+    get_email_template,
+)
+
+
+class EmailRejected(RuntimeError):
+    """
+    The provider refused the request itself, so sending it again won't help.
+
+    `retry_individually` is set when one bad message may have failed the whole
+    batch, and its messages are worth sending one at a time.
+    """
+
+    def __init__(self, message: str, retry_individually: bool = False):
+        super().__init__(message)
+        self.retry_individually = retry_individually
+
+
+@dataclass
+class EmailMessage:
+    to_email: str
+    subject: str
+    plain_text: str
+    html_content: str
+    substitutions: dict[str, str] = field(default_factory=dict)
+    template: EmailTemplate | None = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_template(
+        cls, to_email: str, template: EmailTemplate, link: str
+    ) -> "EmailMessage":
+        return cls(
+            to_email,
+            template.subject,
+            template.plain_text,
+            template.html_content,
+            {LINK_PLACEHOLDER: link},
+            template,
+        )
 
-from app.config.settings import settings
+    @property
+    def template_key(self) -> tuple[str, str, str]:
+        return self.subject, self.plain_text, self.html_content
 
+    def render(self) -> tuple[str, str, str]:
+        """Subject, plain text and HTML with the substitutions applied."""
+        if self.template is not None:
+            return self.template.render(self.substitutions[LINK_PLACEHOLDER])
 
-class EmailService(ABC):
-    async def send_email_verification(self, email: str, verification_link: str) -> None:
-        subject, plain_text, html_content = self._get_email_verification_content(
-            verification_link
-        )
-        await self._send_email(email, subject, plain_text, html_content)
+        rendered = []
+        for part in self.template_key:
+            for placeholder, value in self.substitutions.items():
+                part = part.replace(placeholder, value)
+            rendered.append(part)
+        return tuple(rendered)
 
-    async def send_invitation_email(self, email: str, invite_link: str) -> None:
-        subject, plain_text, html_content = self._get_invitation_email_content(
-            invite_link
-        )
-        await self._send_email(email, subject, plain_text, html_content)
 
-    async def send_password_reset_email(self, email: str, reset_link: str) -> None:
-        subject, plain_text, html_content = self._get_password_reset_email_content(
-            reset_link
-        )
-        await self._send_email(email, subject, plain_text, html_content)
+class EmailService(ABC):
+    # Provider limits used by EmailDispatchService; None means unlimited
+    max_batch_size: int = 1
+    rate_per_minute: float | None = None
 
-    @abstractmethod
-    async def _send_email(
-        self, to_email: str, subject: str, plain_text: str, html_content: str
+    async def send_email_verification(
+        self, email: str, verification_link: str, brand: EmailBrand | None = None
     ) -> None:
-        pass
+        template = get_email_template(EMAIL_VERIFICATION, brand)
+        await self.send(EmailMessage.from_template(email, template, verification_link))
 
-    def _get_invitation_email_content(self, invite_link: str) -> tuple[str, str, str]:
-        app_name = settings.app_name
-        app_description = settings.app_description
-        subject = f"You're invited to join {app_name}"
-
-        plain_text = f"""\
-
-You've been invited to join {app_name}.
-
-{app_name} {app_description}.
-
-To accept your invitation and get started, please click the link below:
-
-{invite_link}
+    async def send_invitation_email(
+        self, email: str, invite_link: str, brand: EmailBrand | None = None
+    ) -> None:
+        template = get_email_template(INVITATION, brand)
+        await self.send(EmailMessage.from_template(email, template, invite_link))
 
-If you have any questions, feel free to reach out to our support team.
+    async def send_password_reset_email(
+        self, email: str, reset_link: str, brand: EmailBrand | None = None
+    ) -> None:
+        template = get_email_template(PASSWORD_RESET, brand)
+        await self.send(EmailMessage.from_template(email, template, reset_link))
 
-— The {app_name} Team
-"""
+    async def send(self, message: EmailMessage) -> None:
+        await self.send_batch([message])
 
-        html_content = f"""\
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        """Deliver up to `max_batch_size` messages that share a template."""
+        for message in messages:
+            await self._send_email(message.to_email, *message.render())
 
-<html>
-<body style="font-family: Arial, sans-serif; color: #333;">
-  <div style="max-width: 600px; margin: auto; padding: 20px; border: 1px solid #eee; border-radius: 8px;">
-    <h2 style="color: #0056b3;">You’re Invited to Join {app_name}</h2>
-    <p>
-      {app_name} {app_description}.
-    </p>
+    async def close(self) -> None:
+        pass
 
-    <div style="margin: 24px 0;">
-      <a href="{invite_link}" style="
-        background-color: #0056b3;
-        color: white;
-        padding: 10px 15px;
-        text-decoration: none;
-        border-radius: 5px;
-        display: inline-block;
-      ">
-        Accept Invitation
-      </a>
-    </div>
-
-    <p>If the button doesn't work, copy and paste this link:</p>
-    <p style="word-break: break-all;"><a href="{invite_link}">{invite_link}</a></p>
+    def stats(self) -> dict:
+        return {}
 
-    <p style="margin-top: 30px;">If you have any questions, feel free to reach out to our support team.</p>
-    <p>— The {app_name} Team</p>
-  </div>
-</body>
-</html>
-"""
-        return subject, plain_text, html_content
-
-    def _get_password_reset_email_content(
-        self, reset_link: str
-    ) -> tuple[str, str, str]:
-        app_name = settings.app_name
-        subject = f"Reset your {app_name} password"
-
-        plain_text = f"""\
-
-We received a request to reset your {app_name} password.
-
-To proceed, click the link below:
-
-{reset_link}
-
-If you did not request this, you can safely ignore this email.
-
-— The {app_name} Team
-"""
-
-        html_content = f"""\
-
-<html>
-  <body style="font-family: Arial, sans-serif; color: #333;">
-    <div style="max-width: 600px; margin: auto; padding: 20px; border: 1px solid #eee; border-radius: 8px;">
-      <h2 style="color: #0056b3;">Reset Your Password</h2>
-      <p>We received a request to reset your {app_name} password.</p>
-
-      <div style="margin: 24px 0;">
-        <a href="{reset_link}" style="
-          background-color: #0056b3;
-          color: white;
-          padding: 10px 15px;
-          text-decoration: none;
-          border-radius: 5px;
-          display: inline-block;
-        ">
-          Reset Password
-        </a>
-      </div>
-
-      <p>If the button doesn't work, copy and paste this link:</p>
-      <p style="word-break: break-all;"><a href="{reset_link}">{reset_link}</a></p>
-
-      <p style="margin-top: 30px;">If you did not request this, you can safely ignore this email.</p>
-      <p>— The {app_name} Team</p>
-    </div>
-  </body>
-</html>
-"""
-        return subject, plain_text, html_content
-
-    def _get_email_verification_content(
-        self, verification_link: str
-    ) -> tuple[str, str, str]:
-        app_name = settings.app_name
-        subject = f"Verify your {app_name} email address"
-
-        plain_text = f"""\
-
-  Thank you for signing up for {app_name}!
-
-  Please verify your email address by clicking the link below:
-
-  {verification_link}
-
-  If you did not sign up, you can safely ignore this email.
-
-  — The {app_name} Team
-  """
-
-        html_content = f"""\
-
-  <html>
-    <body style="font-family: Arial, sans-serif; color: #333;">
-      <div style="max-width: 600px; margin: auto; padding: 20px; border: 1px solid #eee; border-radius: 8px;">
-        <h2 style="color: #0056b3;">Verify Your Email Address</h2>
-        <p>Thank you for signing up for {app_name}!</p>
-
-        <div style="margin: 24px 0;">
-          <a href="{verification_link}" style="
-            background-color: #0056b3;
-            color: white;
-            padding: 10px 15px;
-            text-decoration: none;
-            border-radius: 5px;
-            display: inline-block;
-          ">
-            Verify Email
-          </a>
-        </div>
-
-        <p>If the button doesn't work, copy and paste this link:</p>
-        <p style="word-break: break-all;"><a href="{verification_link}">{verification_link}</a></p>
-
-        <p style="margin-top: 30px;">If you did not sign up, you can safely ignore this email.</p>
-        <p>— The {app_name} Team</p>
-      </div>
-    </body>
-  </html>
-  """
-        return subject, plain_text, html_content
+    @abstractmethod
+    async def _send_email(
+        self, to_email: str, subject: str, plain_text: str, html_content: str
+    ) -> None:
+        pass
@@ -32,6 +32,7 @@ def create_email_service() -> EmailService:
             api_key=settings.sendgrid_api_key,
             sender_address=settings.sendgrid_sender_address,
             sender_name=settings.sendgrid_sender_name,
+            api_base=settings.sendgrid_api_base,
         )
     
     else:  # Default to stub
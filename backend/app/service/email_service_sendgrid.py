@@ -1,55 +1,87 @@
 import logging
-from app.service.email_service_base import EmailService
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
+
 import httpx
+from app.service.email_service_base import EmailMessage, EmailRejected, EmailService
 
 logger = logging.getLogger(__name__)
 
 
 class SendGridEmailService(EmailService):
-    def __init__(self, api_key: str, sender_address: str, sender_name: str = None):
+    # SendGrid accepts up to 1000 personalizations per request and rate limits
+    # /v3/mail/send to 600 requests per minute
+    max_batch_size = 1000
+    rate_per_minute = 600
+
+    def __init__(
+        self,
+        api_key: str,
+        sender_address: str,
+        sender_name: str = None,
+        api_base: str = "https://api.sendgrid.com",
+        timeout_seconds: float = 10,
+        max_connections: int = 10,
+    ):
         self.api_key = api_key
         self.sender_address = sender_address
         self.sender_name = sender_name or "FastSvelte"
-        self.client = SendGridAPIClient(api_key=api_key)
+        # One pooled client for the lifetime of the service, so connections (and
+        # their TLS sessions) are reused across messages
+        self.client = httpx.AsyncClient(
+            base_url=api_base,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
 
     async def _send_email(
         self, recipient: str, subject: str, plain_text: str, html: str
     ) -> None:
+        await self.send_batch([EmailMessage(recipient, subject, plain_text, html)])
+
+    async def send_batch(self, messages: list[EmailMessage]) -> None:
+        """Send messages sharing a template as one request, one personalization each."""
+        subject, plain_text, html = messages[0].template_key
+        payload = {
+            "personalizations": [
+                {
+                    "to": [{"email": message.to_email}],
+                    **(
+                        {"substitutions": message.substitutions}
+                        if message.substitutions
+                        else {}
+                    ),
+                }
+                for message in messages
+            ],
+            "from": {"email": self.sender_address, "name": self.sender_name},
+            "subject": subject,
+            "content": [
+                {"type": "text/plain", "value": plain_text},
+                {"type": "text/html", "value": html},
+            ],
+        }
+
         try:
-            from_email = (
-                (self.sender_address, self.sender_name)
-                if self.sender_name
-                else self.sender_address
-            )
-
-            message = Mail(
-                from_email=from_email,
-                to_emails=recipient,
-                subject=subject,
-                plain_text_content=plain_text,
-                html_content=html,
-            )
-
-            # Use httpx for async HTTP request instead of SendGrid's sync client
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.sendgrid.com/v3/mail/send",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json=message.get(),
+            response = await self.client.post("/v3/mail/send", json=payload)
+        except Exception as e:
+            logger.error(f"[SendGrid] Failed to send {len(messages)} email(s): {e}")
+            raise
+
+        if response.status_code != 202:
+            error_msg = f"SendGrid API error: {response.status_code} - {response.text}"
+            logger.error(f"[SendGrid] {error_msg}")
+            # 429 and 5xx are transient; any other 4xx is a bad request, and a 400
+            # can come from a single invalid recipient in the batch
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                raise EmailRejected(
+                    error_msg, retry_individually=response.status_code == 400
                 )
+            raise RuntimeError(error_msg)
 
-                if response.status_code == 202:
-                    logger.info(f"[SendGrid] Email sent successfully to {recipient}")
-                else:
-                    error_msg = f"SendGrid API error: {response.status_code} - {response.text}"
-                    logger.error(f"[SendGrid] {error_msg}")
-                    raise RuntimeError(error_msg)
+        logger.info(f"[SendGrid] Sent {len(messages)} email(s)")
 
-        except Exception as e:
-            logger.error(f"[SendGrid] Failed to send email to {recipient}: {e}")
-            raise
\ No newline at end of file
+    async def close(self) -> None:
+        await self.client.aclose()
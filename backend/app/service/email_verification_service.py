@@ -4,7 +4,9 @@ from datetime import datetime, timedelta, timezone
 from app.config.settings import settings
 from app.data.repo.email_verification_repo import EmailVerificationRepo
 from app.data.repo.user_repo import UserRepo
+from app.model.user_model import CurrentUser
 from app.service.email_service_base import EmailService
+from app.util.cache_util import TTLCache, evict_cached_sessions_for_user
 
 
 class EmailVerificationService:
@@ -13,10 +15,12 @@ class EmailVerificationService:
         email_service: EmailService,
         email_verification_repo: EmailVerificationRepo,
         user_repo: UserRepo,
+        session_cache: TTLCache[str, CurrentUser],
     ):
         self.email_service = email_service
         self.email_verification_repo = email_verification_repo
         self.user_repo = user_repo
+        self.session_cache = session_cache
         self.frontend_url = settings.base_web_url.rstrip("/")
 
     async def send_verification_email(self, user_id: int, email: str) -> None:
@@ -36,6 +40,8 @@ class EmailVerificationService:
             return False
 
         await self.email_verification_repo.mark_token_as_used_and_verify_user(user_id)
+        # Cached sessions still say the email is unverified
+        evict_cached_sessions_for_user(self.session_cache, user_id)
         return True
 
     async def get_user_by_email(self, email: str):
@@ -1,4 +1,5 @@
 import secrets
+from typing import AsyncIterator
 from datetime import datetime, timedelta, timezone
 
 from app.config.settings import settings
@@ -8,7 +9,7 @@ from app.data.repo.user_repo import UserRepo
 from app.exception.auth_exception import EmailAlreadyExists
 from app.model.invitation_model import Invitation
 from app.model.user_model import CreateUser
-from app.util.hash_util import hash_password
+from app.util.hash_util import hash_password_async
 
 
 class InvitationService:
@@ -80,7 +81,7 @@ class InvitationService:
         if not invitation:
             return False
 
-        password_hash = hash_password(password)
+        password_hash = await hash_password_async(password)
         now = datetime.now(timezone.utc)
 
         async def tx(conn):
@@ -109,5 +110,5 @@ class InvitationService:
         await self.invitation_repo.execute_transaction(tx)
         return True
 
-    async def get_all_pending_invitations(self) -> list[Invitation]:
-        return await self.invitation_repo.get_all_pending_invitations()
+    def stream_all_pending_invitations(self) -> AsyncIterator[dict]:
+        return self.invitation_repo.stream_all_pending_invitations()
@@ -0,0 +1,201 @@
+import asyncio
+import contextlib
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from app.data.repo.job_repo import JobRepo
+from app.model.job_model import Job
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict], Awaitable[Any]]
+
+
+class JobQueueService:
+    """
+    Postgres-backed background jobs processed by in-process async workers.
+
+    Jobs survive restarts because they live in `fastsvelte.job`. Every worker
+    process polls for due jobs (and is woken immediately by local enqueues),
+    claims them with SKIP LOCKED, and runs at most `concurrency` handlers at a
+    time. Failed jobs are retried with exponential backoff and jitter until
+    `max_attempts` is reached. Handlers must be idempotent: a job whose worker
+    dies mid-run is picked up again after `lock_timeout_seconds` (or failed, if
+    that was its last attempt).
+    """
+
+    def __init__(
+        self,
+        job_repo: JobRepo,
+        enabled: bool = True,
+        concurrency: int = 4,
+        poll_interval_ms: int = 1000,
+        lock_timeout_seconds: float = 300,
+        max_attempts: int = 5,
+        backoff_base_seconds: float = 2,
+        backoff_max_seconds: float = 600,
+    ):
+        self.job_repo = job_repo
+        self.enabled = enabled
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval_ms / 1000
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._handlers: dict[str, JobHandler] = {}
+        self._running: set[asyncio.Task] = set()
+        self._slots: asyncio.Semaphore | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict,
+        idempotency_key: Optional[str] = None,
+        run_at: Optional[datetime] = None,
+        max_attempts: Optional[int] = None,
+    ) -> Optional[int]:
+        """
+        Queue a job and return its id.
+
+        Returns None when a job with the same `idempotency_key` is already queued
+        or running, so callers can enqueue on every request without piling up
+        duplicates.
+        """
+        job_id = await self.job_repo.enqueue(
+            kind,
+            payload,
+            idempotency_key,
+            run_at,
+            max_attempts or self.max_attempts,
+        )
+        if job_id is not None and self._wakeup is not None and run_at is None:
+            self._wakeup.set()
+        return job_id
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        if self._task is None or self._task.done():
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10) -> None:
+        """Stop claiming jobs and give in-flight handlers `timeout` seconds to finish."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        if self._running:
+            # Unfinished jobs stay `running` and are reclaimed after the lock timeout
+            await asyncio.wait(self._running, timeout=timeout)
+
+    async def _run(self) -> None:
+        error_delay = self.poll_interval
+        while True:
+            try:
+                claimed = await self._claim_batch()
+                error_delay = self.poll_interval
+            except Exception:
+                logger.warning("Failed to claim background jobs", exc_info=True)
+                error_delay = min(error_delay * 2, 30)
+                await asyncio.sleep(error_delay)
+                continue
+
+            if claimed == 0:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self.poll_interval
+                    )
+                self._wakeup.clear()
+
+    async def _claim_batch(self) -> int:
+        # Only claim what we can start right away so jobs don't sit locked in memory
+        await self._slots.acquire()
+        free = 1
+        while free < self.concurrency and not self._slots.locked():
+            await self._slots.acquire()
+            free += 1
+
+        try:
+            jobs = await self.job_repo.claim(free, self.lock_timeout_seconds)
+        except BaseException:
+            for _ in range(free):
+                self._slots.release()
+            raise
+
+        for _ in range(free - len(jobs)):
+            self._slots.release()
+        for job in jobs:
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+        return len(jobs)
+
+    async def _execute(self, job: Job) -> None:
+        try:
+            handler = self._handlers.get(job.kind)
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind '{job.kind}'")
+
+            await handler(job.payload)
+        except Exception as e:
+            await self._record_failure(job, e)
+        else:
+            self.succeeded += 1
+            try:
+                await self.job_repo.mark_succeeded(job.id)
+            except Exception:
+                # The job will run again after the lock timeout; handlers are idempotent
+                logger.exception(f"Failed to mark job {job.id} as succeeded")
+        finally:
+            self._slots.release()
+
+    async def _record_failure(self, job: Job, error: Exception) -> None:
+        retry_at = None
+        if job.attempts < job.max_attempts:
+            delay = min(
+                self.backoff_base_seconds * 2 ** (job.attempts - 1),
+                self.backoff_max_seconds,
+            )
+            retry_at = datetime.now(timezone.utc) + timedelta(
+                seconds=delay * random.uniform(0.5, 1.0)
+            )
+            self.retried += 1
+            logger.warning(
+                f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}, "
+                f"retrying at {retry_at.isoformat()}: {error}"
+            )
+        else:
+            self.failed += 1
+            logger.error(
+                f"Job {job.id} ({job.kind}) failed permanently after "
+                f"{job.attempts} attempts: {error}"
+            )
+
+        try:
+            await self.job_repo.mark_failed(job.id, repr(error), retry_at)
+        except Exception:
+            logger.exception(f"Failed to record failure of job {job.id}")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "running": len(self._running),
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
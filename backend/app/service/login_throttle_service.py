@@ -0,0 +1,73 @@
+import asyncio
+import math
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.exception.common_exception import TooManyRequests
+from app.util.rate_limit_util import KeyedTokenBucket
+
+
+class LoginThrottleService:
+    """
+    Admission control for password logins.
+
+    Every attempt must take a token from both its client IP's bucket and its
+    email's bucket. At most `max_concurrent` credential verifications run at once,
+    and at most `max_waiting` more may queue for a slot. Anything beyond that is
+    rejected immediately with 429, so a credential-stuffing burst cannot tie up the
+    hashing pool or push up latency for the rest of the API.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 8,
+        max_waiting: int = 32,
+        ip_rate_per_minute: float = 30,
+        ip_burst: int = 10,
+        email_rate_per_minute: float = 10,
+        email_burst: int = 5,
+    ):
+        self.max_waiting = max_waiting
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._ip_buckets = KeyedTokenBucket(ip_rate_per_minute, ip_burst)
+        self._email_buckets = KeyedTokenBucket(email_rate_per_minute, email_burst)
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected_rate = 0
+        self.rejected_busy = 0
+
+    @asynccontextmanager
+    async def admit(self, client_ip: str, email: str) -> AsyncIterator[None]:
+        for bucket, key, reason in (
+            (self._ip_buckets, client_ip, "ip"),
+            (self._email_buckets, email, "email"),
+        ):
+            if not bucket.try_acquire(key):
+                self.rejected_rate += 1
+                raise TooManyRequests(math.ceil(bucket.retry_after(key)), reason)
+
+        if self._semaphore.locked() and self.waiting >= self.max_waiting:
+            self.rejected_busy += 1
+            raise TooManyRequests(1, "busy")
+
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        try:
+            self.admitted += 1
+            yield
+        finally:
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected_rate": self.rejected_rate,
+            "rejected_busy": self.rejected_busy,
+            "tracked_ips": len(self._ip_buckets),
+            "tracked_emails": len(self._email_buckets),
+        }
@@ -1,6 +1,18 @@
+from datetime import datetime
+from typing import AsyncIterator
+
 from app.data.repo.note_repo import NoteRepo
-from app.model.note_model import CreateNoteRequest, Note, UpdateNoteRequest
+from app.model.note_model import (
+    CreateNoteRequest,
+    Note,
+    NoteStats,
+    NoteSummaryPage,
+    UpdateNoteRequest,
+)
 from app.service.note_organizer_service import NoteOrganizerService
+from app.util.pagination_util import decode_cursor, encode_cursor
+
+NOTE_PREVIEW_LENGTH = 200
 
 
 class NoteService:
@@ -11,8 +23,24 @@ class NoteService:
     async def create_note(self, user_id: int, data: CreateNoteRequest) -> Note:
         return await self.note_repo.create_note(user_id, data.title, data.content)
 
-    async def list_notes(self, user_id: int) -> list[Note]:
-        return await self.note_repo.list_notes(user_id)
+    def stream_notes(self, user_id: int) -> AsyncIterator[dict]:
+        return self.note_repo.stream_notes(user_id)
+
+    async def list_note_summaries(
+        self, user_id: int, limit: int, cursor: str | None = None
+    ) -> NoteSummaryPage:
+        after = decode_cursor(cursor) if cursor else None
+        # One extra row tells us whether another page exists
+        items = await self.note_repo.list_note_summaries(
+            user_id, limit + 1, NOTE_PREVIEW_LENGTH, after
+        )
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+
+        return NoteSummaryPage(items=items, next_cursor=next_cursor)
 
     async def get_note(self, user_id: int, note_id: int) -> Note | None:
         return await self.note_repo.get_note_by_id(note_id, user_id)
@@ -32,4 +60,7 @@ class NoteService:
         if not note:
             return None
         improved_content = await self.note_organizer_service.organize_and_improve(note.content)
-        return await self.note_repo.update_note(note_id, user_id, note.title, improved_content)
+        return await self.note_repo.save_organized_note(note_id, user_id, improved_content)
+
+    async def get_note_stats(self, user_id: int, since: datetime) -> NoteStats:
+        return await self.note_repo.get_note_stats(user_id, since)
@@ -3,10 +3,13 @@ from datetime import datetime, timedelta, timezone
 
 from app.data.repo.organization_plan_repo import OrganizationPlanRepo
 from app.data.repo.organization_repo import OrganizationRepo
+from app.service.job_queue_service import JobQueueService
 from app.service.subscription_service import SubscriptionService
 
 logger = logging.getLogger(__name__)
 
+FIRST_SEEN_JOB = "onboarding.first_seen"
+
 
 class OnboardingService:
     def __init__(
@@ -14,10 +17,22 @@ class OnboardingService:
         organization_repo: OrganizationRepo,
         organization_plan_repo: OrganizationPlanRepo,
         subscription_service: SubscriptionService,
+        job_queue_service: JobQueueService,
     ):
         self.organization_repo = organization_repo
         self.organization_plan_repo = organization_plan_repo
         self.subscription_service = subscription_service
+        self.job_queue_service = job_queue_service
+
+    async def schedule_first_seen(
+        self, org_id: int, email: str, full_name: str
+    ) -> None:
+        """Queue `run_first_seen` as a durable background job, at most one per org in flight."""
+        await self.job_queue_service.enqueue(
+            FIRST_SEEN_JOB,
+            {"org_id": org_id, "email": email, "full_name": full_name},
+            idempotency_key=f"{FIRST_SEEN_JOB}:{org_id}",
+        )
 
     async def run_first_seen(self, org_id: int, email: str, full_name: str) -> None:
         """
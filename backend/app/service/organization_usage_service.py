@@ -4,7 +4,8 @@ from datetime import datetime, timezone
 from app.data.repo.organization_plan_repo import OrganizationPlanRepo
 from app.data.repo.organization_usage_repo import OrganizationUsageRepo
 from app.data.repo.plan_repo import PlanRepo
-from app.model.plan_model import FeatureKey
+from app.model.plan_model import FeatureKey, Plan
+from app.service.quota_lease_service import QuotaLeaseService
 from app.util.quota_util import get_current_quota_period
 
 logger = logging.getLogger(__name__)
@@ -16,12 +17,33 @@ class OrganizationUsageService:
         usage_repo: OrganizationUsageRepo,
         plan_repo: PlanRepo,
         organization_plan_repo: OrganizationPlanRepo,
+        quota_lease_service: QuotaLeaseService | None = None,
     ):
         self.usage_repo = usage_repo
         self.plan_repo = plan_repo
         self.organization_plan_repo = organization_plan_repo
+        # Opt-in: spend quota from worker-local leases instead of per-request writes
+        self.quota_lease_service = (
+            quota_lease_service
+            if quota_lease_service is not None and quota_lease_service.enabled
+            else None
+        )
 
     async def _get_plan_and_period(self, organization_id: int):
+        if self.quota_lease_service is None:
+            return await self._load_plan_and_period(organization_id)
+
+        plan_periods = self.quota_lease_service.plan_periods
+        cached = plan_periods.get(organization_id)
+        if cached is not None and cached[2] > datetime.now(timezone.utc):
+            return cached
+
+        result = await self._load_plan_and_period(organization_id)
+        if result[0] is not None:
+            plan_periods.set(organization_id, result)
+        return result
+
+    async def _load_plan_and_period(self, organization_id: int):
         """Get plan and quota period for an organization, falling back to default plan if needed."""
         plan_info = await self.organization_plan_repo.get_current_plan(organization_id)
         
@@ -31,8 +53,12 @@ class OrganizationUsageService:
             if plan is None:
                 logger.warning(f"No default plan found for organization {organization_id}")
                 return None, None, None
-            # Use current time for quota period when no subscription exists
-            period_start, period_end = get_current_quota_period(datetime.now(timezone.utc))
+            # Without a subscription, quota periods follow calendar months. Anchoring on
+            # "now" would start a fresh period (and usage row) on every call.
+            month_start = datetime.now(timezone.utc).replace(
+                day=1, hour=0, minute=0, second=0, microsecond=0
+            )
+            period_start, period_end = get_current_quota_period(month_start)
         else:
             plan = await self.plan_repo.get_by_id(plan_info.plan_id)
             period_start, period_end = get_current_quota_period(plan_info.subscription_started_at)
@@ -43,52 +69,72 @@ class OrganizationUsageService:
 
         return plan, period_start, period_end
 
-    async def check_quota_for(
+    def _get_limit(self, plan: Plan, feature_key: FeatureKey) -> int:
+        try:
+            return int(plan.get_feature(feature_key))
+        except Exception:
+            logger.exception(
+                f"Invalid or missing feature '{feature_key}' in plan '{plan.name}' (id={plan.id})"
+            )
+            raise  # propagate as 500 Internal Server Error
+
+    async def try_consume(
         self,
         organization_id: int,
         feature_key: FeatureKey,
         amount: int,
     ) -> bool:
-        plan, period_start, _ = await self._get_plan_and_period(organization_id)
+        """
+        Atomically reserve `amount` of the feature's quota for the current period.
+
+        Returns False, without recording anything, when the reservation would exceed
+        the plan limit. Callers must `release` the same amount if the guarded work fails.
+        """
+        plan, period_start, period_end = await self._get_plan_and_period(organization_id)
         if plan is None:
             return False
 
-        usage = await self.usage_repo.get_usage(
-            organization_id, feature_key, period_start
-        )
+        limit = self._get_limit(plan, feature_key)
 
-        try:
-            limit = int(plan.get_feature(feature_key))
-        except Exception:
-            logger.exception(
-                f"Invalid or missing feature '{feature_key}' in plan '{plan.name}' (id={plan.id})"
+        if self.quota_lease_service is not None:
+            return await self.quota_lease_service.consume(
+                organization_id=organization_id,
+                feature_key=feature_key,
+                period_start=period_start,
+                period_end=period_end,
+                amount=amount,
+                limit=limit,
             )
-            raise  # propagate as 500 Internal Server Error
 
-        return (usage + amount) <= limit
+        return await self.usage_repo.try_increment_usage(
+            organization_id=organization_id,
+            feature_key=feature_key,
+            period_start=period_start,
+            period_end=period_end,
+            amount=amount,
+            limit=limit,
+        )
 
-    async def update_usage(
+    async def release(
         self,
         organization_id: int,
         feature_key: FeatureKey,
         amount: int,
     ) -> None:
+        """Give back `amount` of previously consumed quota (usage never drops below zero)."""
         plan, period_start, period_end = await self._get_plan_and_period(organization_id)
         if plan is None:
             return
 
-        try:
-            _ = int(plan.get_feature(feature_key))
-        except Exception:
-            logger.exception(
-                f"Invalid or missing feature '{feature_key}' in plan '{plan.name}' (id={plan.id})"
-            )
-            raise  # propagate as 500 Internal Server Error
+        if self.quota_lease_service is not None and self.quota_lease_service.release(
+            organization_id, feature_key, period_start, amount
+        ):
+            return
 
         await self.usage_repo.increment_usage(
             organization_id=organization_id,
             feature_key=feature_key,
             period_start=period_start,
             period_end=period_end,
-            amount=amount,
+            amount=-amount,
         )
@@ -9,7 +9,7 @@ from app.exception.password_exception import (
     PasswordResetTokenInvalid,
 )
 from app.model.password_model import PasswordResetToken
-from app.util.hash_util import hash_password
+from app.util.hash_util import hash_password_async
 
 
 class PasswordService:
@@ -36,7 +36,7 @@ class PasswordService:
         if not token_row:
             raise PasswordResetTokenInvalid(details={"token": token})
 
-        hashed = hash_password(new_password)
+        hashed = await hash_password_async(new_password)
         await self.password_repo.update_user_password(token_row.user_id, hashed)
         await self.password_repo.mark_token_as_used(token)
 
@@ -44,5 +44,5 @@ class PasswordService:
         if not await self.user_repo.get_user_by_id(user_id):
             raise PasswordResetNotAllowed(details={"user_id": user_id})
 
-        hashed = hash_password(new_password)
+        hashed = await hash_password_async(new_password)
         await self.password_repo.update_user_password(user_id, hashed)
@@ -1,3 +1,5 @@
+from typing import AsyncIterator
+
 from app.data.repo.plan_repo import PlanRepo
 from app.exception.common_exception import ResourceNotFound
 from app.model.plan_model import (
@@ -25,8 +27,8 @@ class PlanService:
 
         await self.plan_repo.assign_plan(org_id, plan_id)
 
-    async def list_all_plans(self) -> list[Plan]:
-        return await self.plan_repo.list_all_plans()
+    def stream_all_plans(self) -> AsyncIterator[dict]:
+        return self.plan_repo.stream_all_plans()
 
     async def create_plan(self, data: PlanAdminRequest) -> int:
         # validate billing_period is one of 'monthly', 'yearly', 'one_time'
@@ -0,0 +1,181 @@
+import asyncio
+import contextlib
+import contextvars
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.data.repo.organization_usage_repo import OrganizationUsageRepo
+from app.util.cache_util import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QuotaLease:
+    organization_id: int
+    feature_key: str
+    period_start: datetime
+    period_end: datetime
+    remaining: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class QuotaLeaseService:
+    """
+    Worker-local quota counters backed by reservations in `fastsvelte.org_usage`.
+
+    Instead of one database write per request, a worker reserves a chunk of the
+    remaining quota (at least `chunk_fraction` of the limit) and spends it from
+    memory. Reservations count as usage in the database, so the limit can never be
+    exceeded across workers. The cost is that up to one chunk per worker may sit
+    unused while another worker is refused. Leases idle for `idle_seconds` are handed
+    back by a background task, and all of them are handed back on shutdown.
+
+    The organization's plan and quota period are cached for `idle_seconds` as well,
+    so a plan change takes up to that long to affect limits.
+    """
+
+    def __init__(
+        self,
+        usage_repo: OrganizationUsageRepo,
+        enabled: bool = False,
+        chunk_fraction: float = 0.05,
+        idle_seconds: float = 30,
+    ):
+        self.usage_repo = usage_repo
+        self.enabled = enabled
+        self.chunk_fraction = chunk_fraction
+        self.idle_seconds = idle_seconds
+        self._leases: dict[tuple, QuotaLease] = {}
+        self.plan_periods = TTLCache(max_size=10_000, ttl_seconds=idle_seconds)
+        self._task: asyncio.Task | None = None
+        self.local_hits = 0
+        self.reservations = 0
+        self.returned = 0
+
+    async def consume(
+        self,
+        organization_id: int,
+        feature_key: str,
+        period_start: datetime,
+        period_end: datetime,
+        amount: int,
+        limit: int,
+    ) -> bool:
+        key = (organization_id, feature_key, period_start)
+        lease = self._leases.get(key)
+        if lease is None:
+            lease = QuotaLease(organization_id, feature_key, period_start, period_end)
+            self._leases[key] = lease
+            if self._task is None:
+                self.start()
+
+        lease.last_used = time.monotonic()
+        if lease.remaining >= amount:
+            lease.remaining -= amount
+            self.local_hits += 1
+            return True
+
+        async with lease.lock:
+            if self._leases.get(key) is not lease:
+                # Handed back while we waited for the lock; start over with a fresh lease
+                return await self.consume(
+                    organization_id, feature_key, period_start, period_end, amount, limit
+                )
+            if lease.remaining < amount:
+                chunk = max(amount - lease.remaining, math.ceil(limit * self.chunk_fraction))
+                granted = await self.usage_repo.reserve_usage(
+                    organization_id=organization_id,
+                    feature_key=feature_key,
+                    period_start=period_start,
+                    period_end=period_end,
+                    amount=chunk,
+                    limit=limit,
+                )
+                self.reservations += 1
+                lease.remaining += granted
+                if lease.remaining < amount:
+                    return False
+
+            lease.remaining -= amount
+            return True
+
+    def release(
+        self, organization_id: int, feature_key: str, period_start: datetime, amount: int
+    ) -> bool:
+        """Return `amount` to the local lease. False if there is no lease to return it to."""
+        lease = self._leases.get((organization_id, feature_key, period_start))
+        if lease is None:
+            return False
+        lease.remaining += amount
+        return True
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            # A fresh context, so a lazy start doesn't inherit the request's state
+            # (e.g. its replica consistency key) into the flusher
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.return_idle(idle_seconds=0)
+
+    async def return_idle(self, idle_seconds: float | None = None) -> int:
+        """Hand unused reservations of idle leases back to the database."""
+        idle_seconds = self.idle_seconds if idle_seconds is None else idle_seconds
+        now = time.monotonic()
+        returned = 0
+
+        for key, lease in list(self._leases.items()):
+            if now - lease.last_used < idle_seconds:
+                continue
+
+            async with lease.lock:
+                if self._leases.get(key) is not lease:
+                    continue
+                del self._leases[key]
+                unused, lease.remaining = lease.remaining, 0
+
+            if unused <= 0:
+                continue
+            try:
+                await self.usage_repo.increment_usage(
+                    organization_id=lease.organization_id,
+                    feature_key=lease.feature_key,
+                    period_start=lease.period_start,
+                    period_end=lease.period_end,
+                    amount=-unused,
+                )
+                returned += unused
+            except Exception:
+                # The reservation stays counted until the period ends
+                logger.exception(
+                    f"Failed to return {unused} unused '{lease.feature_key}' quota "
+                    f"for organization {lease.organization_id}"
+                )
+
+        self.returned += returned
+        return returned
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.idle_seconds / 2)
+            await self.return_idle()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "leases": len(self._leases),
+            "plan_periods": self.plan_periods.stats(),
+            "local_hits": self.local_hits,
+            "reservations": self.reservations,
+            "returned": self.returned,
+        }
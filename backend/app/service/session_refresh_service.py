@@ -0,0 +1,102 @@
+import asyncio
+import contextlib
+import contextvars
+import logging
+from datetime import datetime
+
+from app.data.repo.session_repo import SessionRepo
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRefreshService:
+    """
+    Write-behind buffer for sliding session expiration refreshes.
+
+    Requests only record the new expiration in memory. A background task writes
+    all pending refreshes in one batched UPDATE every `flush_interval_ms`, or as
+    soon as `max_batch_size` sessions are pending. Pending refreshes are flushed
+    on shutdown.
+    """
+
+    def __init__(
+        self,
+        session_repo: SessionRepo,
+        enabled: bool = True,
+        flush_interval_ms: int = 500,
+        max_batch_size: int = 500,
+    ):
+        self.session_repo = session_repo
+        self.enabled = enabled
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pending: dict[str, datetime] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self.flushed = 0
+        self.failed_flushes = 0
+
+    def schedule(self, session_id: str, expires_at: datetime) -> None:
+        current = self._pending.get(session_id)
+        if current is None or current < expires_at:
+            self._pending[session_id] = expires_at
+
+        if self._task is None:
+            self.start()
+        if len(self._pending) >= self.max_batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write all pending refreshes and return how many sessions were written."""
+        written = 0
+        while self._pending:
+            batch = dict(list(self._pending.items())[: self.max_batch_size])
+
+            try:
+                await self.session_repo.update_expirations(
+                    list(batch.keys()), list(batch.values())
+                )
+            except Exception:
+                self.failed_flushes += 1
+                logger.exception(
+                    f"Failed to flush {len(batch)} session expiration refreshes"
+                )
+                break
+
+            # Refreshes leave _pending only once written, so a failed or cancelled
+            # write keeps them for the next flush. Ones refreshed again meanwhile stay.
+            for session_id, expires_at in batch.items():
+                if self._pending.get(session_id) == expires_at:
+                    del self._pending[session_id]
+            written += len(batch)
+
+        self.flushed += written
+        return written
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "flushed": self.flushed,
+            "failed_flushes": self.failed_flushes,
+        }
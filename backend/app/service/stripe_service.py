@@ -1,34 +1,86 @@
 from datetime import datetime, timezone
+from typing import Optional
 
 import stripe
-from stripe import Event, Webhook, billing_portal, checkout
+from app.util.cache_util import TTLCache
+from stripe import Event, Webhook
 from stripe import error as stripe_error
 
 
 class StripeService:
-    def __init__(self, api_key: str, webhook_secret):
-        stripe.api_key = api_key
+    """
+    Async wrapper around the Stripe API.
+
+    All calls share one pooled httpx connection through a single `StripeClient`,
+    so the service is meant to be a singleton. `api_base` points the client at a
+    local stub server (e.g. stripe-mock) in tests and development.
+
+    Active prices per product are cached for `price_cache_ttl_seconds`. The webhook
+    route invalidates them on `price.*`/`product.*` events, but only in the worker
+    that receives the event; other workers pick up the change when the TTL lapses.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        webhook_secret,
+        api_base: Optional[str] = None,
+        timeout_seconds: float = 15,
+        max_network_retries: int = 2,
+        price_cache_ttl_seconds: float = 300,
+    ):
         self.webhook_secret = webhook_secret
+        self.price_cache: TTLCache[str, list[stripe.Price]] = TTLCache(
+            max_size=1_000, ttl_seconds=price_cache_ttl_seconds
+        )
+        self.http_client = stripe.HTTPXClient(timeout=timeout_seconds)
+        self.client = stripe.StripeClient(
+            api_key,
+            http_client=self.http_client,
+            max_network_retries=max_network_retries,
+            base_addresses={"api": api_base} if api_base else {},
+        )
 
-    def create_customer(
+    async def close(self) -> None:
+        await self.http_client.close_async()
+
+    async def create_customer(
         self, *, email: str, name: str, metadata: dict
     ) -> stripe.Customer:
-        return stripe.Customer.create(email=email, name=name, metadata=metadata)
+        return await self.client.customers.create_async(
+            params={"email": email, "name": name, "metadata": metadata}
+        )
 
-    def list_prices_for_product(self, product_id: str) -> list[stripe.Price]:
-        prices = stripe.Price.list(
-            product=product_id,
-            active=True,
-            expand=["data.product"],
+    async def list_prices_for_product(self, product_id: str) -> list[stripe.Price]:
+        cached = self.price_cache.get(product_id)
+        if cached is not None:
+            return cached
+
+        prices = await self.client.prices.list_async(
+            params={
+                "product": product_id,
+                "active": True,
+                "expand": ["data.product"],
+            }
         )
+        self.price_cache.set(product_id, prices.data)
         return prices.data
 
-    def create_free_subscription(
+    def invalidate_prices(self, product_id: Optional[str] = None) -> None:
+        """Forget cached prices for `product_id`, or for every product if omitted."""
+        if product_id is None:
+            self.price_cache.clear()
+        else:
+            self.price_cache.delete(product_id)
+
+    async def create_free_subscription(
         self, customer_id: str, price_id: str
     ) -> stripe.Subscription:
-        return stripe.Subscription.create(
-            customer=customer_id,
-            items=[{"price": price_id}],
+        return await self.client.subscriptions.create_async(
+            params={
+                "customer": customer_id,
+                "items": [{"price": price_id}],
+            }
         )
 
     def extract_subscription_details(self, subscription: stripe.Subscription) -> dict:
@@ -46,35 +98,39 @@ class StripeService:
             ),
         }
 
-    def create_portal_session(self, customer_id: str, return_url: str) -> str:
+    async def create_portal_session(self, customer_id: str, return_url: str) -> str:
         try:
-            session = billing_portal.Session.create(
-                customer=customer_id,
-                return_url=return_url,
+            session = await self.client.billing_portal.sessions.create_async(
+                params={
+                    "customer": customer_id,
+                    "return_url": return_url,
+                }
             )
             return session.url
         except stripe_error.StripeError as e:
             raise Exception(f"Stripe error: {str(e)}")
 
-    def create_checkout_session(
+    async def create_checkout_session(
         self, customer_id: str, product_id: str, return_base_url: str
     ) -> str:
         try:
-            session = checkout.Session.create(
-                mode="subscription",
-                customer=customer_id,
-                line_items=[
-                    {
-                        "price_data": {
-                            "currency": "usd",
-                            "product": product_id,
-                            "unit_amount": 0,  # assumed for free checkout
-                        },
-                        "quantity": 1,
-                    }
-                ],
-                success_url=f"{return_base_url}/dashboard?checkout=success",
-                cancel_url=f"{return_base_url}/dashboard?checkout=cancel",
+            session = await self.client.checkout.sessions.create_async(
+                params={
+                    "mode": "subscription",
+                    "customer": customer_id,
+                    "line_items": [
+                        {
+                            "price_data": {
+                                "currency": "usd",
+                                "product": product_id,
+                                "unit_amount": 0,  # assumed for free checkout
+                            },
+                            "quantity": 1,
+                        }
+                    ],
+                    "success_url": f"{return_base_url}/dashboard?checkout=success",
+                    "cancel_url": f"{return_base_url}/dashboard?checkout=cancel",
+                }
             )
             return session.url
         except stripe_error.StripeError as e:
@@ -86,7 +86,7 @@ class SubscriptionService:
         if not customer_id:
             raise StripeCustomerNotFound(org_id)
 
-        return self.stripe_service.create_portal_session(
+        return await self.stripe_service.create_portal_session(
             customer_id,
             return_url=f"{settings.base_web_url}{settings.stripe_portal_return_url}",
         )
@@ -119,7 +119,7 @@ class SubscriptionService:
                 if settings.mode == "b2c"
                 else (await self.organization_repo.get_by_id(org_id)).name
             )
-            stripe_customer = self.stripe_service.create_customer(
+            stripe_customer = await self.stripe_service.create_customer(
                 email=email,
                 name=customer_name,
                 metadata={"org_id": org_id},
@@ -129,7 +129,7 @@ class SubscriptionService:
                 org_id, stripe_customer_id
             )
 
-        prices = self.stripe_service.list_prices_for_product(
+        prices = await self.stripe_service.list_prices_for_product(
             default_plan.stripe_product_id
         )
         if not prices:
@@ -139,4 +139,4 @@ class SubscriptionService:
         if price.unit_amount > 0:
             raise DefaultPlanNotFree(plan_id=default_plan.id)
 
-        self.stripe_service.create_free_subscription(stripe_customer_id, price.id)
+        await self.stripe_service.create_free_subscription(stripe_customer_id, price.id)
@@ -1,27 +1,36 @@
+from typing import AsyncIterator
+
 from app.data.repo.user_repo import UserRepo
-from app.model.user_model import User
+from app.model.user_model import CurrentUser, User
+from app.util.cache_util import TTLCache, evict_cached_sessions_for_user
 
 
 class UserService:
-    def __init__(self, user_repo: UserRepo):
+    def __init__(
+        self, user_repo: UserRepo, session_cache: TTLCache[str, CurrentUser]
+    ):
         self.user_repo = user_repo
+        self.session_cache = session_cache
 
-    async def list_users(self) -> list[User]:
-        return await self.user_repo.list_users()
+    def stream_users(self) -> AsyncIterator[dict]:
+        return self.user_repo.stream_users()
 
     async def update_user_info(
         self, user_id: int, first_name: str | None, last_name: str | None
     ) -> None:
         await self.user_repo.update_user_name(user_id, first_name, last_name)
+        evict_cached_sessions_for_user(self.session_cache, user_id)
 
     async def get_user_by_id(self, user_id: int) -> User | None:
         return await self.user_repo.get_user_by_id(user_id)
 
     async def update_user_avatar(self, user_id: int, avatar_data: str) -> None:
         await self.user_repo.update_user_avatar(user_id, avatar_data)
+        evict_cached_sessions_for_user(self.session_cache, user_id)
 
     async def suspend_user(self, user_id: int) -> None:
         await self.user_repo.update_user_status(user_id, is_active=False)
+        evict_cached_sessions_for_user(self.session_cache, user_id)
 
     async def activate_user(self, user_id: int) -> None:
         await self.user_repo.update_user_status(user_id, is_active=True)
@@ -0,0 +1,95 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded in-process cache with per-entry expiry and LRU eviction.
+
+    Entries expire `ttl_seconds` after they are written. When the cache is full,
+    the least recently used entry is evicted. The cache is local to the worker
+    process, so cross-worker staleness is bounded only by the TTL.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[K, V], bool]) -> int:
+        """Remove every entry matching `predicate` and return how many were removed."""
+        doomed = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+        for key in doomed:
+            del self._entries[key]
+        return len(doomed)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def evict_cached_sessions_for_user(
+    session_cache: TTLCache[str, Any], user_id: int
+) -> int:
+    """
+    Drop every cached session (a CurrentUser per session id) belonging to
+    `user_id`, so the next request re-reads it.
+    """
+    return session_cache.delete_where(lambda _, user: user.id == user_id)
@@ -0,0 +1,250 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+from app.config.settings import settings
+
+# Stands in for the per-recipient link in precompiled templates
+LINK_PLACEHOLDER = "%link%"
+
+INVITATION = "invitation"
+PASSWORD_RESET = "password_reset"
+EMAIL_VERIFICATION = "email_verification"
+
+
+@dataclass(frozen=True)
+class EmailBrand:
+    """What an email template is branded with; organizations may supply their own."""
+
+    app_name: str
+    app_description: str
+    primary_color: str = "#0056b3"
+
+
+@dataclass(frozen=True)
+class EmailTemplate:
+    """
+    A template with everything but the link filled in.
+
+    The plain text and HTML are kept both whole (for providers that substitute the
+    link themselves) and split around the placeholder, so rendering is a join.
+    Subjects never contain the link.
+    """
+
+    subject: str
+    plain_text: str
+    html_content: str
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "_plain_parts", self.plain_text.split(LINK_PLACEHOLDER)
+        )
+        object.__setattr__(
+            self, "_html_parts", self.html_content.split(LINK_PLACEHOLDER)
+        )
+
+    def render(self, link: str) -> tuple[str, str, str]:
+        return (
+            self.subject,
+            link.join(self._plain_parts),
+            link.join(self._html_parts),
+        )
+
+
+def default_brand() -> EmailBrand:
+    return EmailBrand(
+        app_name=settings.app_name, app_description=settings.app_description
+    )
+
+
+_DEFAULT_BRAND = default_brand()
+_default_templates: dict[str, EmailTemplate] = {}
+
+
+def get_email_template(kind: str, brand: EmailBrand | None = None) -> EmailTemplate:
+    """
+    Return the precompiled `kind` template for `brand` (the app's own by default).
+
+    Each brand is compiled once and cached, so branded sends cost the same as
+    default ones after the first.
+    """
+    if brand is None:
+        template = _default_templates.get(kind)
+        if template is None:
+            template = _default_templates[kind] = _compile(kind, _DEFAULT_BRAND)
+        return template
+    return _compile(kind, brand)
+
+
+def precompile_email_templates(brand: EmailBrand | None = None) -> None:
+    for kind in _BUILDERS:
+        get_email_template(kind, brand)
+
+
+@lru_cache(maxsize=1024)
+def _compile(kind: str, brand: EmailBrand) -> EmailTemplate:
+    return EmailTemplate(*_BUILDERS[kind](brand, LINK_PLACEHOLDER))
+
+
+def _invitation(brand: EmailBrand, invite_link: str) -> tuple[str, str, str]:
+    app_name = brand.app_name
+    app_description = brand.app_description
+    subject = f"You're invited to join {app_name}"
+
+    plain_text = f"""\
+
+You've been invited to join {app_name}.
+
+{app_name} {app_description}.
+
+To accept your invitation and get started, please click the link below:
+
+{invite_link}
+
+If you have any questions, feel free to reach out to our support team.
+
+— The {app_name} Team
+"""
+
+    html_content = f"""\
+
+<html>
+<body style="font-family: Arial, sans-serif; color: #333;">
+  <div style="max-width: 600px; margin: auto; padding: 20px; border: 1px solid #eee; border-radius: 8px;">
+    <h2 style="color: {brand.primary_color};">You’re Invited to Join {app_name}</h2>
+    <p>
+      {app_name} {app_description}.
+    </p>
+
+    <div style="margin: 24px 0;">
+      <a href="{invite_link}" style="
+        background-color: {brand.primary_color};
+        color: white;
+        padding: 10px 15px;
+        text-decoration: none;
+        border-radius: 5px;
+        display: inline-block;
+      ">
+        Accept Invitation
+      </a>
+    </div>
+
+    <p>If the button doesn't work, copy and paste this link:</p>
+    <p style="word-break: break-all;"><a href="{invite_link}">{invite_link}</a></p>
+
+    <p style="margin-top: 30px;">If you have any questions, feel free to reach out to our support team.</p>
+    <p>— The {app_name} Team</p>
+  </div>
+</body>
+</html>
+"""
+    return subject, plain_text, html_content
+
+
+def _password_reset(brand: EmailBrand, reset_link: str) -> tuple[str, str, str]:
+    app_name = brand.app_name
+    subject = f"Reset your {app_name} password"
+
+    plain_text = f"""\
+
+We received a request to reset your {app_name} password.
+
+To proceed, click the link below:
+
+{reset_link}
+
+If you did not request this, you can safely ignore this email.
+
+— The {app_name} Team
+"""
+
+    html_content = f"""\
+
+<html>
+  <body style="font-family: Arial, sans-serif; color: #333;">
+    <div style="max-width: 600px; margin: auto; padding: 20px; border: 1px solid #eee; border-radius: 8px;">
+      <h2 style="color: {brand.primary_color};">Reset Your Password</h2>
+      <p>We received a request to reset your {app_name} password.</p>
+
+      <div style="margin: 24px 0;">
+        <a href="{reset_link}" style="
+          background-color: {brand.primary_color};
+          color: white;
+          padding: 10px 15px;
+          text-decoration: none;
+          border-radius: 5px;
+          display: inline-block;
+        ">
+          Reset Password
+        </a>
+      </div>
+
+      <p>If the button doesn't work, copy and paste this link:</p>
+      <p style="word-break: break-all;"><a href="{reset_link}">{reset_link}</a></p>
+
+      <p style="margin-top: 30px;">If you did not request this, you can safely ignore this email.</p>
+      <p>— The {app_name} Team</p>
+    </div>
+  </body>
+</html>
+"""
+    return subject, plain_text, html_content
+
+
+def _email_verification(
+    brand: EmailBrand, verification_link: str
+) -> tuple[str, str, str]:
+    app_name = brand.app_name
+    subject = f"Verify your {app_name} email address"
+
+    plain_text = f"""\
+
+  Thank you for signing up for {app_name}!
+
+  Please verify your email address by clicking the link below:
+
+  {verification_link}
+
+  If you did not sign up, you can safely ignore this email.
+
+  — The {app_name} Team
+  """
+
+    html_content = f"""\
+
+  <html>
+    <body style="font-family: Arial, sans-serif; color: #333;">
+      <div style="max-width: 600px; margin: auto; padding: 20px; border: 1px solid #eee; border-radius: 8px;">
+        <h2 style="color: {brand.primary_color};">Verify Your Email Address</h2>
+        <p>Thank you for signing up for {app_name}!</p>
+
+        <div style="margin: 24px 0;">
+          <a href="{verification_link}" style="
+            background-color: {brand.primary_color};
+            color: white;
+            padding: 10px 15px;
+            text-decoration: none;
+            border-radius: 5px;
+            display: inline-block;
+          ">
+            Verify Email
+          </a>
+        </div>
+
+        <p>If the button doesn't work, copy and paste this link:</p>
+        <p style="word-break: break-all;"><a href="{verification_link}">{verification_link}</a></p>
+
+        <p style="margin-top: 30px;">If you did not sign up, you can safely ignore this email.</p>
+        <p>— The {app_name} Team</p>
+      </div>
+    </body>
+  </html>
+  """
+    return subject, plain_text, html_content
+
+
+_BUILDERS: dict[str, Callable[[EmailBrand, str], tuple[str, str, str]]] = {
+    INVITATION: _invitation,
+    PASSWORD_RESET: _password_reset,
+    EMAIL_VERIFICATION: _email_verification,
+}
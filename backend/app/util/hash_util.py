@@ -1,11 +1,18 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.config.settings import settings
+from app.exception.auth_exception import PasswordHashingBusy
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 
-# Match Node's settings
+# Defaults match Node's settings
 ph = PasswordHasher(
-    time_cost=2,  # Iterations
-    memory_cost=19456,  # In KiB => 19 MB
-    parallelism=1,
+    time_cost=settings.password_hash_time_cost,  # Iterations
+    memory_cost=settings.password_hash_memory_cost,  # In KiB => 19 MB
+    parallelism=settings.password_hash_parallelism,
     hash_len=32,
 )
 
@@ -21,3 +28,88 @@ def verify_password_hash(stored_hash: str, password: str) -> bool:
         return ph.verify(stored_hash, password)
     except VerifyMismatchError:
         return False
+
+
+class PasswordHashPool:
+    """
+    Runs Argon2 work on a small dedicated thread pool so it never blocks the event loop.
+
+    argon2-cffi releases the GIL while hashing, so threads run in parallel. At most
+    `max_pending` operations may be queued or running; beyond that callers get
+    `PasswordHashingBusy` instead of waiting behind an ever-growing queue.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+        self.max_run_seconds = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHashingBusy()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="argon2"
+            )
+
+        def timed() -> tuple[Any, float, float]:
+            started = time.perf_counter()
+            result = fn(*args)
+            return result, started, time.perf_counter()
+
+        self.pending += 1
+        submitted = time.perf_counter()
+        try:
+            result, started, finished = await asyncio.get_running_loop().run_in_executor(
+                self._executor, timed
+            )
+        finally:
+            self.pending -= 1
+
+        self.completed += 1
+        self.total_wait_seconds += started - submitted
+        self.total_run_seconds += finished - started
+        self.max_run_seconds = max(self.max_run_seconds, finished - started)
+        return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        completed = self.completed or 1
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": self.total_wait_seconds / completed * 1000,
+            "avg_run_ms": self.total_run_seconds / completed * 1000,
+            "max_run_ms": self.max_run_seconds * 1000,
+        }
+
+
+hash_pool = PasswordHashPool(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """`hash_password` on the bounded hashing pool."""
+    return await hash_pool.run(hash_password, password)
+
+
+async def verify_password_hash_async(stored_hash: str, password: str) -> bool:
+    """`verify_password_hash` on the bounded hashing pool."""
+    return await hash_pool.run(verify_password_hash, stored_hash, password)
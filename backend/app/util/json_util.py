@@ -0,0 +1,47 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Literal
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+JsonCodecName = Literal["auto", "orjson", "json"]
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    """A JSON implementation: `dumps` returns UTF-8 bytes, `loads` takes bytes or str."""
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes | str], Any]
+
+
+def _stdlib_dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+STDLIB_JSON = JsonCodec(name="json", dumps=_stdlib_dumps, loads=json.loads)
+
+if orjson is not None:
+    ORJSON = JsonCodec(
+        name="orjson",
+        # Non-str keys are stringified, as json.dumps does
+        dumps=lambda value: orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS),
+        loads=orjson.loads,
+    )
+else:  # pragma: no cover
+    ORJSON = None
+
+
+def get_json_codec(name: JsonCodecName = "auto") -> JsonCodec:
+    """The named codec; "auto" prefers orjson and falls back to the stdlib."""
+    if name == "json":
+        return STDLIB_JSON
+    if ORJSON is None:
+        if name == "orjson":
+            raise ValueError("orjson is not installed")
+        return STDLIB_JSON
+    return ORJSON
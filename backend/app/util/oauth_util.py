@@ -1,4 +1,7 @@
+import asyncio
 import jwt
+import logging
+import re
 import secrets
 import time
 from typing import Optional
@@ -6,8 +9,8 @@ from typing import Optional
 import httpx
 from app.config.settings import settings
 from app.exception.auth_exception import SignupFailed
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
+
+logger = logging.getLogger(__name__)
 
 
 class OAuthStateError(Exception):
@@ -40,6 +43,142 @@ def map_oauth_error(error_code: str) -> str:
     return OAUTH_ERROR_MAPPING.get(error_code, "oauth_error")
 
 
+class GoogleOAuthClient:
+    """
+    Google authorization-code exchange with local ID token verification.
+
+    One pooled HTTP client is shared by all logins, and Google's signing keys
+    (JWKS) are cached for as long as their Cache-Control max-age allows, so a
+    login costs a single call to the token endpoint. An unknown `kid` triggers an
+    early refresh (at most once per `min_refresh_seconds`) to pick up rotated keys.
+    """
+
+    ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        token_url: str,
+        jwks_url: str,
+        timeout_seconds: float = 10,
+        default_jwks_ttl_seconds: float = 3600,
+        min_refresh_seconds: float = 60,
+        clock_skew_seconds: float = 10,
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.token_url = token_url
+        self.jwks_url = jwks_url
+        self.timeout_seconds = timeout_seconds
+        self.default_jwks_ttl_seconds = default_jwks_ttl_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self.clock_skew_seconds = clock_skew_seconds
+        self._client: httpx.AsyncClient | None = None
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._keys_expire_at = 0.0
+        self._keys_fetched_at = float("-inf")
+        self._refresh_lock = asyncio.Lock()
+        self.jwks_fetches = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout_seconds)
+        return self._client
+
+    async def exchange_code(self, auth_code: str, redirect_uri: str) -> dict:
+        """Exchange an authorization code and return the verified ID token claims."""
+        response = await self.client.post(
+            self.token_url,
+            data={
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "code": auth_code,
+                "grant_type": "authorization_code",
+                "redirect_uri": redirect_uri,
+            },
+        )
+        response.raise_for_status()
+        return await self.verify_id_token(response.json()["id_token"])
+
+    async def verify_id_token(self, token: str) -> dict:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = await self._get_signing_key(kid)
+        return jwt.decode(
+            token,
+            key,
+            algorithms=["RS256"],
+            audience=self.client_id,
+            issuer=self.ISSUERS,
+            leeway=self.clock_skew_seconds,
+        )
+
+    async def _get_signing_key(self, kid: Optional[str]) -> jwt.PyJWK:
+        now = time.monotonic()
+        key = self._keys.get(kid)
+        if key is not None and now < self._keys_expire_at:
+            return key
+
+        async with self._refresh_lock:
+            # Another login may have refreshed the keys while we waited
+            key = self._keys.get(kid)
+            now = time.monotonic()
+            expired = now >= self._keys_expire_at
+            if key is None or expired:
+                if expired or now - self._keys_fetched_at >= self.min_refresh_seconds:
+                    try:
+                        await self._refresh_keys()
+                    except Exception:
+                        if key is None:
+                            raise
+                        # Google rotates keys days in advance; a stale key is still good
+                        logger.warning("Failed to refresh Google JWKS", exc_info=True)
+                        self._keys_expire_at = now + self.min_refresh_seconds
+                    else:
+                        key = self._keys.get(kid)
+
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        return key
+
+    async def _refresh_keys(self) -> None:
+        response = await self.client.get(self.jwks_url)
+        response.raise_for_status()
+        self.jwks_fetches += 1
+
+        keys = {}
+        for jwk in response.json().get("keys", []):
+            if jwk.get("kid") and jwk.get("use", "sig") == "sig":
+                keys[jwk["kid"]] = jwt.PyJWK(jwk)
+
+        now = time.monotonic()
+        self._keys = keys
+        self._keys_fetched_at = now
+        self._keys_expire_at = now + self._max_age(
+            response.headers.get("cache-control", "")
+        )
+
+    def _max_age(self, cache_control: str) -> float:
+        if "no-store" in cache_control or "no-cache" in cache_control:
+            return 0
+        match = re.search(r"max-age=(\d+)", cache_control)
+        return int(match.group(1)) if match else self.default_jwks_ttl_seconds
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+google_oauth = GoogleOAuthClient(
+    client_id=settings.google_client_id,
+    client_secret=settings.google_client_secret,
+    token_url=settings.google_token_url,
+    jwks_url=settings.google_jwks_url,
+)
+
+
 async def exchange_oauth_code_for_user_info(auth_code: str) -> dict:
     """
     Exchange OAuth authorization code for user information.
@@ -54,33 +193,9 @@ async def exchange_oauth_code_for_user_info(auth_code: str) -> dict:
         SignupFailed: If token exchange or verification fails
     """
     try:
-        # Exchange authorization code for tokens
-        token_url = "https://oauth2.googleapis.com/token"
         redirect_uri = f"{settings.base_api_url}/auth/oauth/google/callback"
-
-        token_data = {
-            "client_id": settings.google_client_id,
-            "client_secret": settings.google_client_secret,
-            "code": auth_code,
-            "grant_type": "authorization_code",
-            "redirect_uri": redirect_uri,
-        }
-
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(token_url, data=token_data)
-            token_response.raise_for_status()
-            tokens = token_response.json()
-
-        # Verify the ID token
-        id_info = id_token.verify_oauth2_token(
-            tokens["id_token"],
-            google_requests.Request(),
-            audience=settings.google_client_id,
-        )
-        return id_info
+        return await google_oauth.exchange_code(auth_code, redirect_uri)
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.warning(f"OAuth token exchange failed: {e}")
         raise SignupFailed("OAuth authentication failed")
 
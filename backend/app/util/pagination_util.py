@@ -0,0 +1,24 @@
+import base64
+import binascii
+from datetime import datetime
+
+from app.exception.common_exception import InvalidCursor
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque keyset cursor for the (created_at, id) of the last item on a page."""
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = base64.urlsafe_b64decode(padded).decode().split("|")
+        created_at, id = datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor)
+
+    if created_at.tzinfo is None:
+        raise InvalidCursor(cursor)
+    return created_at, id
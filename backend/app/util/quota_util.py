@@ -1,4 +1,7 @@
+import calendar
 from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Iterable
 
 from dateutil.relativedelta import relativedelta
 
@@ -6,15 +9,76 @@ from dateutil.relativedelta import relativedelta
 def get_current_quota_period(
     subscription_started_at: datetime, now: datetime = None
 ) -> tuple[datetime, datetime]:
+    """
+    Return the [start, end) monthly quota window containing `now`.
+
+    Windows advance one month at a time from `subscription_started_at`, with
+    `relativedelta` end-of-month clamping applied at every step, so an anchor on
+    the 31st settles on the 28th after the first February it crosses. Computed in
+    constant time regardless of subscription age.
+    """
+    now = now or datetime.now(timezone.utc)
+    return _quota_period(subscription_started_at, now)
+
+
+def get_quota_periods(
+    subscription_started_at: Iterable[datetime], now: datetime = None
+) -> list[tuple[datetime, datetime]]:
+    """
+    Batch variant of `get_current_quota_period` for reporting and reset jobs.
+
+    All windows are computed against the same `now`, so a batch is internally
+    consistent even if it straddles a period boundary while running.
+    """
     now = now or datetime.now(timezone.utc)
+    return [_quota_period(anchor, now) for anchor in subscription_started_at]
+
+
+def _quota_period(anchor: datetime, now: datetime) -> tuple[datetime, datetime]:
+    if anchor.tzinfo is not None and now.tzinfo is not None:
+        # Month arithmetic happens on the anchor's wall clock
+        now = now.astimezone(anchor.tzinfo)
+
+    # The k-th window starts in the k-th month after the anchor, so it is either
+    # the calendar-month difference or, if that window hasn't started yet, one less.
+    months = (now.year - anchor.year) * 12 + (now.month - anchor.month)
+    start = _shift_months(anchor, months)
+    if start > now:
+        months -= 1
+        start = _shift_months(anchor, months)
+
+    if months <= 0:
+        start = anchor
+
+    return start, start + relativedelta(months=1)
+
+
+def _shift_months(anchor: datetime, months: int) -> datetime:
+    """Equivalent to adding `relativedelta(months=1)` to `anchor` `months` times."""
+    if months <= 0:
+        return anchor
+
+    year, month = divmod(anchor.month - 1 + months, 12)
+    year += anchor.year
+    month += 1
+
+    # Each step clamps the day to that month's length and never recovers
+    day = anchor.day
+    if day > 28:
+        day = min(day, _shortest_month(anchor.year, anchor.month, months))
+
+    return anchor.replace(year=year, month=month, day=day)
+
 
-    # Determine how many full months have passed
-    months_elapsed = 0
-    temp_start = subscription_started_at
-    while temp_start + relativedelta(months=1) <= now:
-        temp_start += relativedelta(months=1)
-        months_elapsed += 1
+@lru_cache(maxsize=4096)
+def _shortest_month(year: int, month: int, months: int) -> int:
+    """Length of the shortest month among the `months` months following year/month."""
+    if months >= 24:
+        # Spans two Februaries, and two consecutive years are never both leap years
+        return 28
 
-    period_start = subscription_started_at + relativedelta(months=months_elapsed)
-    period_end = period_start + relativedelta(months=1)
-    return period_start, period_end
+    shortest = 31
+    for offset in range(1, months + 1):
+        y, m = divmod(month - 1 + offset, 12)
+        shortest = min(shortest, calendar.monthrange(year + y, m + 1)[1])
+    return shortest
@@ -0,0 +1,64 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from app.config.settings import settings
+from fastapi import Request
+
+
+def get_client_ip(request: Request) -> str:
+    if settings.trust_forwarded_for:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class KeyedTokenBucket:
+    """
+    In-memory token buckets, one per key (e.g. client IP or email).
+
+    Each bucket holds up to `burst` tokens and refills at `rate_per_minute`. Only
+    the `max_keys` most recently used buckets are kept; an evicted key simply
+    starts over with a full bucket. State is local to the worker process.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        burst: int,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_second = rate_per_minute / 60
+        self.burst = burst
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: OrderedDict[Hashable, tuple[float, float]] = OrderedDict()
+
+    def _refill(self, key: Hashable) -> float:
+        now = self._clock()
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate_per_second)
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return tokens
+
+    def try_acquire(self, key: Hashable) -> bool:
+        tokens = self._refill(key)
+        if tokens < 1:
+            return False
+        self._buckets[key] = (tokens - 1, self._buckets[key][1])
+        return True
+
+    def retry_after(self, key: Hashable) -> float:
+        """Seconds until `key` has a whole token again."""
+        tokens = self._refill(key)
+        if tokens >= 1 or self.rate_per_second <= 0:
+            return 0.0
+        return (1 - tokens) / self.rate_per_second
+
+    def __len__(self) -> int:
+        return len(self._buckets)
@@ -0,0 +1,112 @@
+import types
+from functools import lru_cache
+from typing import Annotated, Any, Iterable, Union, get_args, get_origin
+
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic.fields import FieldInfo
+from typing_extensions import TypedDict
+
+Row = dict[str, Any] | BaseModel
+
+
+def _row_type(annotation: Any) -> Any:
+    """`annotation` with every nested model also accepting its row TypedDict."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return Union[_row_typed_dict(annotation), annotation]
+    args = get_args(annotation)
+    if not args:
+        return annotation
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return Annotated[(_row_type(args[0]), *args[1:])]
+    converted = tuple(_row_type(arg) for arg in args)
+    if origin in (Union, types.UnionType):
+        return Union[converted]
+    return origin[converted]
+
+
+@lru_cache(maxsize=None)
+def _row_typed_dict(model: type[BaseModel]) -> type:
+    fields = {
+        name: _row_type(field.annotation) for name, field in model.model_fields.items()
+    }
+    return TypedDict(f"{model.__name__}Row", fields)
+
+
+@lru_cache(maxsize=None)
+def row_adapter(model: type[BaseModel]) -> TypeAdapter:
+    """
+    A precompiled serializer that writes rows in `model`'s JSON shape.
+
+    Rows are dicts with the model's fields, e.g. database records or another
+    model's `__dict__`; pass them through `as_row` to fill in missing fields that
+    have defaults. They are serialized without being validated or turned into
+    model instances, so values must already have their field's type (nothing is
+    coerced), and keys the model doesn't declare are dropped. Given such rows, the
+    output is the same JSON as `model.model_validate(row).model_dump_json()` for
+    models without aliases or custom serializers.
+    """
+    return TypeAdapter(_row_typed_dict(model))
+
+
+@lru_cache(maxsize=None)
+def rows_adapter(model: type[BaseModel]) -> TypeAdapter:
+    """Like `row_adapter`, for a list of rows serialized as a JSON array."""
+    return TypeAdapter(list[_row_typed_dict(model)])
+
+
+@lru_cache(maxsize=None)
+def _defaulted_fields(model: type[BaseModel]) -> dict[str, FieldInfo]:
+    return {
+        name: field
+        for name, field in model.model_fields.items()
+        if not field.is_required()
+    }
+
+
+def as_row(model: type[BaseModel], row: Row) -> dict[str, Any]:
+    """
+    `row` ready for `row_adapter(model)`, with missing defaulted fields filled in.
+
+    A model's field values live in its __dict__, so it is used without a copy or
+    re-validation. Only top-level fields are filled; nested rows must be complete.
+    """
+    if isinstance(row, BaseModel):
+        row = row.__dict__
+    defaulted = _defaulted_fields(model)
+    if any(name not in row for name in defaulted):
+        # Rebuilt in field order: the output keeps the row's key order
+        row = {
+            name: row[name]
+            if name in row or name not in defaulted
+            else defaulted[name].get_default(call_default_factory=True)
+            for name in model.model_fields
+        }
+    return row
+
+
+def dump_json(model: type[BaseModel], row: Row) -> bytes:
+    return row_adapter(model).dump_json(as_row(model, row))
+
+
+def dump_json_list(model: type[BaseModel], rows: Iterable[Row]) -> bytes:
+    return rows_adapter(model).dump_json([as_row(model, row) for row in rows])
+
+
+def json_response(
+    model: type[BaseModel], content: Row | list[Row], status_code: int = 200
+) -> Response:
+    """
+    Serialize `content` in `model`'s shape straight into a response.
+
+    Returning a Response skips FastAPI's own response_model validation and
+    encoding; keep `response_model` on the route for the OpenAPI schema.
+    """
+    if isinstance(content, list):
+        body = dump_json_list(model, content)
+    else:
+        body = dump_json(model, content)
+    return Response(
+        content=body, status_code=status_code, media_type="application/json"
+    )
@@ -0,0 +1,64 @@
+from typing import AsyncIterator
+
+from app.util.serialization_util import as_row, row_adapter, rows_adapter
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def encode_json_array(
+    rows: AsyncIterator[dict], model: type[BaseModel], chunk_size: int = 100
+) -> AsyncIterator[bytes]:
+    """Encode rows as one JSON array, emitting `chunk_size` rows per chunk."""
+    adapter = rows_adapter(model)
+    yield b"["
+    buffer: list[dict] = []
+    first = True
+    async for row in rows:
+        buffer.append(as_row(model, row))
+        if len(buffer) >= chunk_size:
+            # Each chunk is serialized as one array, minus its brackets
+            yield (b"" if first else b",") + adapter.dump_json(buffer)[1:-1]
+            buffer.clear()
+            first = False
+    if buffer:
+        yield (b"" if first else b",") + adapter.dump_json(buffer)[1:-1]
+    yield b"]"
+
+
+async def encode_ndjson(
+    rows: AsyncIterator[dict], model: type[BaseModel], chunk_size: int = 100
+) -> AsyncIterator[bytes]:
+    """Encode rows as newline-delimited JSON, emitting `chunk_size` rows per chunk."""
+    adapter = row_adapter(model)
+    buffer: list[bytes] = []
+    async for row in rows:
+        buffer.append(adapter.dump_json(as_row(model, row)) + b"\n")
+        if len(buffer) >= chunk_size:
+            yield b"".join(buffer)
+            buffer.clear()
+    if buffer:
+        yield b"".join(buffer)
+
+
+def stream_rows(
+    request: Request, rows: AsyncIterator[dict], model: type[BaseModel]
+) -> StreamingResponse:
+    """
+    Stream database rows to the client as they are read.
+
+    Responds with a JSON array by default, or NDJSON when the client sends
+    `Accept: application/x-ndjson`. Rows are serialized in the response model's
+    shape without being validated (see `row_adapter`). Headers go out before the
+    first row, so an error midway through truncates the body instead of producing
+    an error response.
+    """
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            encode_ndjson(rows, model), media_type=NDJSON_MEDIA_TYPE
+        )
+    return StreamingResponse(
+        encode_json_array(rows, model), media_type="application/json"
+    )
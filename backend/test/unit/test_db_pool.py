@@ -0,0 +1,188 @@
+import asyncio
+
+import pytest
+from app.data.db_config import DatabaseConfig, bind_consistency_key
+from app.exception.common_exception import DatabaseBusy
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakePool:
+    """A pool of `size` connections where acquire waits for a free one."""
+
+    def __init__(self, size: int, name: str = "conn"):
+        self.free = asyncio.Queue()
+        for i in range(size):
+            self.free.put_nowait(f"{name}-{i}")
+        self.size = size
+
+    async def acquire(self, timeout=None):
+        return await asyncio.wait_for(self.free.get(), timeout)
+
+    async def release(self, connection):
+        self.free.put_nowait(connection)
+
+    def get_size(self):
+        return self.size
+
+    def get_idle_size(self):
+        return self.free.qsize()
+
+
+def make_db_config(size: int = 1, acquire_timeout: float = 0.05) -> DatabaseConfig:
+    db_config = DatabaseConfig(
+        "postgresql://localhost/test", max_size=size, acquire_timeout=acquire_timeout
+    )
+    db_config._pool = FakePool(size)
+    return db_config
+
+
+@pytest.mark.anyio
+async def test_acquire_records_occupancy_and_waits():
+    db_config = make_db_config(size=2)
+
+    async with db_config.acquire():
+        stats = db_config.stats()
+        assert (stats["acquired"], stats["idle"]) == (1, 1)
+
+    stats = db_config.stats()
+    assert stats["acquired"] == 0
+    assert stats["acquires"] == 1
+    assert stats["wait_histogram"]["le_1ms"] == 1
+    assert sum(stats["wait_histogram"].values()) == 1
+
+
+@pytest.mark.anyio
+async def test_saturated_pool_times_out_with_database_busy(caplog):
+    db_config = make_db_config(size=1)
+
+    async with db_config.acquire():
+        with pytest.raises(DatabaseBusy) as exc_info:
+            async with db_config.acquire():
+                pass
+
+    assert exc_info.value.status_code == 503
+    assert "(1/1 in use)" in caplog.text
+    assert db_config.stats()["acquire_timeouts"] == 1
+    assert db_config.stats()["acquired"] == 0
+
+
+@pytest.mark.anyio
+async def test_waiter_gets_released_connection():
+    db_config = make_db_config(size=1, acquire_timeout=1)
+
+    async def hold():
+        async with db_config.acquire():
+            await asyncio.sleep(0.02)
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    async with db_config.acquire():
+        pass
+    await holder
+
+    stats = db_config.stats()
+    assert stats["acquires"] == 2
+    assert stats["max_wait_ms"] >= 10
+    assert stats["wait_histogram"]["le_1ms"] == 1
+
+
+def make_replicated_db_config(stickiness_seconds: float = 5) -> DatabaseConfig:
+    db_config = DatabaseConfig(
+        "postgresql://localhost/test",
+        replica_dsn="postgresql://localhost/replica",
+        replica_stickiness_seconds=stickiness_seconds,
+    )
+    db_config._pool = FakePool(2, "primary")
+    db_config._replica_pool = FakePool(2, "replica")
+    return db_config
+
+
+async def request(db_config: DatabaseConfig, user_id, *readonly_flags) -> list[str]:
+    """
+    Acquire once per flag in a fresh request context, writing on the primary
+    acquires; returns the pools used.
+    """
+
+    async def handle():
+        if user_id is not None:
+            bind_consistency_key(user_id)
+        used = []
+        for readonly in readonly_flags:
+            async with db_config.acquire(readonly) as connection:
+                used.append(connection.split("-")[0])
+            if not readonly:
+                db_config.record_write()
+        return used
+
+    return await asyncio.create_task(handle())
+
+
+@pytest.mark.anyio
+async def test_reads_after_a_write_in_the_same_request_stay_on_primary():
+    db_config = make_replicated_db_config()
+
+    assert await request(db_config, None, True, False, True) == [
+        "replica",
+        "primary",
+        "primary",
+    ]
+    assert db_config.stats()["replica"]["sticky_reads"] == 1
+
+
+@pytest.mark.anyio
+async def test_writer_reads_from_primary_within_stickiness_window():
+    db_config = make_replicated_db_config(stickiness_seconds=0.05)
+
+    await request(db_config, 1, False)
+
+    assert await request(db_config, 1, True) == ["primary"]
+    assert await request(db_config, 2, True) == ["replica"]
+    await asyncio.sleep(0.06)
+    assert await request(db_config, 1, True) == ["replica"]
+
+
+@pytest.mark.anyio
+async def test_readonly_uses_primary_without_replica():
+    db_config = make_db_config(size=1)
+
+    async with db_config.acquire(readonly=True) as connection:
+        assert connection == "conn-0"
+    assert db_config.stats()["replica"] is None
+
+
+@pytest.mark.anyio
+async def test_unreachable_replica_is_retried_by_one_background_task():
+    db_config = DatabaseConfig(
+        "postgresql://localhost/test", replica_dsn="postgresql://localhost/replica"
+    )
+    attempts = []
+
+    async def create_pool(dsn, ssl_context):
+        if "replica" not in dsn:
+            return FakePool(1, "primary")
+        attempts.append(dsn)
+        if len(attempts) < 3:
+            raise OSError("replica down")
+        return FakePool(1, "replica")
+
+    db_config._create_pool = create_pool
+    retry = db_config._retry_replica
+    db_config._retry_replica = lambda: retry(initial_delay=0.01)
+
+    await db_config.warm_up()
+    assert len(attempts) == 1
+    async with db_config.acquire(readonly=True) as connection:
+        assert connection == "primary-0"
+
+    # Requests don't try the replica themselves
+    await db_config.connect()
+    assert len(attempts) == 1
+
+    await asyncio.wait_for(db_config._replica_retry_task, 1)
+    assert len(attempts) == 3
+    async with db_config.acquire(readonly=True) as connection:
+        assert connection == "replica-0"
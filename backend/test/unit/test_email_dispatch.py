@@ -0,0 +1,213 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from app.service.email_dispatch_service import EmailDispatchService
+from app.service.email_service_base import EmailMessage, EmailRejected, EmailService
+from app.service.email_service_sendgrid import SendGridEmailService
+from app.util.email_template_util import INVITATION, get_email_template
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeEmailProvider(EmailService):
+    """Records batches instead of sending them; fails the first `fail_next` calls."""
+
+    def __init__(
+        self, max_batch_size: int = 1000, fail_next: int = 0, rejected: str = None
+    ):
+        self.max_batch_size = max_batch_size
+        self.fail_next = fail_next
+        self.rejected = rejected
+        self.attempts = 0
+        self.batches: list[list[EmailMessage]] = []
+        self.closed = False
+
+    async def send_batch(self, messages):
+        self.attempts += 1
+        if self.fail_next:
+            self.fail_next -= 1
+            raise RuntimeError("provider unavailable")
+        if any(message.to_email == self.rejected for message in messages):
+            raise EmailRejected("invalid recipient", retry_individually=True)
+        self.batches.append(list(messages))
+
+    async def _send_email(self, to_email, subject, plain_text, html_content):
+        raise AssertionError("send_batch is overridden")
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.anyio
+async def test_queued_messages_are_batched_by_template():
+    provider = FakeEmailProvider()
+    dispatcher = EmailDispatchService(provider, backoff_base_seconds=0)
+    dispatcher.start()
+
+    for i in range(3):
+        await dispatcher.send_email_verification(f"u{i}@example.com", f"https://v/{i}")
+    await dispatcher.send_password_reset_email("r@example.com", "https://r")
+    await dispatcher.stop()
+
+    sizes = sorted(len(batch) for batch in provider.batches)
+    assert sizes == [1, 3]
+    verification = next(batch for batch in provider.batches if len(batch) == 3)
+    assert [m.to_email for m in verification] == [
+        "u0@example.com",
+        "u1@example.com",
+        "u2@example.com",
+    ]
+    assert "https://v/1" in verification[1].render()[1]
+    assert provider.closed
+    assert dispatcher.stats()["sent"] == 4
+
+
+@pytest.mark.anyio
+async def test_failed_batches_are_retried():
+    provider = FakeEmailProvider(fail_next=2)
+    dispatcher = EmailDispatchService(provider, backoff_base_seconds=0)
+    dispatcher.start()
+
+    await dispatcher.send_invitation_email("a@example.com", "https://i")
+    await dispatcher.stop()
+
+    assert len(provider.batches) == 1
+    assert dispatcher.stats()["retried"] == 2
+    assert dispatcher.stats()["dropped"] == 0
+
+
+@pytest.mark.anyio
+async def test_rejected_batch_is_resent_one_message_at_a_time():
+    provider = FakeEmailProvider(rejected="bad@example.com")
+    dispatcher = EmailDispatchService(provider, backoff_base_seconds=0)
+    dispatcher.start()
+
+    for to_email in ["a@example.com", "bad@example.com", "b@example.com"]:
+        await dispatcher.send_invitation_email(to_email, "https://i")
+    await dispatcher.stop()
+
+    assert [[m.to_email for m in batch] for batch in provider.batches] == [
+        ["a@example.com"],
+        ["b@example.com"],
+    ]
+    # One rejected batch, then one attempt per message without retries
+    assert provider.attempts == 4
+    stats = dispatcher.stats()
+    assert (stats["sent"], stats["retried"], stats["dropped"]) == (2, 0, 1)
+
+
+@pytest.mark.anyio
+async def test_batches_respect_provider_limit():
+    provider = FakeEmailProvider(max_batch_size=1)
+    dispatcher = EmailDispatchService(provider, batch_size=50)
+    dispatcher.start()
+
+    for i in range(3):
+        await dispatcher.send_invitation_email(f"u{i}@example.com", "https://i")
+    await dispatcher.stop()
+
+    assert [len(batch) for batch in provider.batches] == [1, 1, 1]
+
+
+@pytest.mark.anyio
+async def test_sends_inline_when_not_started():
+    provider = FakeEmailProvider()
+    dispatcher = EmailDispatchService(provider, enabled=False)
+    dispatcher.start()
+
+    await asyncio.wait_for(dispatcher.send_invitation_email("a@example.com", "x"), 1)
+
+    assert len(provider.batches) == 1
+
+
+class StubSendGridHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests: list[tuple[str, dict, dict]] = []
+    connections: set[int] = set()
+    status_code = 202
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length))
+        self.requests.append((self.path, dict(self.headers), body))
+        self.connections.add(self.client_address[1])
+        self.send_response(self.status_code)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sendgrid_stub():
+    StubSendGridHandler.requests = []
+    StubSendGridHandler.connections = set()
+    StubSendGridHandler.status_code = 202
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSendGridHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.mark.anyio
+async def test_sendgrid_sends_one_request_per_batch(sendgrid_stub):
+    service = SendGridEmailService(
+        "SG.key", "noreply@example.com", "App", api_base=sendgrid_stub
+    )
+    template = get_email_template(INVITATION)
+    messages = [
+        EmailMessage.from_template(f"u{i}@example.com", template, f"https://i/{i}")
+        for i in range(2)
+    ]
+
+    await service.send_batch(messages)
+    await service.send(messages[0])
+    await service.close()
+
+    path, headers, body = StubSendGridHandler.requests[0]
+    assert path == "/v3/mail/send"
+    assert headers["Authorization"] == "Bearer SG.key"
+    assert body["personalizations"] == [
+        {
+            "to": [{"email": "u0@example.com"}],
+            "substitutions": {"%link%": "https://i/0"},
+        },
+        {
+            "to": [{"email": "u1@example.com"}],
+            "substitutions": {"%link%": "https://i/1"},
+        },
+    ]
+    assert body["from"] == {"email": "noreply@example.com", "name": "App"}
+    # Both requests went over the same pooled connection
+    assert len(StubSendGridHandler.requests) == 2
+    assert len(StubSendGridHandler.connections) == 1
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "status_code, rejected, retry_individually",
+    [(400, True, True), (403, True, False), (429, False, False), (503, False, False)],
+)
+async def test_sendgrid_only_rejects_client_errors(
+    sendgrid_stub, status_code, rejected, retry_individually
+):
+    StubSendGridHandler.status_code = status_code
+    service = SendGridEmailService(
+        "SG.key", "noreply@example.com", api_base=sendgrid_stub
+    )
+    message = EmailMessage("a@example.com", "Subject", "Text", "<p>Text</p>")
+
+    with pytest.raises(RuntimeError) as exc_info:
+        await service.send(message)
+    await service.close()
+
+    assert isinstance(exc_info.value, EmailRejected) is rejected
+    assert getattr(exc_info.value, "retry_individually", False) is retry_individually
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from app.service.email_service_azure import AzureEmailService
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakePoller:
+    def __init__(self, result: dict):
+        self.done = asyncio.Event()
+        self._result = result
+
+    async def result(self):
+        await self.done.wait()
+        return self._result
+
+
+class FakeAzureClient:
+    """Mimics the async EmailClient: begin_send returns once the message is accepted."""
+
+    def __init__(self):
+        self.pollers: list[FakePoller] = []
+        self.messages: list[dict] = []
+        self.closed = False
+
+    async def begin_send(self, message, **kwargs):
+        self.messages.append(message)
+        poller = FakePoller({"id": f"op-{len(self.pollers)}", "status": "Succeeded"})
+        self.pollers.append(poller)
+        return poller
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.anyio
+async def test_send_returns_before_delivery_completes():
+    client = FakeAzureClient()
+    statuses = []
+    service = AzureEmailService(
+        "endpoint=x", "noreply@example.com", on_status=statuses.append, client=client
+    )
+
+    await asyncio.wait_for(
+        service.send_invitation_email("a@example.com", "https://i"), 1
+    )
+
+    assert client.messages[0]["recipients"]["to"] == [{"address": "a@example.com"}]
+    assert statuses == []
+    assert service.stats()["tracking"] == 1
+
+    client.pollers[0].done.set()
+    await service.close()
+
+    assert [(s.recipient, s.status, s.operation_id) for s in statuses] == [
+        ("a@example.com", "Succeeded", "op-0")
+    ]
+    assert service.stats()["succeeded"] == 1
+    assert client.closed
+
+
+@pytest.mark.anyio
+async def test_delivery_timeout_is_reported():
+    client = FakeAzureClient()
+    statuses = []
+
+    async def record(status):
+        statuses.append(status)
+
+    service = AzureEmailService(
+        "endpoint=x",
+        "noreply@example.com",
+        on_status=record,
+        status_timeout_seconds=0.01,
+        client=client,
+    )
+
+    await service.send_password_reset_email("a@example.com", "https://r")
+    await service.close()
+
+    assert statuses[0].status == "TimedOut"
+    assert service.stats()["failed"] == 1
@@ -0,0 +1,72 @@
+import timeit
+
+import pytest
+from app.config.settings import settings
+from app.util.email_template_util import (
+    EMAIL_VERIFICATION,
+    INVITATION,
+    LINK_PLACEHOLDER,
+    PASSWORD_RESET,
+    EmailBrand,
+    _email_verification,
+    default_brand,
+    get_email_template,
+    precompile_email_templates,
+)
+
+
+def test_render_substitutes_only_the_link():
+    template = get_email_template(PASSWORD_RESET)
+
+    subject, plain_text, html = template.render("https://app/reset?token=abc")
+
+    assert subject == f"Reset your {settings.app_name} password"
+    assert "https://app/reset?token=abc" in plain_text
+    assert html.count("https://app/reset?token=abc") == 3
+    assert LINK_PLACEHOLDER not in plain_text + html
+
+
+def test_templates_are_compiled_once_per_brand():
+    precompile_email_templates()
+    brand = EmailBrand("Acme", "builds rockets", primary_color="#ff0000")
+
+    assert get_email_template(INVITATION) is get_email_template(INVITATION)
+    assert get_email_template(INVITATION, brand) is get_email_template(
+        INVITATION, EmailBrand("Acme", "builds rockets", primary_color="#ff0000")
+    )
+
+    subject, _, html = get_email_template(INVITATION, brand).render("https://i")
+    assert subject == "You're invited to join Acme"
+    assert "#ff0000" in html and "#0056b3" not in html
+
+
+def test_precompiled_render_matches_building_per_send():
+    link = "https://app.example.com/verify-email?token=" + "x" * 43
+
+    assert get_email_template(EMAIL_VERIFICATION).render(link) == _email_verification(
+        default_brand(), link
+    )
+
+
+@pytest.mark.benchmark
+def test_render_benchmark():
+    """Precompiled rendering vs. building the f-strings per send, as before."""
+    brand = default_brand()
+    link = "https://app.example.com/verify-email?token=" + "x" * 43
+    rounds = 2000
+
+    uncompiled = min(
+        timeit.repeat(lambda: _email_verification(brand, link), number=rounds, repeat=5)
+    )
+    compiled = min(
+        timeit.repeat(
+            lambda: get_email_template(EMAIL_VERIFICATION).render(link),
+            number=rounds,
+            repeat=5,
+        )
+    )
+
+    assert compiled < uncompiled, (
+        f"uncompiled: {uncompiled / rounds * 1e6:.2f}us/render, "
+        f"precompiled: {compiled / rounds * 1e6:.2f}us/render"
+    )
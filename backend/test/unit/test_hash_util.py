@@ -0,0 +1,41 @@
+import asyncio
+import threading
+
+import pytest
+from app.exception.auth_exception import PasswordHashingBusy
+from app.util.hash_util import (
+    PasswordHashPool,
+    hash_password_async,
+    verify_password_hash_async,
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.anyio
+async def test_async_hash_round_trip():
+    stored = await hash_password_async("correct horse")
+
+    assert await verify_password_hash_async(stored, "correct horse")
+    assert not await verify_password_hash_async(stored, "battery staple")
+
+
+@pytest.mark.anyio
+async def test_pool_rejects_beyond_max_pending():
+    pool = PasswordHashPool(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    running = asyncio.create_task(pool.run(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHashingBusy):
+        await pool.run(lambda: None)
+
+    release.set()
+    assert await running is True
+    assert pool.stats()["completed"] == 1
+    assert pool.stats()["rejected"] == 1
+    pool.shutdown()
@@ -0,0 +1,175 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from app.model.job_model import Job
+from app.service.job_queue_service import JobQueueService
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeJobRepo:
+    """In-memory stand-in for JobRepo that ignores run_at so retries are immediate."""
+
+    def __init__(self):
+        self.jobs: dict[int, dict] = {}
+        self.next_id = 1
+
+    async def enqueue(self, kind, payload, idempotency_key, run_at, max_attempts):
+        for job in self.jobs.values():
+            if (
+                idempotency_key is not None
+                and job["idempotency_key"] == idempotency_key
+                and job["status"] in ("pending", "running")
+            ):
+                return None
+        job_id = self.next_id
+        self.next_id += 1
+        self.jobs[job_id] = {
+            "id": job_id,
+            "kind": kind,
+            "payload": payload,
+            "idempotency_key": idempotency_key,
+            "status": "pending",
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "retry_at": None,
+        }
+        return job_id
+
+    async def claim(self, limit, lock_timeout_seconds):
+        claimed = []
+        for job in self.jobs.values():
+            if len(claimed) == limit:
+                break
+            if job["status"] == "pending":
+                job["status"] = "running"
+                job["attempts"] += 1
+                claimed.append(
+                    Job(
+                        id=job["id"],
+                        kind=job["kind"],
+                        payload=job["payload"],
+                        attempts=job["attempts"],
+                        max_attempts=job["max_attempts"],
+                    )
+                )
+        return claimed
+
+    async def mark_succeeded(self, job_id):
+        self.jobs[job_id]["status"] = "succeeded"
+
+    async def mark_failed(self, job_id, error, retry_at):
+        job = self.jobs[job_id]
+        job["status"] = "failed" if retry_at is None else "pending"
+        job["retry_at"] = retry_at
+        job["error"] = error
+
+
+def make_service(repo: FakeJobRepo, **kwargs) -> JobQueueService:
+    kwargs.setdefault("poll_interval_ms", 10)
+    kwargs.setdefault("max_attempts", 3)
+    return JobQueueService(repo, **kwargs)
+
+
+async def wait_for(predicate, timeout: float = 2) -> None:
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.anyio
+async def test_failed_job_is_retried_with_backoff_until_it_succeeds():
+    repo = FakeJobRepo()
+    service = make_service(repo)
+    calls = []
+
+    async def flaky(payload):
+        calls.append(payload)
+        if len(calls) < 2:
+            raise RuntimeError("provider down")
+
+    service.register("flaky", flaky)
+    service.start()
+    job_id = await service.enqueue("flaky", {"org_id": 1})
+    await wait_for(lambda: repo.jobs[job_id]["status"] == "succeeded")
+    await service.stop()
+
+    assert calls == [{"org_id": 1}, {"org_id": 1}]
+    assert repo.jobs[job_id]["attempts"] == 2
+    assert repo.jobs[job_id]["retry_at"] > datetime.now(timezone.utc)
+    assert service.stats()["retried"] == 1
+    assert service.stats()["succeeded"] == 1
+
+
+@pytest.mark.anyio
+async def test_job_fails_permanently_after_max_attempts():
+    repo = FakeJobRepo()
+    service = make_service(repo)
+
+    async def broken(payload):
+        raise RuntimeError("boom")
+
+    service.register("broken", broken)
+    service.start()
+    job_id = await service.enqueue("broken", {})
+    await wait_for(lambda: repo.jobs[job_id]["status"] == "failed")
+    await service.stop()
+
+    assert repo.jobs[job_id]["attempts"] == 3
+    assert "boom" in repo.jobs[job_id]["error"]
+    assert service.stats()["failed"] == 1
+
+
+@pytest.mark.anyio
+async def test_job_without_handler_is_not_lost():
+    repo = FakeJobRepo()
+    service = make_service(repo, max_attempts=1)
+    service.start()
+    job_id = await service.enqueue("unknown", {})
+    await wait_for(lambda: repo.jobs[job_id]["status"] == "failed")
+    await service.stop()
+
+    assert "No handler registered" in repo.jobs[job_id]["error"]
+
+
+@pytest.mark.anyio
+async def test_idempotency_key_deduplicates_queued_jobs():
+    repo = FakeJobRepo()
+    service = make_service(repo, enabled=False)
+
+    first = await service.enqueue("first_seen", {}, idempotency_key="org:1")
+    second = await service.enqueue("first_seen", {}, idempotency_key="org:1")
+
+    assert first is not None
+    assert second is None
+    assert len(repo.jobs) == 1
+
+
+@pytest.mark.anyio
+async def test_concurrency_is_bounded():
+    repo = FakeJobRepo()
+    service = make_service(repo, concurrency=2)
+    running = 0
+    peak = 0
+
+    async def slow(payload):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    service.register("slow", slow)
+    for _ in range(6):
+        await service.enqueue("slow", {})
+    service.start()
+    await wait_for(lambda: all(j["status"] == "succeeded" for j in repo.jobs.values()))
+    await service.stop()
+
+    assert peak == 2
@@ -0,0 +1,81 @@
+import json
+import timeit
+
+import pytest
+from app.data.db_config import DatabaseConfig
+from app.model.plan_model import PlanFeatures
+from app.util.json_util import ORJSON, STDLIB_JSON, get_json_codec
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+PLAN_FEATURES = PlanFeatures(max_notes=1000, token_limit=100_000, enable_ai=True)
+SESSION_CONTEXT = {
+    "ip": "203.0.113.7",
+    "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) AppleWebKit/605.1.15",
+    "login_method": "google",
+}
+
+
+class FakeConnection:
+    def __init__(self):
+        self.codecs = {}
+
+    async def set_type_codec(self, typename, **kwargs):
+        self.codecs[typename] = kwargs
+
+
+async def registered_codecs(codec) -> dict:
+    connection = FakeConnection()
+    await DatabaseConfig(
+        "postgresql://localhost/test", json_codec=codec
+    )._set_json_codecs(connection)
+    return connection.codecs
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("codec", [STDLIB_JSON, ORJSON], ids=["json", "orjson"])
+async def test_jsonb_binary_round_trip(codec):
+    if codec is None:
+        pytest.skip("orjson is not installed")
+    jsonb = (await registered_codecs(codec))["jsonb"]
+
+    encoded = jsonb["encoder"](PLAN_FEATURES.model_dump())
+
+    assert jsonb["format"] == "binary"
+    assert encoded[:1] == b"\x01"
+    assert json.loads(encoded[1:]) == PLAN_FEATURES.model_dump()
+    assert PlanFeatures(**jsonb["decoder"](encoded)) == PLAN_FEATURES
+    assert jsonb["decoder"](b"\x01" + json.dumps(SESSION_CONTEXT).encode()) == (
+        SESSION_CONTEXT
+    )
+
+
+def test_auto_prefers_orjson():
+    expected = ORJSON or STDLIB_JSON
+    assert get_json_codec("auto") is expected
+    assert get_json_codec("json") is STDLIB_JSON
+
+
+@pytest.mark.benchmark
+@pytest.mark.anyio
+async def test_orjson_decodes_plan_features_faster():
+    if ORJSON is None:
+        pytest.skip("orjson is not installed")
+    # The jsonb bytes asyncpg hands the decoder for a plan.features column
+    payload = b"\x01" + json.dumps(PLAN_FEATURES.model_dump()).encode()
+    stdlib = (await registered_codecs(STDLIB_JSON))["jsonb"]["decoder"]
+    fast = (await registered_codecs(ORJSON))["jsonb"]["decoder"]
+    rounds = 20_000
+
+    stdlib_time = min(timeit.repeat(lambda: stdlib(payload), number=rounds, repeat=5))
+    fast_time = min(timeit.repeat(lambda: fast(payload), number=rounds, repeat=5))
+
+    assert fast(payload) == stdlib(payload)
+    assert fast_time < stdlib_time, (
+        f"json: {rounds / stdlib_time:,.0f} decodes/s, "
+        f"orjson: {rounds / fast_time:,.0f} decodes/s"
+    )
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from app.exception.common_exception import TooManyRequests
+from app.service.login_throttle_service import LoginThrottleService
+from app.util.rate_limit_util import KeyedTokenBucket
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    bucket = KeyedTokenBucket(rate_per_minute=60, burst=2, clock=clock)
+
+    assert bucket.try_acquire("a")
+    assert bucket.try_acquire("a")
+    assert not bucket.try_acquire("a")
+    assert bucket.try_acquire("b")
+    assert bucket.retry_after("a") == pytest.approx(1.0)
+
+    clock.now = 1.0
+    assert bucket.try_acquire("a")
+
+
+@pytest.mark.anyio
+async def test_per_email_limit_returns_429():
+    throttle = LoginThrottleService(email_rate_per_minute=1, email_burst=1)
+
+    async with throttle.admit("1.1.1.1", "victim@example.com"):
+        pass
+
+    with pytest.raises(TooManyRequests) as exc_info:
+        async with throttle.admit("2.2.2.2", "victim@example.com"):
+            pass
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.details["reason"] == "email"
+    assert int(exc_info.value.headers["Retry-After"]) > 0
+
+
+@pytest.mark.anyio
+async def test_rejects_when_queue_is_full():
+    throttle = LoginThrottleService(max_concurrent=1, max_waiting=1)
+    release = asyncio.Event()
+
+    async def attempt(ip: str):
+        async with throttle.admit(ip, f"{ip}@example.com"):
+            await release.wait()
+
+    running = asyncio.create_task(attempt("1"))
+    queued = asyncio.create_task(attempt("2"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(TooManyRequests) as exc_info:
+        await attempt("3")
+
+    assert exc_info.value.details["reason"] == "busy"
+    release.set()
+    await asyncio.gather(running, queued)
+    assert throttle.stats()["admitted"] == 2
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from app.exception.common_exception import InvalidCursor
+from app.model.note_model import NoteSummary
+from app.service.note_service import NoteService
+from app.util.pagination_util import decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeNoteRepo:
+    def __init__(self, count: int):
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        # Pairs share a timestamp so the id tiebreaker matters
+        self.notes = [
+            NoteSummary(
+                id=i,
+                title=f"Note {i}",
+                preview="...",
+                created_at=base + timedelta(minutes=i // 2),
+                updated_at=base,
+            )
+            for i in range(1, count + 1)
+        ]
+
+    async def list_note_summaries(self, user_id, limit, preview_length, after=None):
+        ordered = sorted(self.notes, key=lambda n: (n.created_at, n.id), reverse=True)
+        if after is not None:
+            ordered = [n for n in ordered if (n.created_at, n.id) < after]
+        return ordered[:limit]
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(datetime(2025, 1, 1), 1)])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+@pytest.mark.anyio
+async def test_pages_cover_every_note_once():
+    service = NoteService(note_repo=FakeNoteRepo(7), note_organizer_service=None)
+
+    seen, cursor = [], None
+    while True:
+        page = await service.list_note_summaries(user_id=1, limit=3, cursor=cursor)
+        seen.extend(note.id for note in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == [7, 6, 5, 4, 3, 2, 1]
@@ -0,0 +1,133 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import jwt
+import pytest
+from app.util.oauth_util import GoogleOAuthClient
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def make_key(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    return private_key, {**jwk, "kid": kid, "use": "sig", "alg": "RS256"}
+
+
+class StubGoogleHandler(BaseHTTPRequestHandler):
+    """Token endpoint plus JWKS, signing ID tokens with the first configured key."""
+
+    keys: list = []
+    cache_control = "public, max-age=3600"
+    audience = "client-id"
+    requests: list[str] = []
+
+    def _respond(self, body: dict, headers: dict | None = None):
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode())
+        self.requests.append(self.path)
+        private_key, jwk = self.keys[0]
+        now = int(time.time())
+        id_token = jwt.encode(
+            {
+                "iss": "https://accounts.google.com",
+                "aud": self.audience,
+                "sub": form["code"][0],
+                "email": "user@example.com",
+                "iat": now,
+                "exp": now + 300,
+            },
+            private_key,
+            algorithm="RS256",
+            headers={"kid": jwk["kid"]},
+        )
+        self._respond({"access_token": "at", "id_token": id_token})
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        self._respond(
+            {"keys": [jwk for _, jwk in self.keys]},
+            {"Cache-Control": self.cache_control},
+        )
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def google_stub():
+    StubGoogleHandler.keys = [make_key("k1")]
+    StubGoogleHandler.cache_control = "public, max-age=3600"
+    StubGoogleHandler.audience = "client-id"
+    StubGoogleHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGoogleHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    yield GoogleOAuthClient(
+        client_id="client-id",
+        client_secret="secret",
+        token_url=f"{base}/token",
+        jwks_url=f"{base}/certs",
+        min_refresh_seconds=0,
+    )
+    server.shutdown()
+
+
+@pytest.mark.anyio
+async def test_jwks_is_cached_across_logins(google_stub):
+    first = await google_stub.exchange_code("user-1", "http://app/callback")
+    second = await google_stub.exchange_code("user-2", "http://app/callback")
+    await google_stub.close()
+
+    assert (first["sub"], second["sub"]) == ("user-1", "user-2")
+    assert StubGoogleHandler.requests == ["/token", "/certs", "/token"]
+
+
+@pytest.mark.anyio
+async def test_jwks_honors_cache_control(google_stub):
+    StubGoogleHandler.cache_control = "public, max-age=0"
+
+    await google_stub.exchange_code("user-1", "http://app/callback")
+    await google_stub.exchange_code("user-1", "http://app/callback")
+    await google_stub.close()
+
+    assert google_stub.jwks_fetches == 2
+
+
+@pytest.mark.anyio
+async def test_rotated_key_triggers_refresh(google_stub):
+    await google_stub.exchange_code("user-1", "http://app/callback")
+    StubGoogleHandler.keys = [make_key("k2"), *StubGoogleHandler.keys]
+
+    claims = await google_stub.exchange_code("user-1", "http://app/callback")
+    await google_stub.close()
+
+    assert claims["sub"] == "user-1"
+    assert google_stub.jwks_fetches == 2
+
+
+@pytest.mark.anyio
+async def test_rejects_token_for_another_audience(google_stub):
+    StubGoogleHandler.audience = "someone-else"
+
+    with pytest.raises(jwt.InvalidAudienceError):
+        await google_stub.exchange_code("user-1", "http://app/callback")
+    await google_stub.close()
@@ -0,0 +1,176 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from app.data.db_config import _consistency_key, bind_consistency_key
+from app.model.plan_model import FeatureKey, Plan, PlanFeatures
+from app.service.organization_usage_service import OrganizationUsageService
+from app.service.quota_lease_service import QuotaLeaseService
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeOrganizationPlanRepo:
+    async def get_current_plan(self, organization_id):
+        return None
+
+
+class FakePlanRepo:
+    def __init__(self, max_notes: int):
+        now = datetime.now(timezone.utc)
+        self.plan = Plan(
+            id=1,
+            name="Free",
+            description=None,
+            features=PlanFeatures(max_notes=max_notes, token_limit=100, enable_ai=False),
+            stripe_product_id=None,
+            created_at=now,
+            updated_at=now,
+        )
+
+    async def get_default_plan(self):
+        return self.plan
+
+
+class FakeUsageRepo:
+    """Mirrors the conditional upsert: the check and the write happen together."""
+
+    def __init__(self):
+        self.usage: dict[tuple, int] = {}
+        self.reservations = 0
+
+    async def try_increment_usage(
+        self, organization_id, feature_key, period_start, period_end, amount, limit
+    ):
+        await asyncio.sleep(0)
+        key = (organization_id, feature_key, period_start)
+        if self.usage.get(key, 0) + amount > limit:
+            return False
+        self.usage[key] = self.usage.get(key, 0) + amount
+        return True
+
+    async def reserve_usage(
+        self, organization_id, feature_key, period_start, period_end, amount, limit
+    ):
+        await asyncio.sleep(0)
+        self.reservations += 1
+        key = (organization_id, feature_key, period_start)
+        granted = max(min(amount, limit - self.usage.get(key, 0)), 0)
+        self.usage[key] = self.usage.get(key, 0) + granted
+        return granted
+
+    async def increment_usage(
+        self, organization_id, feature_key, period_start, period_end, amount
+    ):
+        key = (organization_id, feature_key, period_start)
+        self.usage[key] = max(self.usage.get(key, 0) + amount, 0)
+
+
+def make_service(
+    max_notes: int,
+    usage_repo: FakeUsageRepo | None = None,
+    quota_lease_service: QuotaLeaseService | None = None,
+) -> tuple[OrganizationUsageService, FakeUsageRepo]:
+    usage_repo = usage_repo or FakeUsageRepo()
+    service = OrganizationUsageService(
+        usage_repo=usage_repo,
+        plan_repo=FakePlanRepo(max_notes),
+        organization_plan_repo=FakeOrganizationPlanRepo(),
+        quota_lease_service=quota_lease_service,
+    )
+    return service, usage_repo
+
+
+@pytest.mark.anyio
+async def test_concurrent_consumers_never_exceed_limit():
+    service, usage_repo = make_service(max_notes=3)
+
+    results = await asyncio.gather(
+        *[service.try_consume(1, FeatureKey.MAX_NOTES, 1) for _ in range(10)]
+    )
+
+    assert results.count(True) == 3
+    assert list(usage_repo.usage.values()) == [3]
+
+
+@pytest.mark.anyio
+async def test_release_returns_quota():
+    service, usage_repo = make_service(max_notes=1)
+
+    assert await service.try_consume(1, FeatureKey.MAX_NOTES, 1)
+    assert not await service.try_consume(1, FeatureKey.MAX_NOTES, 1)
+
+    await service.release(1, FeatureKey.MAX_NOTES, 1)
+
+    assert await service.try_consume(1, FeatureKey.MAX_NOTES, 1)
+
+
+@pytest.mark.anyio
+async def test_leases_reserve_in_chunks_and_never_exceed_limit():
+    usage_repo = FakeUsageRepo()
+    workers = [
+        QuotaLeaseService(usage_repo, enabled=True, chunk_fraction=0.25)
+        for _ in range(2)
+    ]
+    services = [
+        make_service(20, usage_repo=usage_repo, quota_lease_service=lease_service)[0]
+        for lease_service in workers
+    ]
+
+    results = await asyncio.gather(
+        *[
+            services[i % 2].try_consume(1, FeatureKey.MAX_NOTES, 1)
+            for i in range(30)
+        ]
+    )
+
+    assert results.count(True) == 20
+    assert list(usage_repo.usage.values()) == [20]
+    assert usage_repo.reservations < 20
+
+    for lease_service in workers:
+        await lease_service.stop()
+
+
+@pytest.mark.anyio
+async def test_unused_lease_is_returned():
+    usage_repo = FakeUsageRepo()
+    lease_service = QuotaLeaseService(usage_repo, enabled=True, chunk_fraction=0.5)
+    service, _ = make_service(10, usage_repo=usage_repo, quota_lease_service=lease_service)
+
+    assert await service.try_consume(1, FeatureKey.MAX_NOTES, 1)
+    await service.release(1, FeatureKey.MAX_NOTES, 1)
+    assert list(usage_repo.usage.values()) == [5]
+
+    await lease_service.stop()
+
+    assert list(usage_repo.usage.values()) == [0]
+
+
+@pytest.mark.anyio
+async def test_lazily_started_flusher_does_not_inherit_request_context():
+    keys_seen = []
+
+    class RecordingUsageRepo(FakeUsageRepo):
+        async def increment_usage(self, *args, **kwargs):
+            keys_seen.append(_consistency_key.get())
+            await super().increment_usage(*args, **kwargs)
+
+    usage_repo = RecordingUsageRepo()
+    lease_service = QuotaLeaseService(
+        usage_repo, enabled=True, chunk_fraction=0.5, idle_seconds=0.02
+    )
+    service, _ = make_service(10, usage_repo=usage_repo, quota_lease_service=lease_service)
+
+    async def handle_request():
+        bind_consistency_key(42)
+        assert await service.try_consume(1, FeatureKey.MAX_NOTES, 1)
+
+    await asyncio.create_task(handle_request())
+    await asyncio.sleep(0.1)
+    await lease_service.stop()
+
+    assert keys_seen and all(key is None for key in keys_seen)
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+
+import pytest
+from app.data.repo.plan_repo import PlanRepo
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def plan_row(plan_id: int, product_id: str, is_default: bool = False) -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "id": plan_id,
+        "name": f"Plan {plan_id}",
+        "description": None,
+        "features": {"max_notes": 10, "token_limit": 1000, "enable_ai": True},
+        "stripe_product_id": product_id,
+        "created_at": now,
+        "updated_at": now,
+        "is_default": is_default,
+    }
+
+
+class FakePlanRepo(PlanRepo):
+    def __init__(self, rows: list[dict], catalog_ttl_seconds: float = 300):
+        super().__init__(db_config=None, catalog_ttl_seconds=catalog_ttl_seconds)
+        self.rows = rows
+        self.loads = 0
+        self.executed = []
+
+    async def fetch_all(self, query, *args):
+        self.loads += 1
+        return [dict(row) for row in self.rows]
+
+    async def execute(self, query, *args):
+        self.executed.append(args)
+
+
+@pytest.mark.anyio
+async def test_catalog_serves_lookups_from_one_load():
+    repo = FakePlanRepo([plan_row(1, "prod_free", is_default=True), plan_row(2, "prod_pro")])
+
+    assert (await repo.get_default_plan()).id == 1
+    assert (await repo.get_by_id(2)).stripe_product_id == "prod_pro"
+    assert (await repo.get_by_stripe_product_id("prod_pro")).id == 2
+    assert await repo.get_by_id(3) is None
+    assert repo.loads == 1
+
+
+@pytest.mark.anyio
+async def test_plan_writes_invalidate_catalog():
+    repo = FakePlanRepo([plan_row(1, "prod_free", is_default=True)])
+    await repo.load_catalog()
+
+    repo.rows = [plan_row(1, "prod_free"), plan_row(2, "prod_pro", is_default=True)]
+    await repo.soft_delete_plan(1)
+
+    assert (await repo.get_default_plan()).id == 2
+    assert repo.loads == 2
+
+
+@pytest.mark.anyio
+async def test_catalog_reloads_after_ttl():
+    repo = FakePlanRepo([plan_row(1, "prod_free")], catalog_ttl_seconds=0)
+    await repo.get_by_id(1)
+    await repo.get_by_id(1)
+
+    assert repo.loads == 2
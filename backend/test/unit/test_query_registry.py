@@ -0,0 +1,149 @@
+import asyncpg
+import pytest
+from app.data.db_config import DatabaseConfig
+from app.data.query_registry import QueryRegistry, queries
+from app.data.repo.base_repo import BaseRepo
+from app.data.repo.session_repo import GET_CURRENT_USER
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeStatement:
+    def __init__(self, connection, sql):
+        self.connection = connection
+        self.sql = sql
+        self.invalid = False
+
+    async def fetchrow(self, *args):
+        if self.invalid:
+            raise asyncpg.exceptions.InvalidCachedStatementError(
+                "cached statement plan is invalid due to a database schema change"
+            )
+        self.connection.executed.append(("prepared", self.sql, args))
+        return {"args": args}
+
+
+class FakeConnection:
+    def __init__(self):
+        self.prepared_queries = {}
+        self.prepare_calls = 0
+        self.executed = []
+
+    async def prepare(self, sql):
+        self.prepare_calls += 1
+        return FakeStatement(self, sql)
+
+    async def fetchrow(self, sql, *args):
+        self.executed.append(("plain", sql, args))
+        return {"args": args}
+
+    def is_in_transaction(self):
+        return False
+
+
+def make_repo(prepare_named_queries: bool = True) -> BaseRepo:
+    return BaseRepo(
+        DatabaseConfig(
+            "postgresql://localhost/test", prepare_named_queries=prepare_named_queries
+        )
+    )
+
+
+def test_registry_rejects_conflicting_declarations():
+    registry = QueryRegistry()
+    first = registry.register("a", "SELECT 1", hot=True)
+
+    assert registry.register("a", "SELECT 1", hot=True) is first
+    with pytest.raises(ValueError):
+        registry.register("a", "SELECT 2")
+    assert registry.hot() == [first]
+
+
+def test_hot_queries_are_registered_at_import():
+    assert GET_CURRENT_USER in queries.hot()
+    assert queries.stats()["session.get_current_user"]["hot"] is True
+
+
+@pytest.mark.anyio
+async def test_named_query_is_prepared_once_per_connection():
+    repo = make_repo()
+    connection = FakeConnection()
+    prepares = queries.prepares[GET_CURRENT_USER.name]
+    executions = queries.executions[GET_CURRENT_USER.name]
+
+    for i in range(3):
+        await repo.run(connection, "fetchrow", GET_CURRENT_USER, f"s{i}")
+
+    assert connection.prepare_calls == 1
+    assert [kind for kind, _, _ in connection.executed] == ["prepared"] * 3
+    assert queries.prepares[GET_CURRENT_USER.name] == prepares + 1
+    assert queries.executions[GET_CURRENT_USER.name] == executions + 3
+
+
+@pytest.mark.anyio
+async def test_init_connection_prepares_hot_queries():
+    config = DatabaseConfig("postgresql://localhost/test")
+    connection = FakeConnection()
+
+    async def set_type_codec(*args, **kwargs):
+        pass
+
+    connection.set_type_codec = set_type_codec
+    await config._init_connection(connection)
+
+    assert set(connection.prepared_queries) == {q.name for q in queries.hot()}
+
+
+@pytest.mark.anyio
+async def test_init_connection_survives_a_failing_prepare(caplog):
+    config = DatabaseConfig("postgresql://localhost/test")
+    connection = FakeConnection()
+    prepare = connection.prepare
+
+    async def set_type_codec(*args, **kwargs):
+        pass
+
+    async def prepare_before_migration(sql):
+        if sql == GET_CURRENT_USER.sql:
+            raise asyncpg.exceptions.UndefinedColumnError("column does not exist")
+        return await prepare(sql)
+
+    connection.set_type_codec = set_type_codec
+    connection.prepare = prepare_before_migration
+    await config._init_connection(connection)
+
+    assert GET_CURRENT_USER.name not in connection.prepared_queries
+    assert len(connection.prepared_queries) == len(queries.hot()) - 1
+    assert "session.get_current_user" in caplog.text
+
+    # Prepared on first use once the query can be
+    connection.prepare = prepare
+    await make_repo().run(connection, "fetchrow", GET_CURRENT_USER, "s")
+    assert GET_CURRENT_USER.name in connection.prepared_queries
+
+
+@pytest.mark.anyio
+async def test_invalidated_statement_is_prepared_again():
+    repo = make_repo()
+    connection = FakeConnection()
+    await repo.run(connection, "fetchrow", GET_CURRENT_USER, "s")
+    connection.prepared_queries[GET_CURRENT_USER.name].invalid = True
+
+    result = await repo.run(connection, "fetchrow", GET_CURRENT_USER, "s")
+
+    assert result == {"args": ("s",)}
+    assert connection.prepare_calls == 2
+
+
+@pytest.mark.anyio
+async def test_plain_sql_when_preparing_is_disabled():
+    repo = make_repo(prepare_named_queries=False)
+    connection = FakeConnection()
+
+    await repo.run(connection, "fetchrow", GET_CURRENT_USER, "s")
+
+    assert connection.prepare_calls == 0
+    assert connection.executed == [("plain", GET_CURRENT_USER.sql, ("s",))]
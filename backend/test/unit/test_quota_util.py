@@ -1,6 +1,9 @@
 from datetime import datetime, timezone
 
-from app.util.quota_util import get_current_quota_period
+from app.util.quota_util import get_current_quota_period, get_quota_periods
+from dateutil.relativedelta import relativedelta
+from hypothesis import given, settings
+from hypothesis import strategies as st
 
 
 def dt(date_str: str) -> datetime:
@@ -77,3 +80,74 @@ def test_precise_time_rollover_second_period_2():
     start, end = get_current_quota_period(anchor, now=now)
     assert start == dt("2025-02-28T16:30:00")
     assert end == dt("2025-03-28T16:30:00")
+
+
+def test_long_running_subscription_keeps_clamped_day():
+    anchor = dt("2001-01-31T08:00:00")
+    now = dt("2025-06-15")
+    start, end = get_current_quota_period(anchor, now=now)
+    assert start == dt("2025-05-28T08:00:00")
+    assert end == dt("2025-06-28T08:00:00")
+
+
+def test_batch_matches_single():
+    now = dt("2025-06-15")
+    anchors = [dt("2025-01-31"), dt("2024-02-29"), dt("2025-06-16")]
+    assert get_quota_periods(anchors, now=now) == [
+        get_current_quota_period(anchor, now=now) for anchor in anchors
+    ]
+
+
+# Property-based equivalence with the original month-by-month implementation
+
+
+def loop_quota_period(anchor: datetime, now: datetime) -> tuple[datetime, datetime]:
+    months_elapsed = 0
+    temp_start = anchor
+    while temp_start + relativedelta(months=1) <= now:
+        temp_start += relativedelta(months=1)
+        months_elapsed += 1
+
+    period_start = anchor + relativedelta(months=months_elapsed)
+    return period_start, period_start + relativedelta(months=1)
+
+
+def drifting_loop_quota_period(
+    anchor: datetime, now: datetime
+) -> tuple[datetime, datetime]:
+    start = anchor
+    while start + relativedelta(months=1) <= now:
+        start += relativedelta(months=1)
+    return start, start + relativedelta(months=1)
+
+
+utc_datetimes = st.datetimes(
+    min_value=datetime(2000, 1, 1),
+    max_value=datetime(2100, 1, 1),
+    timezones=st.just(timezone.utc),
+)
+
+
+@settings(max_examples=500)
+@given(anchor=utc_datetimes, now=utc_datetimes)
+def test_matches_loop_when_anchor_day_never_clamps(anchor, now):
+    anchor = anchor.replace(day=min(anchor.day, 28))
+    assert get_current_quota_period(anchor, now=now) == loop_quota_period(anchor, now)
+
+
+@settings(max_examples=500)
+@given(anchor=utc_datetimes, now=utc_datetimes)
+def test_matches_month_by_month_stepping(anchor, now):
+    assert get_current_quota_period(anchor, now=now) == drifting_loop_quota_period(
+        anchor, now
+    )
+
+
+@settings(max_examples=500)
+@given(anchor=utc_datetimes, now=utc_datetimes)
+def test_period_contains_now(anchor, now):
+    start, end = get_current_quota_period(anchor, now=now)
+    if now >= anchor:
+        assert start <= now < end
+    else:
+        assert start == anchor
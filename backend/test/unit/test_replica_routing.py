@@ -0,0 +1,118 @@
+from datetime import datetime, timezone
+
+import pytest
+from app.api.middleware.auth_handler import min_role_required
+from app.api.middleware.unit_of_work_handler import request_connection
+from app.config.container import Container
+from app.config.settings import settings
+from app.data.db_config import DatabaseConfig
+from app.data.repo.base_repo import BaseRepo
+from app.model.role_model import Role
+from app.model.user_model import CurrentUser
+from dependency_injector import providers
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeConnection:
+    def __init__(self, pool: str):
+        self.pool = pool
+
+    async def fetchrow(self, sql, *args):
+        return {"pool": self.pool}
+
+
+class FakePool:
+    def __init__(self, name: str):
+        self.name = name
+
+    async def acquire(self, timeout=None):
+        return FakeConnection(self.name)
+
+    async def release(self, connection):
+        pass
+
+
+class FakeAuthService:
+    """Resolves token "u<id>" with a primary read, like a session cache miss."""
+
+    def __init__(self, repo: BaseRepo):
+        self.repo = repo
+
+    async def validate_session_token(self, token: str) -> CurrentUser:
+        await self.repo.fetch_one(
+            "SELECT id FROM fastsvelte.session WHERE id = $1", token
+        )
+        user_id = int(token[1:])
+        return CurrentUser(
+            id=user_id,
+            email=f"{token}@example.com",
+            first_name="A",
+            last_name="B",
+            organization_id=1,
+            role_id=2,
+            role=Role.MEMBER,
+            session={
+                "id": token,
+                "user_id": user_id,
+                "created_at": NOW,
+                "expires_at": NOW,
+            },
+            created_at=NOW,
+            updated_at=NOW,
+        )
+
+
+@pytest.fixture
+def client():
+    db_config = DatabaseConfig(
+        "postgresql://localhost/test", replica_dsn="postgresql://localhost/replica"
+    )
+    db_config._pool = FakePool("primary")
+    db_config._replica_pool = FakePool("replica")
+    repo = BaseRepo(db_config)
+
+    container = Container()
+    container.db_config.override(providers.Object(db_config))
+    container.auth_service.override(providers.Object(FakeAuthService(repo)))
+
+    app = FastAPI()
+
+    @app.post("/notes", dependencies=[Depends(request_connection)])
+    async def create_note(user: CurrentUser = Depends(min_role_required(Role.MEMBER))):
+        row = await repo.fetch_one(
+            "INSERT INTO fastsvelte.note (user_id) VALUES ($1) RETURNING id", user.id
+        )
+        return row["pool"]
+
+    @app.get("/notes")
+    async def list_notes(user: CurrentUser = Depends(min_role_required(Role.MEMBER))):
+        row = await repo.fetch_one("SELECT 1", readonly=True)
+        return row["pool"]
+
+    with TestClient(app) as client:
+        yield client
+    container.unwire()
+
+
+def call(client: TestClient, method: str, user_id: int) -> str:
+    client.cookies.set(settings.session_cookie_name, f"u{user_id}")
+    response = client.request(method, "/notes")
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_write_in_unit_of_work_pins_the_writer_to_primary(client):
+    # The unit of work acquires before get_current_user binds the user
+    assert call(client, "POST", 1) == "primary"
+
+    assert call(client, "GET", 1) == "primary"
+    assert call(client, "GET", 2) == "replica"
+
+
+def test_primary_reads_do_not_make_reads_sticky(client):
+    # Every request resolves the session with a primary read first
+    assert call(client, "GET", 3) == "replica"
+    assert call(client, "GET", 3) == "replica"
@@ -0,0 +1,142 @@
+import json
+import timeit
+from datetime import datetime, timezone
+
+import pytest
+from app.model.invitation_model import Invitation, InvitationResponse
+from app.model.note_model import Note, NoteResponse
+from app.model.plan_model import Plan
+from app.model.role_model import Role
+from app.model.user_model import CurrentUser, UserWithRole
+from app.util.serialization_util import dump_json, json_response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+NOW = datetime(2025, 1, 1, 12, 30, tzinfo=timezone.utc)
+NOTE_ROW = {
+    "id": 7,
+    "user_id": 1,
+    "title": "Groceries",
+    "content": "Milk, eggs, coffee and something for the weekend. " * 4,
+    "created_at": NOW,
+    "updated_at": NOW,
+}
+PLAN_ROW = {
+    "id": 2,
+    "name": "Pro",
+    "description": None,
+    "features": {"max_notes": 1000, "token_limit": None, "enable_ai": True},
+    "stripe_product_id": "prod_123",
+    "created_at": NOW,
+    "updated_at": NOW,
+}
+
+
+def test_rows_and_models_serialize_like_the_response_model():
+    expected = NoteResponse.model_validate(NOTE_ROW).model_dump_json().encode()
+
+    assert dump_json(NoteResponse, NOTE_ROW) == expected
+    assert dump_json(NoteResponse, Note(**NOTE_ROW)) == expected
+    assert b"user_id" not in expected
+
+
+def test_nested_models_accept_rows_and_instances():
+    expected = Plan.model_validate(PLAN_ROW).model_dump_json().encode()
+
+    assert dump_json(Plan, PLAN_ROW) == expected
+    assert dump_json(Plan, Plan(**PLAN_ROW)) == expected
+
+
+def test_json_response_drops_undeclared_fields():
+    user = CurrentUser(
+        id=1,
+        email="a@example.com",
+        first_name="A",
+        last_name="B",
+        organization_id=3,
+        role_id=2,
+        role=Role.MEMBER,
+        session={"id": "s", "user_id": 1, "created_at": NOW, "expires_at": NOW},
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+    response = json_response(UserWithRole, user)
+
+    assert response.media_type == "application/json"
+    assert (
+        response.body
+        == UserWithRole.model_validate(user.model_dump()).model_dump_json().encode()
+    )
+
+    notes = json_response(NoteResponse, [Note(**NOTE_ROW)] * 2)
+    assert [note["id"] for note in json.loads(notes.body)] == [7, 7]
+
+
+def test_missing_defaulted_fields_are_filled_in():
+    row = {
+        "id": 4,
+        "email": "a@example.com",
+        "role_name": "member",
+        "accepted_at": None,
+        "expires_at": NOW,
+        "created_at": NOW,
+        "created_by": 1,
+    }
+    expected = InvitationResponse.model_validate(row).model_dump_json().encode()
+
+    assert dump_json(InvitationResponse, row) == expected
+    assert b'"organization_id":null' in expected
+    assert "organization_id" not in row
+
+
+@pytest.mark.parametrize(
+    "source, response",
+    [
+        (Note, NoteResponse),
+        (Invitation, InvitationResponse),
+        (CurrentUser, UserWithRole),
+    ],
+)
+def test_json_response_inputs_declare_the_response_fields(source, response):
+    # Values aren't coerced, so the models routes pass to json_response must
+    # declare every response field with the same type
+    for name, field in response.model_fields.items():
+        assert name in source.model_fields, name
+        assert source.model_fields[name].annotation == field.annotation, name
+
+
+def fast_path_and_before():
+    response_field = TypeAdapter(NoteResponse)
+
+    def before():
+        # Repo model, route re-validation, then FastAPI's response_model handling
+        note = Note(**NOTE_ROW)
+        response = NoteResponse.model_validate(note.model_dump())
+        content = response_field.validate_python(response.model_dump())
+        return JSONResponse(jsonable_encoder(content)).body
+
+    def after():
+        return json_response(NoteResponse, Note(**NOTE_ROW)).body
+
+    return before, after
+
+
+def test_fast_path_matches_response_model_encoding():
+    before, after = fast_path_and_before()
+
+    assert json.loads(before()) == json.loads(after())
+
+
+@pytest.mark.benchmark
+def test_fast_path_is_cheaper_per_note():
+    before, after = fast_path_and_before()
+    rounds = 2000
+    before_time = min(timeit.repeat(before, number=rounds, repeat=5))
+    after_time = min(timeit.repeat(after, number=rounds, repeat=5))
+
+    assert after_time < before_time, (
+        f"before: {before_time / rounds * 1e6:.1f}us/note, "
+        f"after: {after_time / rounds * 1e6:.1f}us/note"
+    )
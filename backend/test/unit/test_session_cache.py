@@ -0,0 +1,233 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from app.model.role_model import Role
+from app.model.session_model import Session
+from app.model.user_model import CurrentUser, UserWithRole
+from app.service.auth_service import AuthService
+from app.service.email_verification_service import EmailVerificationService
+from app.service.session_refresh_service import SessionRefreshService
+from app.util.cache_util import TTLCache
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 4.9
+    assert cache.get("a") == 1
+
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_delete_where():
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 1)
+
+    assert cache.delete_where(lambda _, v: v == 1) == 2
+    assert len(cache) == 1
+
+
+class FakeSessionRepo:
+    def __init__(self, session: Session, user: UserWithRole):
+        self.session = session
+        self.user = user
+        self.reads = 0
+        self.deleted = []
+        self.batches = []
+
+    async def get_current_user_by_session_id(
+        self, session_id, now, refresh_before, refreshed_expires_at
+    ):
+        self.reads += 1
+        if session_id != self.session.id or self.session.expires_at <= now:
+            return None
+        if refresh_before is not None and self.session.expires_at <= refresh_before:
+            self.session.expires_at = refreshed_expires_at
+        return CurrentUser(**self.user.model_dump(), session=self.session)
+
+    async def update_expiration(self, session_id, new_expiration):
+        self.session.expires_at = new_expiration
+
+    async def update_expirations(self, session_ids, new_expirations):
+        self.batches.append(dict(zip(session_ids, new_expirations)))
+
+    async def delete_session(self, session_id):
+        self.deleted.append(session_id)
+
+    async def delete_sessions_by_user_id(self, user_id):
+        self.deleted.append(user_id)
+
+
+def make_auth_service(
+    token: str, expires_in: timedelta = timedelta(days=1)
+) -> tuple[AuthService, FakeSessionRepo]:
+    now = datetime.now(timezone.utc)
+    user = UserWithRole(
+        id=7,
+        email="user@example.com",
+        first_name="Test",
+        last_name="User",
+        is_active=True,
+        organization_id=1,
+        role_id=1,
+        created_at=now,
+        updated_at=now,
+        role=Role.MEMBER,
+    )
+    service = AuthService(
+        user_repo=None,
+        session_repo=None,
+        org_repo=None,
+        email_verification_service=None,
+        session_cache=TTLCache(max_size=10, ttl_seconds=60),
+        session_refresh_service=None,
+    )
+    session = Session(
+        id=service.hash_token(token),
+        user_id=user.id,
+        created_at=now,
+        expires_at=now + expires_in,
+    )
+    service.session_repo = FakeSessionRepo(session, user)
+    service.session_refresh_service = SessionRefreshService(service.session_repo)
+    return service, service.session_repo
+
+
+@pytest.mark.anyio
+async def test_validate_session_token_uses_cache():
+    service, session_repo = make_auth_service("token")
+
+    first = await service.validate_session_token("token")
+    second = await service.validate_session_token("token")
+
+    assert first is not None and second is not None
+    assert second.id == 7
+    assert session_repo.reads == 1
+    assert service.session_cache.stats()["hits"] == 1
+
+
+@pytest.mark.anyio
+async def test_invalidate_all_sessions_evicts_cache():
+    service, session_repo = make_auth_service("token")
+    await service.validate_session_token("token")
+
+    await service.invalidate_all_sessions(7)
+    await service.validate_session_token("token")
+
+    assert session_repo.reads == 2
+
+
+class FakeEmailVerificationRepo:
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.verified = []
+
+    async def get_user_id_by_valid_token(self, token):
+        return self.user_id if token == "valid" else None
+
+    async def mark_token_as_used_and_verify_user(self, user_id):
+        self.verified.append(user_id)
+
+
+@pytest.mark.anyio
+async def test_verify_email_evicts_cache():
+    service, session_repo = make_auth_service("token")
+    await service.validate_session_token("token")
+    verification = EmailVerificationService(
+        email_service=None,
+        email_verification_repo=FakeEmailVerificationRepo(7),
+        user_repo=None,
+        session_cache=service.session_cache,
+    )
+
+    assert await verification.verify_email("valid")
+    await service.validate_session_token("token")
+
+    assert session_repo.reads == 2
+
+
+@pytest.mark.anyio
+async def test_expiring_session_refresh_is_written_behind():
+    service, session_repo = make_auth_service("token", expires_in=timedelta(minutes=5))
+
+    user = await service.validate_session_token("token")
+
+    assert user.session.expires_at > datetime.now(timezone.utc) + timedelta(hours=12)
+    assert session_repo.batches == []
+
+    await service.session_refresh_service.stop()
+
+    assert list(session_repo.batches[0]) == [user.session.id]
+
+
+@pytest.mark.anyio
+async def test_session_refresh_flush_batches_and_keeps_latest():
+    session_repo = FakeSessionRepo(None, None)
+    refresher = SessionRefreshService(session_repo, max_batch_size=2)
+    now = datetime.now(timezone.utc)
+
+    refresher.schedule("a", now + timedelta(hours=2))
+    refresher.schedule("a", now + timedelta(hours=1))
+    refresher.schedule("b", now)
+    refresher.schedule("c", now)
+    await refresher.stop()
+
+    assert [len(batch) for batch in session_repo.batches] == [2, 1]
+    assert session_repo.batches[0]["a"] == now + timedelta(hours=2)
+
+
+@pytest.mark.anyio
+async def test_stop_during_a_flush_still_writes_the_batch():
+    writing = asyncio.Event()
+
+    class SlowSessionRepo(FakeSessionRepo):
+        async def update_expirations(self, session_ids, new_expirations):
+            if not writing.is_set():
+                writing.set()
+                await asyncio.Event().wait()  # cancelled by stop()
+            await super().update_expirations(session_ids, new_expirations)
+
+    session_repo = SlowSessionRepo(None, None)
+    refresher = SessionRefreshService(session_repo, max_batch_size=1)
+    now = datetime.now(timezone.utc)
+
+    refresher.schedule("a", now)
+    await writing.wait()
+    await refresher.stop()
+
+    assert session_repo.batches == [{"a": now}]
+    assert refresher.stats()["pending"] == 0
@@ -0,0 +1,46 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from app.model.note_model import NoteResponse
+from app.util.streaming_util import encode_json_array, encode_ndjson
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+async def note_rows(count: int):
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        yield {
+            "id": i,
+            "user_id": 1,
+            "title": f"Note {i}",
+            "content": "body",
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("count", [0, 1, 100, 250])
+async def test_json_array_is_valid_json(count):
+    body = await collect(encode_json_array(note_rows(count), NoteResponse, chunk_size=100))
+
+    items = json.loads(body)
+    assert [item["id"] for item in items] == list(range(count))
+    assert "user_id" not in (items[0] if items else {})
+
+
+@pytest.mark.anyio
+async def test_ndjson_emits_one_line_per_row():
+    body = await collect(encode_ndjson(note_rows(3), NoteResponse))
+
+    lines = body.decode().splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["Note 0", "Note 1", "Note 2"]
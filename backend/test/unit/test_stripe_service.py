@@ -0,0 +1,118 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+from app.service.stripe_service import StripeService
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class StubStripeHandler(BaseHTTPRequestHandler):
+    """Answers just enough of the Stripe API for the calls under test."""
+
+    requests: list[tuple[str, str, dict]] = []
+    fail_next = 0
+
+    def _respond(self, body: dict, status: int = 200):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode())
+        self.requests.append(("POST", self.path, form))
+
+        if StubStripeHandler.fail_next:
+            StubStripeHandler.fail_next -= 1
+            self._respond({"error": {"message": "try again"}}, status=503)
+            return
+
+        if self.path == "/v1/customers":
+            self._respond({"id": "cus_123", "object": "customer", "email": form["email"][0]})
+        elif self.path == "/v1/billing_portal/sessions":
+            self._respond(
+                {"id": "bps_1", "object": "billing_portal.session", "url": "https://portal"}
+            )
+        else:
+            self._respond({"error": {"message": "not found"}}, status=404)
+
+    def do_GET(self):
+        self.requests.append(("GET", self.path, {}))
+        self._respond(
+            {
+                "object": "list",
+                "url": "/v1/prices",
+                "has_more": False,
+                "data": [{"id": "price_1", "object": "price", "unit_amount": 0}],
+            }
+        )
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stripe_stub():
+    StubStripeHandler.requests = []
+    StubStripeHandler.fail_next = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubStripeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+@pytest.mark.anyio
+async def test_calls_go_through_async_client(stripe_stub):
+    service = StripeService("sk_test_123", "whsec", api_base=stripe_stub)
+
+    customer = await service.create_customer(
+        email="a@example.com", name="A", metadata={"org_id": 1}
+    )
+    prices = await service.list_prices_for_product("prod_1")
+    url = await service.create_portal_session("cus_123", "https://app/billing")
+    await service.close()
+
+    assert customer.id == "cus_123"
+    assert [p.id for p in prices] == ["price_1"]
+    assert url == "https://portal"
+    assert StubStripeHandler.requests[0][2]["metadata[org_id]"] == ["1"]
+    assert "product=prod_1" in StubStripeHandler.requests[1][1]
+
+
+@pytest.mark.anyio
+async def test_retries_transient_failures(stripe_stub):
+    StubStripeHandler.fail_next = 1
+    service = StripeService(
+        "sk_test_123", "whsec", api_base=stripe_stub, max_network_retries=1
+    )
+
+    customer = await service.create_customer(email="a@example.com", name="A", metadata={})
+    await service.close()
+
+    assert customer.id == "cus_123"
+    assert len(StubStripeHandler.requests) == 2
+
+
+@pytest.mark.anyio
+async def test_prices_are_cached_until_invalidated(stripe_stub):
+    service = StripeService("sk_test_123", "whsec", api_base=stripe_stub)
+
+    await service.list_prices_for_product("prod_1")
+    await service.list_prices_for_product("prod_1")
+    assert len(StubStripeHandler.requests) == 1
+
+    service.invalidate_prices("prod_1")
+    await service.list_prices_for_product("prod_1")
+    await service.close()
+
+    assert len(StubStripeHandler.requests) == 2
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from app.data.db_config import DatabaseConfig
+from app.data.repo.base_repo import BaseRepo
+from app.data.unit_of_work import current_connection, unit_of_work
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeTransaction:
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def __aenter__(self):
+        self.connection.transactions.append("begin")
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.connection.transactions.append("rollback" if exc_type else "commit")
+
+
+class FakeConnection:
+    def __init__(self):
+        self.transactions = []
+
+    async def fetchrow(self, sql, *args):
+        return {"connection": self}
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+
+class FakePool:
+    def __init__(self):
+        self.acquires = 0
+
+    async def acquire(self, timeout=None):
+        self.acquires += 1
+        return FakeConnection()
+
+    async def release(self, connection):
+        pass
+
+
+def make_db_config() -> DatabaseConfig:
+    db_config = DatabaseConfig("postgresql://localhost/test")
+    db_config._pool = FakePool()
+    return db_config
+
+
+@pytest.mark.anyio
+async def test_repo_calls_share_the_unit_of_work_connection():
+    db_config = make_db_config()
+    repo = BaseRepo(db_config)
+
+    async with unit_of_work(db_config) as connection:
+        first = await repo.fetch_one("SELECT 1")
+        second = await repo.fetch_one("SELECT 2")
+
+    assert first["connection"] is connection
+    assert second["connection"] is connection
+    assert db_config._pool.acquires == 1
+    assert current_connection() is None
+
+    await repo.fetch_one("SELECT 3")
+    assert db_config._pool.acquires == 2
+
+
+@pytest.mark.anyio
+async def test_nested_transaction_reuses_connection_as_savepoint():
+    db_config = make_db_config()
+    repo = BaseRepo(db_config)
+
+    async with unit_of_work(db_config, transaction=True) as connection:
+        async with unit_of_work(db_config) as nested:
+            assert nested is connection
+        await repo.execute_transaction(lambda c: c.fetchrow("SELECT 1"))
+
+    assert db_config._pool.acquires == 1
+    assert connection.transactions == ["begin", "begin", "commit", "commit"]
+
+
+@pytest.mark.anyio
+async def test_transaction_rolls_back_on_error():
+    db_config = make_db_config()
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work(db_config, transaction=True) as connection:
+            raise RuntimeError("boom")
+
+    assert connection.transactions == ["begin", "rollback"]
+    assert current_connection() is None
+
+
+@pytest.mark.anyio
+async def test_spawned_tasks_acquire_their_own_connection():
+    db_config = make_db_config()
+    repo = BaseRepo(db_config)
+
+    async with unit_of_work(db_config) as connection:
+        row = await asyncio.create_task(repo.fetch_one("SELECT 1"))
+
+    assert row["connection"] is not connection
+    assert db_config._pool.acquires == 2
@@ -0,0 +1,21 @@
+-- Deploy fastsvelte:009_plan_change_notify to pg
+
+BEGIN;
+
+-- Notify API workers whenever the plan catalog changes so in-memory caches stay coherent
+CREATE OR REPLACE FUNCTION fastsvelte.notify_plan_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('fastsvelte_plan_changed', TG_OP);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS plan_changed ON fastsvelte.plan;
+
+CREATE TRIGGER plan_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON fastsvelte.plan
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION fastsvelte.notify_plan_changed();
+
+COMMIT;
@@ -0,0 +1,9 @@
+-- Deploy fastsvelte:010_note_keyset_index to pg
+
+BEGIN;
+
+-- Supports keyset pagination of a user's notes, newest first
+CREATE INDEX IF NOT EXISTS idx_note_user_created_id
+    ON fastsvelte.note (user_id, created_at DESC, id DESC);
+
+COMMIT;
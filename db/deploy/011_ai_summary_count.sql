@@ -0,0 +1,9 @@
+-- Deploy fastsvelte:011_ai_summary_count to pg
+
+BEGIN;
+
+-- Number of AI note summaries generated by the user, shown on the dashboard
+ALTER TABLE fastsvelte."user"
+    ADD COLUMN IF NOT EXISTS ai_summary_count INT NOT NULL DEFAULT 0;
+
+COMMIT;
@@ -0,0 +1,32 @@
+-- Deploy fastsvelte:012_job_queue to pg
+
+BEGIN;
+
+-- Durable queue for background side effects (onboarding, emails, ...).
+-- Workers claim rows with SELECT ... FOR UPDATE SKIP LOCKED.
+CREATE TABLE IF NOT EXISTS fastsvelte.job (
+    id BIGSERIAL PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    idempotency_key TEXT,
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'running', 'succeeded', 'failed')),
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 5,
+    run_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    locked_at TIMESTAMPTZ,
+    last_error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- At most one queued or running job per idempotency key
+CREATE UNIQUE INDEX IF NOT EXISTS idx_job_idempotency_key_active
+    ON fastsvelte.job (idempotency_key)
+    WHERE status IN ('pending', 'running');
+
+CREATE INDEX IF NOT EXISTS idx_job_claimable
+    ON fastsvelte.job (run_at)
+    WHERE status IN ('pending', 'running');
+
+COMMIT;
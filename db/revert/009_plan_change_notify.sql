@@ -0,0 +1,8 @@
+-- Revert fastsvelte:009_plan_change_notify from pg
+
+BEGIN;
+
+DROP TRIGGER IF EXISTS plan_changed ON fastsvelte.plan;
+DROP FUNCTION IF EXISTS fastsvelte.notify_plan_changed();
+
+COMMIT;
@@ -0,0 +1,7 @@
+-- Revert fastsvelte:010_note_keyset_index from pg
+
+BEGIN;
+
+DROP INDEX IF EXISTS fastsvelte.idx_note_user_created_id;
+
+COMMIT;
@@ -0,0 +1,8 @@
+-- Revert fastsvelte:011_ai_summary_count from pg
+
+BEGIN;
+
+ALTER TABLE IF EXISTS fastsvelte."user"
+    DROP COLUMN IF EXISTS ai_summary_count;
+
+COMMIT;
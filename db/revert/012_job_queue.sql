@@ -0,0 +1,7 @@
+-- Revert fastsvelte:012_job_queue from pg
+
+BEGIN;
+
+DROP TABLE IF EXISTS fastsvelte.job;
+
+COMMIT;
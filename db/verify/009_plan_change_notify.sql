@@ -0,0 +1,7 @@
+-- Verify fastsvelte:009_plan_change_notify on pg
+
+BEGIN;
+
+SELECT has_function_privilege('fastsvelte.notify_plan_changed()', 'execute');
+
+ROLLBACK;
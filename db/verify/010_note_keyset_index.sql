@@ -0,0 +1,9 @@
+-- Verify fastsvelte:010_note_keyset_index on pg
+
+BEGIN;
+
+SELECT 1/COUNT(*)
+FROM pg_indexes
+WHERE schemaname = 'fastsvelte' AND indexname = 'idx_note_user_created_id';
+
+ROLLBACK;
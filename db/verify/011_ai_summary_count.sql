@@ -0,0 +1,9 @@
+-- Verify fastsvelte:011_ai_summary_count on pg
+
+BEGIN;
+
+SELECT ai_summary_count
+FROM fastsvelte."user"
+WHERE FALSE;
+
+ROLLBACK;
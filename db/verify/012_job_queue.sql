@@ -0,0 +1,10 @@
+-- Verify fastsvelte:012_job_queue on pg
+
+BEGIN;
+
+SELECT id, kind, payload, idempotency_key, status, attempts, max_attempts,
+       run_at, locked_at, last_error, created_at, updated_at
+FROM fastsvelte.job
+WHERE FALSE;
+
+ROLLBACK;